@@ -1,13 +1,14 @@
 import json
 import os
 from collections import Counter
-from src.utils.paths import OUTPUTS_DIR
+from src.utils.paths import OUTPUTS_DIR, ensure_data_dirs
+from src.utils.companies import company_slug, insights_path
 
-def generate_analytics(company: str) -> dict:
+def generate_analytics(company: str, role: str = None) -> dict:
     print(f"\n[Analytics Agent] Crunching chart data for {company}...")
 
-    company_formatted = company.lower().replace(" ", "_").replace(".", "")
-    insights_file = OUTPUTS_DIR / f"{company_formatted}_insights.json"
+    company_formatted = company_slug(company)
+    insights_file = insights_path(company, role)
 
     if not insights_file.exists():
         return {"error": f"Insights file not found for {company}."}
@@ -76,6 +77,7 @@ def generate_analytics(company: str) -> dict:
         }
     }
 
+    ensure_data_dirs()
     output_file = OUTPUTS_DIR / f"{company_formatted}_analytics.json"
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(final_payload, f, indent=4)
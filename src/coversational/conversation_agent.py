@@ -2,23 +2,24 @@ import json
 import requests
 from pathlib import Path
 from src.utils.paths import OUTPUTS_DIR
+from src.utils.companies import company_slug, insights_path
 
 # Default Ollama local endpoint
 OLLAMA_URL = "http://localhost:11434/api/generate"
 # Change this to your installed model (e.g., "llama3", "mistral")
 OLLAMA_MODEL = "llama3:latest"
 
-def chat_with_insights(company: str, user_query: str) -> dict:
+def chat_with_insights(company: str, user_query: str, role: str = None) -> dict:
     """
     RAG-based function that reads the company insights and uses Ollama 
     to answer the user's specific query.
     """
     print(f"\n[Conversation Agent] Searching insights for {company}...")
     
-    company_formatted = company.lower().replace(" ", "_").replace(".", "")
+    company_formatted = company_slug(company)
     
     # Check for either JSON or TXT insights in the outputs folder
-    json_path = OUTPUTS_DIR / f"{company_formatted}_insights.json"
+    json_path = insights_path(company, role)
     txt_path = OUTPUTS_DIR / f"{company_formatted}_insights.txt"
     
     context_data = ""
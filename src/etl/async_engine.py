@@ -0,0 +1,243 @@
+import json
+import time
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from src.etl.content_extract import decode_html
+from src.etl.http_cache      import get_http_cache
+from src.etl.http_client     import SharedHttpClient, get_http_client
+from src.utils.rate_limit import KeyedRateLimiter
+
+
+# ─────────────────────────────────────────────
+# FETCH RESPONSE
+# ─────────────────────────────────────────────
+
+class FetchResponse:
+    """
+    Minimal, transport-agnostic view of an HTTP response.
+    Agents only ever need the status, the body and the final URL.
+    """
+    def __init__(self, url: str, status_code: int, text: str = "", headers: Optional[dict] = None,
+                 from_cache: bool = False):
+        self.url         = url
+        self.status_code = status_code
+        self.text        = text
+        self.headers     = headers or {}
+        self.from_cache  = from_cache
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+    def json(self):
+        return json.loads(self.text)
+
+    def __repr__(self):
+        return f"<FetchResponse {self.status_code} url={self.url[:60]}>"
+
+
+# ─────────────────────────────────────────────
+# DOMAIN RATE LIMITS
+# ─────────────────────────────────────────────
+
+# Politeness per domain: ~1 request every 0.8 s with a burst of 2.
+# APIs that are metered by quota rather than etiquette get more headroom.
+DOMAIN_RATE     = 1.25
+DOMAIN_CAPACITY = 2
+DOMAIN_RATE_OVERRIDES = {
+    "googleapis.com":            (5.0, 5),
+    "githubusercontent.com":     (10.0, 10),
+}
+
+# Shared by every run in the process, so concurrent pipelines stay polite together
+DOMAIN_LIMITER = KeyedRateLimiter(DOMAIN_RATE, DOMAIN_CAPACITY, DOMAIN_RATE_OVERRIDES)
+
+
+def domain_key(url: str) -> str:
+    """'www.geeksforgeeks.org' → 'geeksforgeeks.org', 'raw.githubusercontent.com' → 'githubusercontent.com'"""
+    host  = urlsplit(url).hostname or ""
+    parts = host.lower().split(".")
+    return ".".join(parts[-2:]) if len(parts) >= 2 else host
+
+
+# ─────────────────────────────────────────────
+# ASYNC FETCHER
+# ─────────────────────────────────────────────
+
+class AsyncFetcher:
+    """
+    Agent-facing view of the shared HTTP client for one extraction run.
+
+    Each host gets its own semaphore so that fetches to different sites
+    run in parallel while no single site sees more than its limit, and every
+    network request also takes a token from its domain's bucket.
+    Connections, timeouts and retries come from the process-wide client;
+    responses for cacheable purposes go through the on-disk HttpCache.
+    """
+    DEFAULT_HOST_LIMIT = 4
+    HOST_LIMITS = {
+        "www.googleapis.com":        2,
+        "raw.githubusercontent.com": 4,
+        "www.ambitionbox.com":       1,
+        "www.glassdoor.com":         1,
+    }
+
+    def __init__(self, http: Optional[SharedHttpClient] = None,
+                 host_limits: Optional[Dict[str, int]] = None, use_cache: bool = True):
+        self.http        = http or get_http_client()
+        self.cache       = get_http_cache() if use_cache else None
+        self.host_limits = {**self.HOST_LIMITS, **(host_limits or {})}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        return self
+
+    async def __aexit__(self, *exc):
+        # The pooled client outlives the run — nothing to close here
+        return None
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            limit = self.host_limits.get(host, self.DEFAULT_HOST_LIMIT)
+            self._semaphores[host] = asyncio.Semaphore(limit)
+        return self._semaphores[host]
+
+    async def get(self, url: str, headers: Optional[dict] = None,
+                  purpose: Optional[str] = None, max_bytes: Optional[int] = None) -> FetchResponse:
+        """
+        GET under the per-host limit. `purpose` selects the timeout from HttpConfig
+        and the TTL from the response cache. `max_bytes` caps how much of the body
+        is downloaded — for pages where only the first part is used. A body cut
+        short by the cap is never cached, since the cache is keyed by URL alone.
+        Raises httpx.TimeoutException / httpx.HTTPError — agents map these to SourceResults.
+        """
+        cache = self.cache if self.cache and self.cache.is_cacheable(purpose) else None
+        entry = cache.get(url) if cache else None
+
+        if entry and cache.is_fresh(entry, purpose):
+            return FetchResponse(url, 200, entry.body, from_cache=True)
+
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(entry.validators())
+
+        host = urlsplit(url).netloc.lower()
+        async with self._semaphore(host):
+            await DOMAIN_LIMITER.acquire_async(domain_key(url))
+            resp = await self.http.get(url, headers=request_headers, purpose=purpose,
+                                       max_bytes=max_bytes)
+
+        if entry and resp.status_code == 304:
+            cache.touch(entry)
+            return FetchResponse(url, 200, entry.body, from_cache=True)
+
+        # httpx falls back to UTF-8 without a charset header; pages often declare it in <meta>
+        text      = decode_html(resp.content, resp.charset_encoding)
+        truncated = max_bytes is not None and len(resp.content) >= max_bytes
+        if cache and resp.status_code == 200 and not truncated:
+            cache.put(url, text, resp.headers)
+
+        return FetchResponse(str(resp.url), resp.status_code, text, dict(resp.headers))
+
+    async def head(self, url: str, headers: Optional[dict] = None,
+                   purpose: Optional[str] = None) -> FetchResponse:
+        """HEAD under the same per-host and per-domain limits as get(); never cached."""
+        host = urlsplit(url).netloc.lower()
+        async with self._semaphore(host):
+            await DOMAIN_LIMITER.acquire_async(domain_key(url))
+            resp = await self.http.head(url, headers=headers, purpose=purpose)
+        return FetchResponse(str(resp.url), resp.status_code, "", dict(resp.headers))
+
+
+# ─────────────────────────────────────────────
+# DEADLINE
+# ─────────────────────────────────────────────
+
+class Deadline:
+    """
+    Wall-clock budget for one extraction run, shared by every agent.
+    `seconds=None` means unlimited; remaining() then returns None,
+    which asyncio.wait / concurrent.futures.wait read as "no timeout".
+    """
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds  = seconds
+        self._ends_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        if self._ends_at is None:
+            return None
+        return max(0.0, self._ends_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self._ends_at is not None and time.monotonic() >= self._ends_at
+
+    def cap(self, timeout: float) -> float:
+        """Shrinks a per-step timeout so the step cannot outlive the run."""
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+
+# ─────────────────────────────────────────────
+# SINGLE FLIGHT
+# ─────────────────────────────────────────────
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one in-flight task.
+
+    Every caller awaits the shared task through asyncio.shield, so one caller
+    being cancelled (deadline, fast-mode exit) does not cancel the work for
+    the others. The task itself is cancelled only once every caller has
+    given up on it.
+
+    Tasks belong to one event loop; an entry left behind by another loop
+    (e.g. the one configure_http() replaced) is ignored and dropped.
+    """
+
+    def __init__(self):
+        self._calls: Dict[object, list] = {}     # key → [task, waiter count]
+
+    def _entry(self, key) -> Optional[list]:
+        entry = self._calls.get(key)
+        if entry is not None and entry[0].get_loop() is not asyncio.get_running_loop():
+            self._forget(key, entry)
+            return None
+        return entry
+
+    def in_flight(self, key) -> bool:
+        return self._entry(key) is not None
+
+    async def do(self, key, make_coro):
+        entry = self._entry(key)
+        if entry is None:
+            entry = self._calls[key] = [asyncio.ensure_future(make_coro()), 0]
+            entry[0].add_done_callback(lambda _: self._forget(key, entry))
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                self._forget(key, entry)    # a later caller starts afresh
+                task.cancel()
+
+    def _forget(self, key, entry: list):
+        if self._calls.get(key) is entry:
+            del self._calls[key]
+
+
+# ─────────────────────────────────────────────
+# LOOP HELPERS
+# ─────────────────────────────────────────────
+
+def run_async(coro):
+    """
+    Runs a coroutine to completion from synchronous code.
+    Everything runs on the shared HTTP client's long-lived loop, so pooled
+    connections survive from one extraction to the next.
+    """
+    return get_http_client().run(coro)
@@ -0,0 +1,194 @@
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+
+# ─────────────────────────────────────────────
+# BROWSER POOL
+# ─────────────────────────────────────────────
+
+class BrowserPool:
+    """
+    Bounded pool of warm headless Chrome sessions for the Selenium fallback.
+
+    Drivers are launched lazily, reused across pages and pipeline runs in the
+    same process, health-checked before every checkout, and recycled after
+    MAX_USES pages so a leaky tab cannot grow forever. ChromeDriverManager
+    resolves the driver binary once per process, not once per page.
+    """
+    MAX_SIZE           = 2
+    MAX_USES           = 40
+    PAGE_LOAD_TIMEOUT  = 20
+    PAGE_READY_TIMEOUT = 12
+    CHECKOUT_TIMEOUT   = 30
+
+    # Titles shown while Cloudflare / bot checks are still running
+    CHALLENGE_MARKERS = ("Just a moment", "Checking your browser", "Attention Required")
+
+    def __init__(self, max_size: int = MAX_SIZE):
+        self.max_size     = max_size
+        self._idle        = queue.LifoQueue()      # most recently used first — warmest cache
+        self._slots       = threading.BoundedSemaphore(max_size)
+        self._lock        = threading.Lock()
+        self._driver_path: Optional[str] = None
+        self._uses        = {}
+        self._closed      = False
+
+    # ── Lifecycle ─────────────────────────────────────────────
+
+    def _resolve_driver_path(self) -> str:
+        with self._lock:
+            if self._driver_path is None:
+                from webdriver_manager.chrome import ChromeDriverManager
+                self._driver_path = ChromeDriverManager().install()
+            return self._driver_path
+
+    def _launch(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        options = Options()
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+
+        driver = webdriver.Chrome(service=Service(self._resolve_driver_path()), options=options)
+        driver.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT)
+        self._uses[id(driver)] = 0
+        print(f"[BrowserPool] Launched Chrome session ({self.size()} alive)")
+        return driver
+
+    def _discard(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def size(self) -> int:
+        return len(self._uses)
+
+    # ── Checkout ──────────────────────────────────────────────
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """
+        Yields a live WebDriver. Blocks while all MAX_SIZE sessions are busy,
+        for at most `timeout` seconds (CHECKOUT_TIMEOUT by default).
+        A driver that raised during use is thrown away rather than returned.
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is shut down")
+        if not self._slots.acquire(timeout=self.CHECKOUT_TIMEOUT if timeout is None else timeout):
+            raise TimeoutError("No browser session free within checkout timeout")
+
+        driver = None
+        try:
+            while driver is None:
+                try:
+                    candidate = self._idle.get_nowait()
+                except queue.Empty:
+                    driver = self._launch()
+                    break
+                if self._is_healthy(candidate):
+                    driver = candidate
+                else:
+                    self._discard(candidate)
+
+            try:
+                yield driver
+            except Exception:
+                self._discard(driver)
+                driver = None
+                raise
+        finally:
+            if driver is not None:
+                self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+                if self._closed or self._uses[id(driver)] >= self.MAX_USES:
+                    self._discard(driver)
+                else:
+                    self._idle.put(driver)
+            self._slots.release()
+
+    def fetch_html(self, url: str, ready_timeout: Optional[float] = None, deadline=None) -> str:
+        """
+        Loads a page in a pooled session and returns its HTML once it is ready.
+        With a `deadline` (async_engine.Deadline), the checkout, page-load and
+        readiness waits are each capped to the time the run has left.
+        """
+        if deadline and deadline.expired():
+            raise TimeoutError("Deadline reached before the page load")
+        cap = deadline.cap if deadline else (lambda timeout: timeout)
+
+        with self.session(timeout=cap(self.CHECKOUT_TIMEOUT)) as driver:
+            self._load(driver, url, cap(self.PAGE_LOAD_TIMEOUT))
+            timeout = self.PAGE_READY_TIMEOUT if ready_timeout is None else ready_timeout
+            self._wait_until_ready(driver, cap(timeout))
+            return driver.page_source
+
+    @staticmethod
+    def _load(driver, url: str, timeout: float):
+        """driver.get with a per-call load timeout; a slow page is stopped and used as-is."""
+        from selenium.common.exceptions import TimeoutException
+
+        driver.set_page_load_timeout(timeout)
+        try:
+            driver.get(url)
+        except TimeoutException:
+            driver.execute_script("window.stop();")
+
+    def _wait_until_ready(self, driver, timeout: float):
+        """
+        Waits for document.readyState == 'complete' and for any bot-check
+        interstitial to clear, instead of sleeping a fixed amount.
+        On timeout the page is used as-is; short challenge pages fail the
+        caller's length check anyway.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        def ready(d):
+            if d.execute_script("return document.readyState") != "complete":
+                return False
+            title = d.title or ""
+            return not any(marker in title for marker in self.CHALLENGE_MARKERS)
+
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.25).until(ready)
+        except TimeoutException:
+            pass
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool, created on first Selenium fallback."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
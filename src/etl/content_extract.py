@@ -0,0 +1,126 @@
+import re
+import codecs
+from typing import List, Optional, Union
+
+from lxml import etree
+
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+# Subtrees that never carry interview content
+BOILERPLATE_TAGS = frozenset({
+    "script", "style", "nav", "header", "footer", "noscript",
+    "aside", "form", "iframe", "svg", "button",
+})
+
+MIN_LINE_LENGTH = 20        # shorter strings are menu items, labels, breadcrumbs
+FEED_CHUNK      = 16_384    # characters handed to the parser per step
+SNIFF_BYTES     = 1024      # <meta charset> must appear this early (HTML spec)
+DEFAULT_CHARSET = "utf-8"
+
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+
+
+# ─────────────────────────────────────────────
+# STREAMING EXTRACTOR
+# ─────────────────────────────────────────────
+
+class _TextCollector:
+    """
+    lxml parser target: receives tags and text in document order without
+    building a tree. Text inside a boilerplate subtree is dropped; every other
+    text run between two tags becomes one line if it is long enough.
+    """
+
+    def __init__(self, skip_tags=BOILERPLATE_TAGS, min_line_length: int = MIN_LINE_LENGTH):
+        self.skip_tags       = skip_tags
+        self.min_line_length = min_line_length
+        self.lines: List[str] = []
+        self.chars = 0
+        self._skip_depth = 0
+        self._pending: List[str] = []
+
+    def _flush(self):
+        if not self._pending:
+            return
+        text = "".join(self._pending).strip()
+        self._pending = []
+        if len(text) > self.min_line_length:
+            self.lines.append(text)
+            self.chars += len(text) + 1
+
+    def start(self, tag, attrib):
+        self._flush()
+        if self._skip_depth or tag in self.skip_tags:
+            self._skip_depth += 1
+
+    def end(self, tag):
+        self._flush()
+        if self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, data):
+        if not self._skip_depth:
+            self._pending.append(data)
+
+    def close(self):
+        self._flush()
+        return self.lines
+
+
+def _charset(html: bytes, encoding: Optional[str]) -> str:
+    """The response charset if given, else the page's <meta charset>, else UTF-8."""
+    declared = META_CHARSET.search(html[:SNIFF_BYTES])
+    for name in (encoding, declared.group(1).decode("ascii") if declared else None):
+        if not name:
+            continue
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue        # unknown label — try the next source
+    return DEFAULT_CHARSET
+
+
+def decode_html(body: bytes, encoding: Optional[str] = None) -> str:
+    """Whole-body decode with the same charset rules html_to_text applies to bytes."""
+    return body.decode(_charset(body, encoding), errors="replace")
+
+
+def html_to_text(html: Union[str, bytes], max_chars: Optional[int] = None,
+                 max_lines: Optional[int] = None,
+                 skip_tags=BOILERPLATE_TAGS, encoding: Optional[str] = None) -> str:
+    """
+    Visible text of an HTML document, one line per text run, boilerplate removed.
+
+    The document is fed to lxml's HTML parser in chunks and parsing stops as
+    soon as `max_chars` characters or `max_lines` lines have been collected,
+    so the tail of a large page is never tokenised. Bytes are decoded chunk by
+    chunk with `encoding` (the response charset), the page's <meta charset>,
+    or UTF-8 — never left to libxml2, which assumes Latin-1.
+    """
+    collector = _TextCollector(skip_tags)
+    parser    = etree.HTMLParser(target=collector, remove_comments=True, recover=True)
+
+    def enough() -> bool:
+        return (max_chars is not None and collector.chars >= max_chars) or \
+               (max_lines is not None and len(collector.lines) >= max_lines)
+
+    decode = None
+    if isinstance(html, (bytes, bytearray)):
+        decode = codecs.getincrementaldecoder(_charset(html, encoding))(errors="replace").decode
+
+    try:
+        for start in range(0, len(html), FEED_CHUNK):
+            chunk = html[start:start + FEED_CHUNK]
+            parser.feed(decode(chunk) if decode else chunk)
+            if enough():
+                break
+        parser.close()
+    except etree.LxmlError:
+        collector.close()       # keep what was collected before the parser gave up
+
+    lines = collector.lines[:max_lines] if max_lines else collector.lines
+    text  = "\n".join(lines)
+    return text[:max_chars] if max_chars else text
@@ -0,0 +1,156 @@
+import re
+import random
+from typing import Dict, List, Optional, Tuple
+
+import mmh3
+
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+# Raw fields deduplicated, in priority order — an earlier copy always wins.
+# github_raw is a plain problem list and is left alone.
+DEDUP_FIELDS = ("reddit_raw", "web_raw", "ambitionbox_raw")
+
+NUM_PERM          = 64      # MinHash signature length
+BANDS             = 16      # LSH bands × rows = NUM_PERM; ≈0.5 Jaccard to become a candidate
+SHINGLE_WORDS     = 5
+MIN_PASSAGE_CHARS = 200     # consecutive short lines are merged up to this size
+THRESHOLD         = 0.7     # estimated Jaccard at or above which a passage is a duplicate
+
+# Section markers written by the extraction agents — structure, never content
+_HEADER_RE = re.compile(r"^(=== POST ===|--- (SOURCE|DIRECT): .* ---)$")
+_WORD_RE   = re.compile(r"[a-z0-9]+")
+
+_MERSENNE = (1 << 61) - 1
+_rng      = random.Random(0x5EED)    # fixed, so signatures are stable across runs
+_PERMS    = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+
+
+# ─────────────────────────────────────────────
+# MINHASH
+# ─────────────────────────────────────────────
+
+def _shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(text: str) -> Optional[Tuple[int, ...]]:
+    """NUM_PERM-long MinHash signature of the text's word 5-gram shingles (None if no words)."""
+    hashes = [mmh3.hash64(s, signed=False)[0] for s in _shingles(text)]
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMS)
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures. add() returns False when the passage
+    is a near-duplicate of one already added, so the first copy is kept.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, bands: int = BANDS):
+        self.threshold = threshold
+        self.bands     = bands
+        self.rows      = NUM_PERM // bands
+        self._buckets: Dict[Tuple[int, tuple], List[int]] = {}
+        self._sigs:    List[Tuple[int, ...]] = []
+
+    def add(self, text: str) -> bool:
+        sig = minhash(text)
+        if sig is None:
+            return True
+
+        keys = [(b, sig[b * self.rows:(b + 1) * self.rows]) for b in range(self.bands)]
+        for key in keys:
+            for other in self._buckets.get(key, ()):
+                if similarity(sig, self._sigs[other]) >= self.threshold:
+                    return False
+
+        self._sigs.append(sig)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(len(self._sigs) - 1)
+        return True
+
+
+# ─────────────────────────────────────────────
+# PASSAGE DEDUP
+# ─────────────────────────────────────────────
+
+def _passages(block: List[str]) -> List[List[str]]:
+    """Groups a block's lines into passages of at least MIN_PASSAGE_CHARS (headers stand alone)."""
+    passages, current, size = [], [], 0
+    for line in block:
+        if _HEADER_RE.match(line.strip()):
+            if current:
+                passages.append(current)
+            passages.append([line])
+            current, size = [], 0
+            continue
+        current.append(line)
+        size += len(line)
+        if size >= MIN_PASSAGE_CHARS:
+            passages.append(current)
+            current, size = [], 0
+    if current:
+        passages.append(current)
+    return passages
+
+
+def _dedupe_text(text: str, index: NearDuplicateIndex, stats: dict) -> str:
+    kept_blocks = []
+    for block in re.split(r"\n\s*\n", text):
+        lines = [l for l in block.split("\n") if l.strip()]
+        kept, content = [], False
+        for passage in _passages(lines):
+            if len(passage) == 1 and _HEADER_RE.match(passage[0].strip()):
+                kept.extend(passage)
+                continue
+            stats["passages"] += 1
+            if index.add("\n".join(passage)):
+                kept.extend(passage)
+                content = True
+            else:
+                stats["dropped"] += 1
+        # A section whose every passage was a duplicate goes entirely, header included
+        if content:
+            kept_blocks.append("\n".join(kept))
+    return "\n\n" + "\n\n".join(kept_blocks) if kept_blocks else ""
+
+
+def dedupe_extracted(extracted: Dict, fields=DEDUP_FIELDS, threshold: float = THRESHOLD) -> Dict:
+    """
+    Drops near-duplicate passages across sources before they reach the filter prompt.
+
+    Every field is split into passages (a Reddit post body or comment, a
+    scraped paragraph), each passage is MinHashed, and any passage whose
+    estimated Jaccard similarity to an earlier one reaches `threshold` is
+    removed. Returns a copy of `extracted` with the cleaned fields and a
+    "dedup" stats block; source_metadata keeps the raw extraction sizes.
+    """
+    index  = NearDuplicateIndex(threshold)
+    out    = dict(extracted)
+    stats  = {"passages": 0, "dropped": 0, "chars_before": 0, "chars_after": 0}
+
+    for field in fields:
+        text = extracted.get(field) or ""
+        if not text.strip():
+            continue
+        cleaned = _dedupe_text(text, index, stats)
+        stats["chars_before"] += len(text)
+        stats["chars_after"]  += len(cleaned)
+        out[field] = cleaned
+
+    out["dedup"] = stats
+    print(f"[Dedup] Dropped {stats['dropped']}/{stats['passages']} near-duplicate passages "
+          f"({stats['chars_before']} → {stats['chars_after']} chars)")
+    return out
@@ -1,16 +1,22 @@
 import os
 import time
-import requests
-import praw
-from bs4 import BeautifulSoup
+import asyncio
+import threading
+import weakref
+import httpx
 from typing import Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
-from typing import Optional
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+
+from src.etl.async_engine import AsyncFetcher, Deadline, SingleFlight, run_async
+from src.etl.browser_pool import get_browser_pool
+from src.etl.content_extract import html_to_text
+from src.etl.query_builder import get_query_planner
+from src.etl.leetcode_index import get_leetcode_index, parse_company_csv
+from src.etl.reddit_watermarks import RedditWatermarkStore
+from src.etl.source_health import get_source_health
+from src.utils.companies import closest_name, company_slug, get_company_registry
 
 load_dotenv()
 
@@ -20,52 +26,6 @@ load_dotenv()
 
 GITHUB_BASE_URL = "https://raw.githubusercontent.com/krishnadey30/LeetCode-Questions-CompanyWise/master/"
 
-COMPANY_ALIASES = {
-    "jp morgan":      "jpmorgan",
-    "j.p. morgan":    "jpmorgan",
-    "jpmorgan chase": "jpmorgan",
-    "facebook":       "facebook",
-    "meta":           "facebook",      # repo uses 'facebook', not 'meta'
-    "microsoft":      "microsoft",
-    "google":         "google",
-    "amazon":         "amazon",
-    "goldman sachs":  "goldman_sachs",
-    "de shaw":        "de_shaw",
-    "d.e. shaw":      "de_shaw",
-    "thoughtworks":   "thoughtworks",
-    "flipkart":       "flipkart",
-    "adobe":          "adobe",
-    "oracle":         "oracle",
-    "uber":           "uber",
-    "linkedin":       "linkedin",
-    "atlassian":      "atlassian",
-    "samsung":        "samsung",
-    "cisco":          "cisco",
-    "infosys":        "infosys",
-    "tcs":            "tcs",
-    "wipro":          "wipro",
-    "razorpay":       "razorpay",
-    "swiggy":         "swiggy",
-    "zomato":         "zomato",
-    "paytm":          "paytm",
-    "apple":          "apple",
-    "netflix":        "netflix",
-    "twitter":        "twitter",
-    "airbnb":         "airbnb",
-    "lyft":           "lyft",
-    "salesforce":     "salesforce",
-    "bloomberg":      "bloomberg",
-    "intuit":         "intuit",
-    "snapchat":       "snapchat",
-    "spotify":        "spotify",
-    "vmware":         "vmware",
-    "paypal":         "paypal",
-    "nvidia":         "nvidia",
-    "yelp":           "yelp",
-    "dropbox":        "dropbox",
-    "quora":          "quora",
-}
-
 REDDIT_SUBREDDITS = [
     "csMajors",
     "cscareerquestions",
@@ -130,6 +90,26 @@ class DataSufficiencyChecker:
         "web":    800,
     }
 
+    # Sources AmbitionBox is allowed to stand in for
+    COMPENSATES_FOR = ("reddit", "web")
+
+    @staticmethod
+    def needs_ambitionbox(results: Dict[str, SourceResult]) -> Optional[bool]:
+        """
+        Decides from possibly incomplete results whether AmbitionBox is wanted.
+        True  → a source it compensates for came back weak.
+        False → every source it compensates for came back usable.
+        None  → not decidable yet.
+        """
+        pending = False
+        for key in DataSufficiencyChecker.COMPENSATES_FOR:
+            result = results.get(key)
+            if result is None:
+                pending = True
+            elif not result.is_usable():
+                return True
+        return None if pending else False
+
     @staticmethod
     def check(results: Dict[str, SourceResult]) -> dict:
         report  = {"sufficient": False, "sources_passing": 0, "details": {}, "recommendation": ""}
@@ -170,6 +150,36 @@ class DataSufficiencyChecker:
         return report
 
 
+class IncrementalSufficiency:
+    """
+    The same gate as DataSufficiencyChecker, fed one SourceResult at a time
+    as agents finish. Lets fast mode stop waiting as soon as two sources pass
+    and an optional quality bar (total usable chars) is met.
+    """
+    def __init__(self, min_total_chars: int = 0):
+        self.min_total_chars = min_total_chars
+        self.results: Dict[str, SourceResult] = {}
+        self.report = DataSufficiencyChecker.check(self.results)
+
+    def feed(self, result: SourceResult) -> dict:
+        self.results[result.source] = result
+        self.report = DataSufficiencyChecker.check(self.results)
+        return self.report
+
+    @property
+    def usable_chars(self) -> int:
+        return sum(r.char_count for r in self.results.values() if r.is_usable())
+
+    def gate_passed(self) -> bool:
+        return self.report["sufficient"]
+
+    def quality_met(self) -> bool:
+        return self.usable_chars >= self.min_total_chars
+
+    def satisfied(self) -> bool:
+        return self.gate_passed() and self.quality_met()
+
+
 # ─────────────────────────────────────────────
 # GITHUB AGENT
 # ─────────────────────────────────────────────
@@ -178,45 +188,98 @@ class GitHubCodingAgent:
     """
     Fetches LeetCode problem names from the community CSV repo.
 
-    CSV column layout:  ID, Title, Frequency, Difficulty, ...
-      parts[0] = numeric row ID   → skip
-      parts[1] = problem title    → extract this
+    Uses the local LeetCode index (src/etl/leetcode_index.py) once it has been
+    synced; otherwise falls back to probing raw CSVs per filename variant.
+    Problems are ranked by frequency, most asked first.
     """
 
     def extract(self, company: str) -> SourceResult:
-        print(f"[GitHub] Fetching problems for '{company}'...")
-        variants = self._filename_variants(company)
+        return run_async(_standalone(self.extract_async, company))
 
+    async def extract_async(self, company: str, fetcher: AsyncFetcher) -> SourceResult:
+        print(f"[GitHub] Fetching problems for '{company}'...")
+        registry = get_company_registry()
+        variants = registry.candidates(company, "github")
+
+        index = get_leetcode_index()
+        if index.is_synced():
+            return self._from_index(index, variants, company)
+
+        # Negative cache first: a cached miss must not use up a half-open trial
+        health  = get_source_health()
+        missing = health.known_missing("github", company)
+        if missing:
+            return SourceResult("github", "", "failed", f"Cached miss: {missing}")
+        skip = health.open_reason("github")
+        if skip:
+            return SourceResult("github", "", "skipped", f"Circuit open: {skip}")
+
+        # Stops at the first usable variant; a resolved company has only one
+        results = []
         for variant in variants:
             url    = f"{GITHUB_BASE_URL}{variant}_alltime.csv"
-            result = self._try_fetch(url, variant)
+            result = await self._try_fetch(url, variant, fetcher)
             if result.is_usable():
+                registry.resolve(company, "github", variant)
+                health.record_success("github")
+                return result
+            results.append(result)
+
+        # _try_fetch has already reported real failures; 404s and short CSVs mean GitHub answered
+        if not any(self._is_failure(r) for r in results):
+            health.record_success("github")
+
+        reason = f"No CSV found for '{company}'. Tried variants: {variants}"
+        if all(r.reason.startswith("404") for r in results):
+            health.remember_missing("github", company, reason)
+        return SourceResult("github", "", "failed", reason)
+
+    @staticmethod
+    def _is_failure(result: SourceResult) -> bool:
+        return result.status == "failed" and not result.reason.startswith("404")
+
+    def _from_index(self, index, variants: list, company: str) -> SourceResult:
+        """Local lookup in the synced LeetCode index — no per-variant 404 probing."""
+        for variant in variants:
+            result = self._index_result(index, variant, company)
+            if result:
+                return result
+
+        # Fuzzy matching scans every company key, so only after the direct keys miss
+        fuzzy = closest_name(variants[0], index.companies())
+        if fuzzy and fuzzy not in variants:
+            variants = variants + [fuzzy]
+            result   = self._index_result(index, fuzzy, company)
+            if result:
                 return result
 
         return SourceResult(
             "github", "", "failed",
-            f"No CSV found for '{company}'. Tried variants: {variants}"
+            f"'{company}' not in LeetCode index. Tried variants: {variants}"
         )
 
-    def _filename_variants(self, company: str) -> list:
-        lower    = company.lower().strip()
-        variants = []
-        if lower in COMPANY_ALIASES:
-            variants.append(COMPANY_ALIASES[lower])
-        standard = lower.replace(" ", "_").replace(".", "").replace("-", "_")
-        if standard not in variants:
-            variants.append(standard)
-        nospace = lower.replace(" ", "").replace(".", "").replace("-", "")
-        if nospace not in variants:
-            variants.append(nospace)
-        return variants
-
-    def _try_fetch(self, url: str, variant: str) -> SourceResult:
+    def _index_result(self, index, variant: str, company: str) -> Optional[SourceResult]:
+        rows = index.top_problems(variant, limit=100)
+        if not rows:
+            return None
+        problems = list(dict.fromkeys(r["title"] for r in rows))
+        if len(problems) < 5:
+            return SourceResult(
+                "github", "\n".join(problems), "partial",
+                f"Only {len(problems)} problems indexed"
+            )
+        get_company_registry().resolve(company, "github", variant)
+        print(f"[GitHub] ✅ {len(problems)} problems via local index ('{variant}')")
+        return SourceResult("github", "\n".join(problems), "ok")
+
+    async def _try_fetch(self, url: str, variant: str, fetcher: AsyncFetcher) -> SourceResult:
         try:
-            r = requests.get(url, timeout=10)
+            r = await fetcher.get(url, purpose="github")
             if r.status_code == 404:
                 return SourceResult("github", "", "failed", f"404 for variant '{variant}'")
             if r.status_code != 200:
+                get_source_health().record_failure("github", f"HTTP {r.status_code}",
+                                                   quota=r.status_code == 429)
                 return SourceResult("github", "", "failed", f"HTTP {r.status_code}")
 
             problems = self._parse_csv(r.text)
@@ -231,24 +294,16 @@ class GitHubCodingAgent:
             print(f"[GitHub] ✅ {len(problems)} problems via variant '{variant}'")
             return SourceResult("github", data, "ok")
 
-        except requests.Timeout:
+        except httpx.TimeoutException:
+            get_source_health().record_failure("github", "Request timed out")
             return SourceResult("github", "", "failed", "Request timed out")
         except Exception as e:
+            get_source_health().record_failure("github", str(e))
             return SourceResult("github", "", "failed", str(e))
 
     def _parse_csv(self, raw: str) -> list:
-        problems = []
-        for line in raw.splitlines():
-            line = line.strip()
-            if not line or line.lower().startswith(('id', 'title', 'frequency', 'difficulty', 'leetcode')):
-                continue
-            parts = [p.strip().strip('"') for p in line.split(',') if p.strip()]
-            if len(parts) < 2:
-                continue
-            # Title is often the second column
-            title = parts[1] if len(parts) > 1 else parts[0]
-            if title and len(title) > 5 and not title.replace(" ", "").isdigit():
-                problems.append(title)
+        rows     = sorted(parse_company_csv(raw), key=lambda r: -r["frequency"])
+        problems = [r["title"] for r in rows if len(r["title"]) > 5]
         return list(dict.fromkeys(problems))[:100]
 
 
@@ -256,20 +311,81 @@ class GitHubCodingAgent:
 # REDDIT AGENT
 # ─────────────────────────────────────────────
 
+class _TextBuffer:
+    """
+    Thread-safe list-of-chunks buffer shared by the Reddit workers.
+    Once the character target is reached `full` is set and further chunks are refused.
+    """
+    def __init__(self, target_chars: int):
+        self.target_chars = target_chars
+        self.full         = threading.Event()
+        self._chunks      = []
+        self._sources     = []
+        self._chars       = 0
+        self._lock        = threading.Lock()
+
+    def add(self, chunk: str, source: str) -> bool:
+        with self._lock:
+            if self.full.is_set():
+                return False
+            self._chunks.append(chunk)
+            self._chars += len(chunk)
+            if source not in self._sources:
+                self._sources.append(source)
+            if self._chars >= self.target_chars:
+                self.full.set()
+            return True
+
+    @property
+    def chars(self) -> int:
+        return self._chars
+
+    @property
+    def sources(self) -> list:
+        return list(self._sources)
+
+    def text(self) -> str:
+        with self._lock:
+            return "".join(self._chunks)
+
+
 class RedditExperienceAgent:
     """
     Searches multiple subreddits for interview experiences.
     Searches both 'top' and 'new' per subreddit for quality + recency.
     Stops early once TARGET_CHAR_COUNT is reached.
+
+    Parallel mode (default) searches every subreddit at once and hydrates
+    comment trees on a bounded worker pool, pausing when the praw
+    rate-limit budget runs low. With a Deadline, collection stops when it
+    expires and whatever is buffered is returned as partial.
+
+    Incremental mode (default) keeps per-company watermarks: once a
+    subreddit has been crawled, later runs only search 'new' down to the
+    newest post already seen, and the buffer is topped up from the stored
+    corpus of previously extracted posts.
     """
-    MIN_POST_SCORE     = 5
-    MIN_POST_LENGTH    = 100
-    MIN_COMMENT_LENGTH = 50
-    MAX_POSTS_PER_SUB  = 10
-    MAX_COMMENTS_POST  = 5
-    TARGET_CHAR_COUNT  = 3000
-
-    def __init__(self):
+    MIN_POST_SCORE      = 5
+    MIN_POST_LENGTH     = 100
+    MIN_COMMENT_LENGTH  = 50
+    MAX_POSTS_PER_SUB   = 10
+    MAX_COMMENTS_POST   = 5
+    TARGET_CHAR_COUNT   = 3000
+    MAX_COMMENT_WORKERS = 4
+    RATE_LIMIT_RESERVE  = 5      # requests kept in hand before pausing for the reset
+    MAX_RATE_LIMIT_WAIT = 60
+
+    def __init__(self, parallel: bool = True, deadline: Optional[Deadline] = None,
+                 incremental: bool = True):
+        self.parallel    = parallel
+        self.deadline    = deadline or Deadline()
+        self.incremental = incremental
+        self._buffer     = _TextBuffer(self.TARGET_CHAR_COUNT)
+        self._store: Optional[RedditWatermarkStore] = None
+        self._fresh      = []      # (sub, post, chunk) hydrated this run
+        self._crawled    = {}      # sub → ({seen id: created_utc}, qualifying ids, newest created_utc, full crawl?)
+        self._errors     = []      # failed subreddit searches this run
+        import praw     # deferred: only Reddit runs pay for praw's import
         self.reddit = praw.Reddit(
             client_id     = os.getenv("REDDIT_CLIENT_ID"),
             client_secret = os.getenv("REDDIT_CLIENT_SECRET"),
@@ -278,54 +394,209 @@ class RedditExperienceAgent:
 
     def extract(self, company: str, role: str) -> SourceResult:
         print(f"[Reddit] Searching '{company} {role}' interviews...")
-        all_text = ""
-        used     = []
-
-        for sub in REDDIT_SUBREDDITS:
-            chunk = self._search_subreddit(sub, company, role)
-            if chunk:
-                all_text += chunk
-                used.append(sub)
-            if len(all_text) >= self.TARGET_CHAR_COUNT:
-                break
+        buffer = self._buffer = _TextBuffer(self.TARGET_CHAR_COUNT)
+        self._store   = RedditWatermarkStore(company) if self.incremental else None
+        self._fresh   = []
+        self._crawled = {}
+        self._errors  = []
+
+        health = get_source_health()
+        skip   = health.open_reason("reddit")
+        if skip:
+            return SourceResult("reddit", "", "skipped", f"Circuit open: {skip}")
+
+        if self.parallel:
+            self._collect_parallel(buffer, company, role)
+        else:
+            for sub in REDDIT_SUBREDDITS:
+                for post in self._search_posts(sub, company, role):
+                    if self.deadline.expired():
+                        break
+                    chunk = self._extract_post(post)
+                    if not self._keep(buffer, sub, post, chunk):
+                        break
+                if buffer.full.is_set() or self.deadline.expired():
+                    break
+
+        # Every subreddit search failing means Reddit itself is down or refusing us
+        if len(self._errors) >= len(REDDIT_SUBREDDITS):
+            health.record_failure("reddit", self._errors[-1])
+        elif self._crawled:
+            health.record_success("reddit")
+
+        if self._store:
+            stored = self._top_up_from_store(buffer, role)
+            self._persist(role)
+            print(f"[Reddit] {len(self._fresh)} new posts, {stored} from stored corpus")
 
-        if not all_text:
+        if self.deadline.expired():
+            return self.partial_result()
+
+        if not buffer.chars:
             return SourceResult("reddit", "", "empty",
                                 f"No usable posts found across: {REDDIT_SUBREDDITS}")
 
-        status = "ok" if len(all_text) >= self.TARGET_CHAR_COUNT else "partial"
+        all_text = buffer.text()
+        used     = buffer.sources
+        status   = "ok" if len(all_text) >= self.TARGET_CHAR_COUNT else "partial"
         print(f"[Reddit] ✅ {len(all_text)} chars from {used}")
         return SourceResult("reddit", all_text, status, f"From: {used}")
 
-    def _search_subreddit(self, sub_name: str, company: str, role: str) -> str:
-        query = f"{company} {role} interview experience"
-        text  = ""
-        seen  = set()
+    def partial_result(self) -> SourceResult:
+        """Whatever has been buffered so far — used when the run deadline cuts the agent off."""
+        text = self._buffer.text()
+        if not text:
+            return SourceResult("reddit", "", "failed", "Deadline reached before any post was collected")
+        return SourceResult("reddit", text, "partial",
+                            f"Deadline reached — from: {self._buffer.sources}")
+
+    def _keep(self, buffer: _TextBuffer, sub: str, post, chunk: str) -> bool:
+        """Adds a freshly hydrated post to the buffer and remembers it for the corpus."""
+        if not chunk:
+            return True
+        self._fresh.append((sub, post, chunk))
+        return buffer.add(chunk, sub)
+
+    def _top_up_from_store(self, buffer: _TextBuffer, role: str) -> int:
+        """Fills the rest of the buffer with previously extracted posts, best-scored first."""
+        added = 0
+        fresh = {post.id for _, post, _ in self._fresh}
+        for entry in self._store.stored_posts(role, exclude=fresh):
+            if entry["sub"] not in REDDIT_SUBREDDITS or not buffer.add(entry["text"], entry["sub"]):
+                continue
+            added += 1
+            if buffer.full.is_set():
+                break
+        return added
+
+    def _persist(self, role: str):
+        for sub, post, chunk in self._fresh:
+            self._store.record_post(role, sub, post.id, post.score, post.created_utc, chunk)
+        hydrated = {post.id for _, post, _ in self._fresh}
+        for sub, (seen_ids, qualifying, newest, full) in self._crawled.items():
+            # Posts that qualified but were never hydrated (buffer filled first)
+            # must stay unseen so a later run still collects them.
+            skipped = qualifying - hydrated
+            if skipped:
+                kept = {pid: created for pid, created in seen_ids.items() if pid not in skipped}
+                self._store.mark_crawled(role, sub, kept)
+            else:
+                self._store.mark_crawled(role, sub, seen_ids, newest, full)
+        try:
+            self._store.save()
+        except OSError as e:
+            print(f"[Reddit] ⚠️ Could not save watermarks: {e}")
+
+    async def extract_async(self, company: str, role: str) -> SourceResult:
+        # praw is blocking — run it on a worker thread so the event loop stays free
+        return await asyncio.to_thread(self.extract, company, role)
+
+    def _collect_parallel(self, buffer: _TextBuffer, company: str, role: str):
+        """
+        Fans subreddit searches out on one pool and comment hydration on
+        another. As soon as the buffer is full, queued work is cancelled and
+        in-flight hydrations finish in the background with their output discarded.
+        """
+        search_pool  = ThreadPoolExecutor(max_workers=len(REDDIT_SUBREDDITS))
+        comment_pool = ThreadPoolExecutor(max_workers=self.MAX_COMMENT_WORKERS)
+        searches     = {search_pool.submit(self._search_posts, sub, company, role): sub
+                        for sub in REDDIT_SUBREDDITS}
+        owners       = dict(searches)      # future → subreddit, for searches and hydrations
+        post_of      = {}                  # hydration future → post
+        pending      = set(searches)
+        seen         = set()
+
+        try:
+            while pending and not buffer.full.is_set() and not self.deadline.expired():
+                done, pending = wait(pending, timeout=self.deadline.remaining(),
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    sub = owners[future]
+                    if future in searches:
+                        for post in future.result():
+                            if post.id in seen:
+                                continue
+                            seen.add(post.id)
+                            hydration = comment_pool.submit(self._extract_post_if_needed, post, buffer)
+                            owners[hydration]  = sub
+                            post_of[hydration] = post
+                            pending.add(hydration)
+                    else:
+                        self._keep(buffer, sub, post_of[future], future.result())
+        finally:
+            search_pool.shutdown(wait=False, cancel_futures=True)
+            comment_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _search_posts(self, sub_name: str, company: str, role: str) -> list:
+        """
+        Returns qualifying posts without touching their comments.
+        Full crawl: 'top' + 'new'. Incremental crawl (watermark exists and is
+        recent): 'new' only, stopping at the first post already seen.
+        """
+        query  = f"{company} {role} interview experience"
+        posts  = []
+        seen: Dict[str, float] = {}     # post id → created_utc, kept or rejected
+        full   = not self._store or self._store.needs_full_crawl(role, sub_name)
+        floor  = 0.0 if full else self._store.newest_created(role, sub_name)
+        newest = floor
 
         try:
             sub = self.reddit.subreddit(sub_name)
-            for sort in ("top", "new"):
+            for sort in (("top", "new") if full else ("new",)):
+                self._respect_rate_limit()
                 for post in sub.search(query, sort=sort, limit=self.MAX_POSTS_PER_SUB):
                     if post.id in seen:
                         continue
-                    seen.add(post.id)
+                    if not full and (post.created_utc <= floor or self._store.is_seen(role, sub_name, post.id)):
+                        break       # 'new' is newest-first — everything below is already known
+                    seen[post.id] = post.created_utc
+                    newest = max(newest, post.created_utc)
+                    if self._store and self._store.in_corpus(role, post.id):
+                        continue    # full recrawl: already extracted; rejected posts are re-checked
                     if post.score < self.MIN_POST_SCORE:
                         continue
                     if len(post.selftext.strip()) < self.MIN_POST_LENGTH:
                         continue
-                    text += self._extract_post(post)
+                    posts.append(post)
         except Exception as e:
             print(f"[Reddit] ⚠️ r/{sub_name}: {e}")
+            self._errors.append(f"r/{sub_name}: {e}")
+            return posts    # no watermark update — the next run retries this subreddit
 
-        return text
+        self._crawled[sub_name] = (seen, {post.id for post in posts}, newest, full)
+        return posts
+
+    def _respect_rate_limit(self):
+        """Sleeps until the praw rate-limit window resets when the remaining budget is low."""
+        try:
+            limits = self.reddit.auth.limits
+        except Exception:
+            return
+        remaining = limits.get("remaining")
+        reset_at  = limits.get("reset_timestamp")
+        if remaining is None or reset_at is None or remaining > self.RATE_LIMIT_RESERVE:
+            return
+        wait = self.deadline.cap(min(max(0.0, reset_at - time.time()), self.MAX_RATE_LIMIT_WAIT))
+        if wait:
+            print(f"[Reddit] ⏳ Rate-limit budget low ({remaining:.0f} left) — waiting {wait:.0f}s")
+            time.sleep(wait)
+
+    def _extract_post_if_needed(self, post, buffer: _TextBuffer) -> str:
+        # A queued hydration that starts after the buffer filled up (or time ran out) costs nothing
+        if buffer.full.is_set() or self.deadline.expired():
+            return ""
+        return self._extract_post(post)
 
     def _extract_post(self, post) -> str:
-        text  = f"\n\n=== POST ===\n"
-        text += f"Title: {post.title}\n"
-        text += f"Score: {post.score}\n"
-        text += f"Body: {post.selftext.replace(chr(10), ' ').strip()}\n"
+        parts = [
+            "\n\n=== POST ===\n",
+            f"Title: {post.title}\n",
+            f"Score: {post.score}\n",
+            f"Body: {post.selftext.replace(chr(10), ' ').strip()}\n",
+        ]
 
         try:
+            self._respect_rate_limit()
             post.comments.replace_more(limit=2)
             count = 0
             for comment in post.comments.list():
@@ -336,12 +607,12 @@ class RedditExperienceAgent:
                     continue
                 if comment.author and comment.author.name in ("AutoModerator", "[deleted]"):
                     continue
-                text  += f"Comment: {body.replace(chr(10), ' ')}\n"
+                parts.append(f"Comment: {body.replace(chr(10), ' ')}\n")
                 count += 1
         except Exception:
             pass
 
-        return text
+        return "".join(parts)
 
 
 # ─────────────────────────────────────────────
@@ -350,7 +621,9 @@ class RedditExperienceAgent:
 
 class WebScrapingAgent:
     """
-    Fetches interview content. Tries requests first (fast), falls back to Selenium for Cloudflare-protected pages.
+    Fetches interview content. Tries a plain HTTP fetch first (fast), falls back to Selenium for Cloudflare-protected pages.
+    Known-good URLs from the query planner are scraped first; Google Custom Search runs only when they are not enough.
+    Site filters and their result pages are fetched concurrently; politeness comes from the fetcher's per-domain token buckets.
     """
 
     HEADERS = {
@@ -362,55 +635,113 @@ class WebScrapingAgent:
     }
 
     MAX_CHARS_PER_PAGE = 6000
+    MAX_PAGE_BYTES = 1_500_000      # download cap; article text sits well inside it
     MAX_PAGES = 6
+    MAX_FILTER_WINNERS = 2
 
-    def __init__(self):
+    def __init__(self, deadline: Optional[Deadline] = None):
         self.api_key = os.getenv("GOOGLE_SEARCH_API_KEY")
         self.cx = os.getenv("GOOGLE_SEARCH_CX")
+        self.deadline = deadline or Deadline()
+        self._collected = []    # (url, text) for every page scraped so far, in finish order
 
     def extract(self, company: str, role: str) -> SourceResult:
+        return run_async(_standalone(self.extract_async, company, role))
+
+    async def extract_async(self, company: str, role: str, fetcher: AsyncFetcher) -> SourceResult:
         print(f"[Web] Searching for '{company} {role}' interview data...")
 
-        if not self.api_key or not self.cx:
-            print("[Web] ⚠️ Missing Google API keys → falling back to direct scraping only")
-            return self._direct_scrape_fallback(company, role)
+        # Known-good URLs from the query planner first — enough of them skips search entirely
+        known = await self._scrape_known_urls(company, role, fetcher)
+        if known.status == "ok":
+            return known
 
-        # Try Google Custom Search first
-        for source_filter in WEB_FALLBACK_SOURCES:
-            result = self._search_and_scrape(company, role, source_filter)
-            if result.is_usable():
-                return result
-
-        # If Google gives nothing, try direct scraping on known good sites
-        return self._direct_scrape_fallback(company, role)
+        if not self.api_key or not self.cx:
+            print("[Web] ⚠️ Missing Google API keys → known URLs only")
+            return known
+
+        skip = get_source_health().open_reason("google_search")
+        if skip:
+            print(f"[Web] ⚠️ Google search circuit open ({skip}) → known URLs only")
+            return known
+
+        # Query every site filter concurrently; the first usable ones win
+        winners = await self._first_usable_searches(company, role, fetcher)
+        if winners:
+            if known.is_usable():
+                winners.append(known)
+            return self._merge_search_results(winners)
+
+        return known
+
+    async def _first_usable_searches(self, company: str, role: str, fetcher: AsyncFetcher) -> list:
+        """
+        Runs one search per WEB_FALLBACK_SOURCES filter at the same time and
+        collects results in completion order. Once MAX_FILTER_WINNERS usable
+        results are in, the slower searches are cancelled.
+        """
+        tasks = [
+            asyncio.create_task(self._search_and_scrape(company, role, source_filter, fetcher))
+            for source_filter in WEB_FALLBACK_SOURCES
+        ]
+        winners = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result.is_usable():
+                    winners.append(result)
+                    if len(winners) >= self.MAX_FILTER_WINNERS:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return winners
 
-    def _search_and_scrape(self, company: str, role: str, source_filter: str) -> SourceResult:
-        """Google Custom Search + scrape"""
+    @staticmethod
+    def _merge_search_results(winners: list) -> SourceResult:
+        if len(winners) == 1:
+            return winners[0]
+        combined = "".join(r.data for r in winners)
+        print(f"[Web] ✅ {len(combined)} chars from {len(winners)} site filters")
+        return SourceResult("web", combined, "ok", f"Merged {len(winners)} site filters")
+
+    async def _search_and_scrape(self, company: str, role: str, source_filter: str,
+                                 fetcher: AsyncFetcher) -> SourceResult:
+        """Google Custom Search + concurrent scrape of the result pages"""
         query = f"{company} {role} interview experience OR questions {source_filter}"
         try:
             url = (
                 f"https://www.googleapis.com/customsearch/v1"
-                f"?q={requests.utils.quote(query)}"
+                f"?q={quote(query)}"
                 f"&key={self.api_key}&cx={self.cx}&num=6"
             )
-            resp = requests.get(url, timeout=10)
+            resp = await fetcher.get(url, purpose="search")
 
             if resp.status_code == 429:
+                get_source_health().record_failure("google_search", "Google API quota exhausted (429)",
+                                                   quota=True)
                 return SourceResult("web", "", "failed", "Google API quota exhausted (429)")
+            if resp.status_code != 200:
+                get_source_health().record_failure("google_search", f"HTTP {resp.status_code}")
+                return SourceResult("web", "", "failed", f"Search HTTP {resp.status_code}")
 
+            get_source_health().record_success("google_search")
             items = resp.json().get("items", [])
             if not items:
                 return SourceResult("web", "", "empty", f"No results for {source_filter}")
 
+            links = [item.get("link", "") for item in items[:self.MAX_PAGES]]
+            pages = await asyncio.gather(*(self._scrape_and_record(link, fetcher) for link in links))
+
             combined = ""
             scraped = 0
 
-            for item in items[:self.MAX_PAGES]:
-                page_text = self._scrape_page(item.get("link", ""))
+            # Keep search-rank order regardless of which page finished first
+            for link, page_text in zip(links, pages):
                 if page_text and len(page_text) > 300:
-                    combined += f"\n\n--- SOURCE: {item['link']} ---\n{page_text[:self.MAX_CHARS_PER_PAGE]}"
+                    combined += f"\n\n--- SOURCE: {link} ---\n{page_text[:self.MAX_CHARS_PER_PAGE]}"
                     scraped += 1
-                time.sleep(0.8)  # Be gentle
 
             if not combined:
                 return SourceResult("web", "", "empty", f"All pages empty ({source_filter})")
@@ -422,54 +753,53 @@ class WebScrapingAgent:
         except Exception as e:
             return SourceResult("web", "", "failed", f"Search error: {str(e)}")
 
-    def _scrape_page(self, url: str) -> Optional[str]:
-        """Improved scraper: requests first → Selenium fallback"""
+    async def _scrape_and_record(self, url: str, fetcher: AsyncFetcher) -> Optional[str]:
+        """Scrapes a page and remembers it, so a deadline cut-off can still return it."""
+        text = await self._scrape_page(url, fetcher)
+        if text and len(text) > 300:
+            self._collected.append((url, text))
+        return text
+
+    def partial_result(self) -> SourceResult:
+        """Pages scraped before the run deadline, across every search in flight."""
+        if not self._collected:
+            return SourceResult("web", "", "failed", "Deadline reached before any page was scraped")
+        combined = "".join(
+            f"\n\n--- SOURCE: {url} ---\n{text[:self.MAX_CHARS_PER_PAGE]}"
+            for url, text in self._collected[:self.MAX_PAGES]
+        )
+        return SourceResult("web", combined, "partial",
+                            f"Deadline reached — {len(self._collected)} pages scraped")
+
+    async def _scrape_page(self, url: str, fetcher: AsyncFetcher) -> Optional[str]:
+        """Improved scraper: plain HTTP first → Selenium fallback"""
         if not url or not url.startswith("http"):
             return None
 
-        # === Fast Try: requests ===
+        # === Fast Try: pooled keep-alive client ===
         try:
-            resp = requests.get(url, headers=self.HEADERS, timeout=12)
+            resp = await fetcher.get(url, headers=self.HEADERS, purpose="page",
+                                     max_bytes=self.MAX_PAGE_BYTES)
             if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, "html.parser")
-                for tag in soup(["script", "style", "nav", "header", "footer", "noscript", 
-                                "aside", "form", "iframe", "svg", "button", "footer"]):
-                    tag.decompose()
-                lines = [l.strip() for l in soup.stripped_strings if len(l.strip()) > 20]
-                text = "\n".join(lines)
+                text = self._html_to_text(resp.text)
                 if len(text) > 400:
                     return text
-        except:
+        except Exception:
             pass
 
         # === Fallback: Selenium (better against Cloudflare) ===
+        # Selenium is blocking, so it runs on a worker thread and never stalls the event loop
+        if self.deadline.expired():
+            return None
+        return await asyncio.to_thread(self._selenium_scrape, url)
+
+    def _selenium_scrape(self, url: str) -> Optional[str]:
         try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            from webdriver_manager.chrome import ChromeDriverManager
-
-            options = Options()
-            options.add_argument("--headless")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-            driver.get(url)
-            time.sleep(4)   # Important: give time for Cloudflare challenge
-            html_content = driver.page_source
-            driver.quit()
-
-            soup = BeautifulSoup(html_content, "html.parser")
-            for tag in soup(["script", "style", "nav", "header", "footer", "noscript", "aside", 
-                            "form", "iframe", "svg", "button"]):
-                tag.decompose()
-
-            lines = [l.strip() for l in soup.stripped_strings if len(l.strip()) > 20]
-            text = "\n".join(lines)
+            # Warm pooled session + readiness wait instead of a fresh Chrome and a fixed sleep
+            pool         = get_browser_pool()
+            html_content = pool.fetch_html(url, deadline=self.deadline)
+
+            text = self._html_to_text(html_content)
             if len(text) > 500:
                 print(f"[Web] Selenium scraped {len(text)} chars from {url[:70]}...")
                 return text
@@ -480,23 +810,31 @@ class WebScrapingAgent:
             print(f"[Web] Selenium failed: {e}")
             return None
 
-    def _direct_scrape_fallback(self, company: str, role: str) -> SourceResult:
-        """Simple fallback: directly scrape known good interview pages"""
-        print("[Web] Using direct scrape fallback...")
-        combined = ""
-        sites = [
-            f"https://www.geeksforgeeks.org/{company.lower().replace(' ', '-')}-interview-experience/",
-            f"https://www.interviewbit.com/{company.lower().replace(' ', '-')}-interview-questions/",
-            f"https://www.ambitionbox.com/interviews/{company.lower().replace(' ', '-')}-interview-questions"
-        ]
+    def _html_to_text(self, html: str) -> str:
+        # Callers keep at most MAX_CHARS_PER_PAGE, so parsing stops there
+        return html_to_text(html, max_chars=self.MAX_CHARS_PER_PAGE)
 
-        for site in sites:
-            text = self._scrape_page(site)
+    async def _scrape_known_urls(self, company: str, role: str, fetcher: AsyncFetcher) -> SourceResult:
+        """Scrapes the URLs the query planner has already validated for this company and role."""
+        try:
+            urls = await get_query_planner().plan(company, role, fetcher)
+        except Exception as e:
+            print(f"[Web] ⚠️ Query planning failed: {e}")
+            urls = []
+        if not urls:
+            return SourceResult("web", "", "empty", "No known-good URLs for this company")
+
+        combined = ""
+        pages = await asyncio.gather(*(self._scrape_and_record(url, fetcher) for url in urls))
+        for url, text in zip(urls, pages):
             if text:
-                combined += f"\n\n--- DIRECT: {site} ---\n{text[:4000]}"
+                combined += f"\n\n--- DIRECT: {url} ---\n{text[:4000]}"
 
+        if not combined:
+            return SourceResult("web", "", "empty", f"Known URLs returned no text ({len(urls)} tried)")
         status = "ok" if len(combined) > 1000 else "partial"
-        return SourceResult("web", combined, status, "Direct scrape fallback")
+        print(f"[Web] {len(combined)} chars from {len(urls)} known URLs")
+        return SourceResult("web", combined, status, "Known-good URLs from query planner")
 
 # ─────────────────────────────────────────────
 # AMBITIONBOX AGENT
@@ -504,7 +842,7 @@ class WebScrapingAgent:
 
 class AmbitionBoxAgent:
     """
-    India-specific fallback. Triggered only when Reddit or Web are weak.
+    India-specific fallback. Its result is kept only when Reddit or Web are weak.
     Most useful for: TCS, Infosys, Wipro, Flipkart, Zomato, Swiggy, Paytm.
     """
     HEADERS = {
@@ -514,36 +852,56 @@ class AmbitionBoxAgent:
             "Chrome/120.0.0.0 Safari/537.36"
         )
     }
+    BOILERPLATE_TAGS = frozenset({"script", "style", "nav", "header", "footer", "noscript"})
+    MAX_LINES        = 300
+    MAX_PAGE_BYTES   = 1_500_000
 
     def extract(self, company: str, role: str) -> SourceResult:
+        return run_async(_standalone(self.extract_async, company, role))
+
+    async def extract_async(self, company: str, role: str, fetcher: AsyncFetcher) -> SourceResult:
         print(f"[AmbitionBox] Fetching '{company}'...")
-        slug = company.lower().replace(" ", "-").replace(".", "")
-        url  = f"https://www.ambitionbox.com/interviews/{slug}-interview-questions"
+        registry = get_company_registry()
+        health   = get_source_health()
+        slug     = registry.identifier(company, "ambitionbox")
+        url      = f"https://www.ambitionbox.com/interviews/{slug}-interview-questions"
+
+        # Same order as GitHub — known misses never claim the trial call
+        missing = health.known_missing("ambitionbox", company)
+        if missing:
+            return SourceResult("ambitionbox", "", "failed", f"Cached miss: {missing}")
+        skip = health.open_reason("ambitionbox")
+        if skip:
+            return SourceResult("ambitionbox", "", "skipped", f"Circuit open: {skip}")
 
         try:
-            resp = requests.get(url, headers=self.HEADERS, timeout=15)
+            resp = await fetcher.get(url, headers=self.HEADERS, purpose="ambitionbox",
+                                     max_bytes=self.MAX_PAGE_BYTES)
             if resp.status_code == 404:
+                health.record_success("ambitionbox")      # the site answered
+                health.remember_missing("ambitionbox", company, f"Not found: {url}")
                 return SourceResult("ambitionbox", "", "failed", f"Not found: {url}")
             if resp.status_code != 200:
+                health.record_failure("ambitionbox", f"HTTP {resp.status_code}",
+                                      quota=resp.status_code == 429)
                 return SourceResult("ambitionbox", "", "failed", f"HTTP {resp.status_code}")
+            health.record_success("ambitionbox")
 
-            soup = BeautifulSoup(resp.text, "html.parser")
-            for tag in soup(["script", "style", "nav", "header", "footer", "noscript"]):
-                tag.decompose()
-
-            lines = [l.strip() for l in soup.stripped_strings if len(l.strip()) > 20]
-            data  = "\n".join(lines[:300])
+            data = html_to_text(resp.text, max_lines=self.MAX_LINES, skip_tags=self.BOILERPLATE_TAGS)
 
             if len(data) < 200:
                 return SourceResult("ambitionbox", data, "partial",
                                     "Sparse — page may be JS-rendered")
 
+            registry.resolve(company, "ambitionbox", slug)
             print(f"[AmbitionBox] ✅ {len(data)} chars")
             return SourceResult("ambitionbox", data, "ok")
 
-        except requests.Timeout:
+        except httpx.TimeoutException:
+            health.record_failure("ambitionbox", "Timed out")
             return SourceResult("ambitionbox", "", "failed", "Timed out")
         except Exception as e:
+            health.record_failure("ambitionbox", str(e))
             return SourceResult("ambitionbox", "", "failed", str(e))
 
 
@@ -551,44 +909,298 @@ class AmbitionBoxAgent:
 # MAIN PIPELINE
 # ─────────────────────────────────────────────
 
-def run_multi_agent_extraction(company: str, role: str) -> Dict:
+async def _standalone(extract_async, *args) -> SourceResult:
+    """Runs a single agent outside the pipeline with its own short-lived fetcher."""
+    async with AsyncFetcher() as fetcher:
+        return await extract_async(*args, fetcher)
+
+
+async def _guarded(key: str, make_coro) -> SourceResult:
+    try:
+        return await make_coro()
+    except Exception as e:
+        return SourceResult(key, "", "failed", f"Unhandled: {e}")
+
+
+def _build_agents(deadline: Deadline):
+    """
+    Instantiates every agent up front so the pipeline can ask an agent for its
+    partial result when the deadline cuts it off. A constructor that raises
+    (e.g. missing praw config) becomes a failed SourceResult instead.
     """
-    Runs GitHub, Reddit, Web in parallel.
-    AmbitionBox runs only as fallback if Reddit or Web are weak.
+    builders = {
+        "github":      GitHubCodingAgent,
+        "reddit":      lambda: RedditExperienceAgent(deadline=deadline),
+        "web":         lambda: WebScrapingAgent(deadline=deadline),
+        "ambitionbox": AmbitionBoxAgent,
+    }
+    agents, failed = {}, {}
+    for key, build in builders.items():
+        try:
+            agents[key] = build()
+        except Exception as e:
+            failed[key] = SourceResult(key, "", "failed", f"Unhandled: {e}")
+    return agents, failed
+
+
+def _cut_off(key: str, agent) -> SourceResult:
+    """Result for an agent the deadline stopped — its partial data if it keeps any."""
+    if agent is not None and hasattr(agent, "partial_result"):
+        return agent.partial_result()
+    return SourceResult(key, "", "failed", "Deadline reached before the agent finished")
+
+
+def run_multi_agent_extraction(company: str, role: str, **options) -> Dict:
+    """
+    Synchronous entry point — see run_multi_agent_extraction_async for options.
     Returns a unified dict with raw data, metadata, and pipeline_ok flag.
     """
+    return run_async(run_multi_agent_extraction_async(company, role, **options))
+
+
+# Max concurrent runs of each agent across every extraction in the process.
+# Matters for batch runs, where many pipelines share the one event loop.
+SOURCE_CONCURRENCY = {
+    "github":      8,
+    "reddit":      2,     # praw shares one rate-limit budget per client id
+    "web":         3,     # each web run fans out into many page fetches
+    "ambitionbox": 2,
+}
+# Semaphores bind to the loop they are first used on, so each loop gets its own
+# set — configure_http() or a plain asyncio.run() caller may bring a new loop.
+_source_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def set_source_concurrency(**caps: int):
+    """Overrides per-source caps, e.g. set_source_concurrency(reddit=1). Call before runs start."""
+    SOURCE_CONCURRENCY.update(caps)
+    _source_slots.clear()
+
+
+def _source_slot(key: str) -> asyncio.Semaphore:
+    slots = _source_slots.setdefault(asyncio.get_running_loop(), {})
+    if key not in slots:
+        slots[key] = asyncio.Semaphore(SOURCE_CONCURRENCY.get(key, 4))
+    return slots[key]
+
+
+async def _capped(key: str, make_coro) -> SourceResult:
+    async with _source_slot(key):
+        return await make_coro()
+
+
+# Sources whose result depends only on the company, never on the role
+ROLE_INDEPENDENT_SOURCES = ("github", "ambitionbox")
+
+
+class SharedCompanySources:
+    """
+    Per-company results for ROLE_INDEPENDENT_SOURCES, shared by every role run
+    in the process. Concurrent runs for the same company join one in-flight
+    fetch; later runs reuse a usable result for up to `ttl` seconds.
+    Unusable results are not kept — the next run tries again.
+    """
+
+    def __init__(self, ttl: float = 6 * 3600):
+        self.ttl      = ttl
+        self._results: Dict[tuple, tuple] = {}     # (source, company slug) → (SourceResult, stored at)
+        self._flight  = SingleFlight()
+
+    def cached(self, key: str, company: str) -> Optional[SourceResult]:
+        hit = self._results.get((key, company_slug(company)))
+        if hit and time.monotonic() - hit[1] < self.ttl:
+            return hit[0]
+        return None
+
+    async def get(self, key: str, company: str, make_coro) -> SourceResult:
+        slot = (key, company_slug(company))
+        hit  = self.cached(key, company)
+        if hit:
+            print(f"[Pipeline] ♻️ {key}: reusing result for '{company}' from an earlier role run")
+            return hit
+        if self._flight.in_flight(slot):
+            print(f"[Pipeline] ♻️ {key}: joining in-flight fetch for '{company}'")
+
+        async def fetch():
+            result = await make_coro()
+            if result.is_usable():
+                self._results[slot] = (result, time.monotonic())
+            return result
+
+        return await self._flight.do(slot, fetch)
+
+    def clear(self):
+        self._results.clear()
+
+
+SHARED_SOURCES = SharedCompanySources()
+
+
+# Agents left running by fast mode with background_remaining=True.
+# Held here so they are not garbage-collected; their fetches warm the HTTP cache.
+_BACKGROUND_TASKS = set()
+
+# Overall time budget per run, in seconds. Unset → no deadline.
+DEFAULT_DEADLINE_S = float(os.getenv("EXTRACTION_DEADLINE_S", "0")) or None
+
+
+async def run_multi_agent_extraction_async(company: str, role: str,
+                                           speculative_ambitionbox: bool = True,
+                                           mode: str = "full",
+                                           min_total_chars: int = 0,
+                                           background_remaining: bool = False,
+                                           deadline_s: Optional[float] = DEFAULT_DEADLINE_S) -> Dict:
+    """
+    Runs GitHub, Reddit, Web concurrently under one event loop.
+    Every HTTP fetch goes through a single AsyncFetcher with per-host limits;
+    blocking clients (praw, Selenium) run on worker threads.
+
+    AmbitionBox is only kept when Reddit or Web are weak. In speculative mode
+    (default) it starts alongside the others so it is off the critical path,
+    and is cancelled as soon as Reddit and Web both come back usable.
+
+    GitHub and AmbitionBox do not depend on the role. They are fetched once
+    per company through SHARED_SOURCES: concurrent role runs join the same
+    in-flight fetch and later ones reuse its result.
+
+    mode="fast" returns as soon as the sufficiency gate passes and at least
+    `min_total_chars` of usable data are in. Unfinished agents are cancelled,
+    or left running when `background_remaining` is set, and reported as skipped.
+
+    deadline_s bounds the whole run. Agents check it cooperatively; any agent
+    still running when it expires is cancelled and contributes whatever it had
+    collected as a partial result. Cut-off agents are listed under
+    extraction.cut_off.
+    """
+    if mode not in ("full", "fast"):
+        raise ValueError(f"mode must be 'full' or 'fast', got {mode!r}")
+
     print(f"\n{'─'*55}")
-    print(f" EXTRACTION: {company.upper()} | {role.upper()}")
+    print(f" EXTRACTION: {company.upper()} | {role.upper()} [{mode}]")
     print(f"{'─'*55}")
 
-    results: Dict[str, SourceResult] = {}
-
-    # ── Parallel: GitHub + Reddit + Web ──────────────────────
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        futures = {
-            executor.submit(GitHubCodingAgent().extract, company):           "github",
-            executor.submit(RedditExperienceAgent().extract, company, role): "reddit",
-            executor.submit(WebScrapingAgent().extract, company, role):      "web",
+    started  = time.monotonic()
+    deadline = Deadline(deadline_s)
+    gate     = IncrementalSufficiency(min_total_chars)
+    run_info = {"mode": mode, "deadline_s": deadline_s,
+                "early_exit": False, "unfinished": [], "cut_off": []}
+
+    agents, results = _build_agents(deadline)
+    for result in results.values():
+        gate.feed(result)
+
+    async with AsyncFetcher() as fetcher:
+        calls = {
+            "github":      lambda a: a.extract_async(company, fetcher),
+            "reddit":      lambda a: a.extract_async(company, role),
+            "web":         lambda a: a.extract_async(company, role, fetcher),
+            "ambitionbox": lambda a: a.extract_async(company, role, fetcher),
         }
-        for future in as_completed(futures):
-            key = futures[future]
-            try:
-                results[key] = future.result()
-            except Exception as e:
-                results[key] = SourceResult(key, "", "failed", f"Unhandled: {e}")
-
-    # ── AmbitionBox: conditional fallback ─────────────────────
-    reddit_weak = not results.get("reddit", SourceResult("reddit", "", "failed")).is_usable()
-    web_weak    = not results.get("web",    SourceResult("web",    "", "failed")).is_usable()
-
-    if reddit_weak or web_weak:
-        print("[Pipeline] Reddit/Web weak — trying AmbitionBox fallback...")
-        results["ambitionbox"] = AmbitionBoxAgent().extract(company, role)
+
+        def launch(key: str) -> asyncio.Task:
+            run = lambda: _capped(key, lambda: calls[key](agents[key]))
+            if key in ROLE_INDEPENDENT_SOURCES:
+                # One fetch per company, whichever role run asks first
+                return asyncio.create_task(_guarded(key, lambda: SHARED_SOURCES.get(key, company, run)))
+            return asyncio.create_task(_guarded(key, run))
+
+        def cut_off(key: str, task: asyncio.Task):
+            task.cancel()
+            results[key] = _cut_off(key, agents.get(key))
+            run_info["cut_off"].append(key)
+
+        # ── Concurrent: GitHub + Reddit + Web (+ speculative AmbitionBox) ──
+        tasks = {launch(k): k for k in ("github", "reddit", "web") if k in agents}
+
+        speculative = None
+        if speculative_ambitionbox and "ambitionbox" in agents:
+            speculative = launch("ambitionbox")
+
+        pending = set(tasks)
+        while pending and not deadline.expired():
+            done, pending = await asyncio.wait(pending, timeout=deadline.remaining(),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task]] = task.result()
+                gate.feed(task.result())
+
+            if speculative and not speculative.done() \
+                    and DataSufficiencyChecker.needs_ambitionbox(results) is False:
+                print("[Pipeline] Reddit and Web usable — cancelling speculative AmbitionBox fetch")
+                speculative.cancel()
+
+            if mode == "fast" and pending and gate.satisfied():
+                break
+
+        # ── Deadline: take what the stragglers have ───────────
+        if pending and deadline.expired():
+            print(f"[Pipeline] ⏱️ Deadline of {deadline_s}s reached — "
+                  f"cutting off {sorted(tasks[t] for t in pending)}")
+            for task in pending:
+                cut_off(tasks[task], task)
+            pending = set()
+
+        # ── Fast mode: stop waiting on the stragglers ─────────
+        if pending:
+            handling = "backgrounded" if background_remaining else "cancelled"
+            run_info.update(early_exit=True, unfinished=sorted(tasks[t] for t in pending))
+            print(f"[Pipeline] ⚡ Gate passed after {time.monotonic() - started:.1f}s — "
+                  f"{handling} {run_info['unfinished']}")
+            for task in pending:
+                key = tasks[task]
+                results[key] = SourceResult(key, "", "skipped", f"Fast mode: {handling} after gate passed")
+                _release(task, background_remaining)
+
+        # ── AmbitionBox: keep / fetch only if Reddit or Web are weak ──
+        if "ambitionbox" not in agents:
+            pass    # constructor failed — its failed result is already in `results`
+        elif run_info["early_exit"]:
+            # The gate already passed — only keep AmbitionBox if it is already in hand
+            if speculative and speculative.done() and not speculative.cancelled() \
+                    and DataSufficiencyChecker.needs_ambitionbox(results) is not False:
+                results["ambitionbox"] = speculative.result()
+            else:
+                if speculative:
+                    _release(speculative, background_remaining)
+                results["ambitionbox"] = SourceResult(
+                    "ambitionbox", "", "skipped", "Fast mode: gate passed without it"
+                )
+        elif DataSufficiencyChecker.needs_ambitionbox(results):
+            if speculative:
+                print("[Pipeline] Reddit/Web weak — using speculative AmbitionBox result...")
+            else:
+                print("[Pipeline] Reddit/Web weak — trying AmbitionBox fallback...")
+                speculative = launch("ambitionbox")
+            done, _ = await asyncio.wait({speculative}, timeout=deadline.remaining())
+            if done:
+                results["ambitionbox"] = speculative.result()
+            else:
+                cut_off("ambitionbox", speculative)
+        else:
+            reason = "Reddit and Web were sufficient"
+            if speculative:
+                speculative.cancel()
+                await asyncio.gather(speculative, return_exceptions=True)
+                reason += " (speculative fetch discarded)"
+            results["ambitionbox"] = SourceResult("ambitionbox", "", "skipped", reason)
+
+    run_info["elapsed_s"] = round(time.monotonic() - started, 2)
+    return _finalize(company, role, results, run_info)
+
+
+def _release(task: asyncio.Task, background: bool):
+    """Cancels a no-longer-needed agent task, or parks it to finish in the background."""
+    if background:
+        _BACKGROUND_TASKS.add(task)
+        task.add_done_callback(_BACKGROUND_TASKS.discard)
     else:
-        results["ambitionbox"] = SourceResult(
-            "ambitionbox", "", "skipped", "Reddit and Web were sufficient"
-        )
+        task.cancel()
+
 
+def _finalize(company: str, role: str, results: Dict[str, SourceResult],
+              run_info: Optional[dict] = None) -> Dict:
+    """Runs the sufficiency gate, prints the summary and builds the output dict."""
     # ── Sufficiency gate ──────────────────────────────────────
     sufficiency = DataSufficiencyChecker.check(results)
 
@@ -603,6 +1215,8 @@ def run_multi_agent_extraction(company: str, role: str) -> Dict:
     print(f"\n  Sources passing : {sufficiency['sources_passing']}/3")
     print(f"  Pipeline OK     : {sufficiency['sufficient']}")
     print(f"  Note            : {sufficiency['recommendation']}")
+    if run_info and run_info.get("cut_off"):
+        print(f"  Cut off         : {run_info['cut_off']} (deadline {run_info['deadline_s']}s)")
     print(f"{'─'*55}\n")
 
     return {
@@ -615,6 +1229,7 @@ def run_multi_agent_extraction(company: str, role: str) -> Dict:
         "source_metadata": {k: v.to_dict() for k, v in results.items()},
         "sufficiency":     sufficiency,
         "pipeline_ok":     sufficiency["sufficient"],
+        "extraction":      run_info or {},
     }
 
 # ─────────────────────────────────────────────
@@ -1,12 +1,19 @@
+import re
 import os
 import json
-import google.generativeai as genai
-from typing import Dict
+import statistics
+from collections import Counter
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from src.utils.paths import OUTPUTS_DIR
+from src.utils.gemini import GEMINI_STREAM, ResponseBlocked, StreamAborted, generate_json, generate_text, get_model, model_name
+from src.utils.json_stream import StreamError, parse_json_object
+from src.utils.llm_cache import get_llm_cache
+from src.etl.prompt_packer import PROMPT_TOKEN_BUDGET, chunk_sources, pack_sources, raw_tokens
+from src.etl.rule_extractor import confident_fields, extract_rules
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
 
 # ─────────────────────────────────────────────
@@ -16,6 +23,45 @@ genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 VALID_DIFFICULTIES = {"Easy", "Medium", "Hard"}
 
 
+def _check_difficulty(value) -> str:
+    # Coerce capitalisation first, then validate
+    raw_diff = str(value if value is not None else "").strip().capitalize()
+    if raw_diff not in VALID_DIFFICULTIES:
+        raise ValueError(f"'difficulty' must be Easy/Medium/Hard, got: {value!r}")
+    return raw_diff
+
+
+def _check_avg_rounds(value) -> int:
+    try:
+        avg = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'avgRounds' must be an integer, got: {value!r}") from None
+    if not (1 <= avg <= 12):
+        raise ValueError(f"'avgRounds' out of realistic range (1-12), got: {avg}")
+    return avg
+
+
+def _list_check(field: str, cap: Optional[int] = None):
+    def check(value) -> list:
+        if not isinstance(value, list):
+            raise ValueError(f"'{field}' must be a list, got: {type(value).__name__}")
+        items = [item.strip() for item in value if isinstance(item, str) and item.strip()]
+        return items[:cap] if cap else items
+    return check
+
+
+# Field → validator returning the coerced value or raising ValueError.
+# Also run on each field the moment it closes in a streamed response.
+FIELD_VALIDATORS = {
+    "difficulty":          _check_difficulty,
+    "avgRounds":           _check_avg_rounds,
+    "interviewProcess":    _list_check("interviewProcess"),
+    "dsaTopics":           _list_check("dsaTopics", cap=60),    # Gemini sometimes returns 100+
+    "systemDesignTopics":  _list_check("systemDesignTopics"),
+    "behavioralQuestions": _list_check("behavioralQuestions"),
+}
+
+
 def validate_output(data: dict) -> dict:
     """
     Validates and sanitises Gemini's JSON output before it reaches disk.
@@ -23,44 +69,173 @@ def validate_output(data: dict) -> dict:
     Coerces minor issues (wrong capitalisation, float avgRounds) silently.
     """
     errors = []
+    for field, check in FIELD_VALIDATORS.items():
+        try:
+            data[field] = check(data.get(field))
+        except ValueError as e:
+            errors.append(str(e))
 
-    # difficulty — coerce capitalisation first, then validate
-    raw_diff = str(data.get("difficulty", "")).strip().capitalize()
-    if raw_diff in VALID_DIFFICULTIES:
-        data["difficulty"] = raw_diff
-    else:
-        errors.append(f"'difficulty' must be Easy/Medium/Hard, got: {data.get('difficulty')!r}")
+    if errors:
+        raise ValueError("Schema validation failed:\n  " + "\n  ".join(errors))
 
-    # avgRounds — must be int 1–12
-    avg = data.get("avgRounds")
-    try:
-        avg = int(avg)
-        if not (1 <= avg <= 12):
-            errors.append(f"'avgRounds' out of realistic range (1-12), got: {avg}")
-        else:
-            data["avgRounds"] = avg
-    except (TypeError, ValueError):
-        errors.append(f"'avgRounds' must be an integer, got: {data.get('avgRounds')!r}")
+    return data
 
-    # List fields
-    for field in ("interviewProcess", "dsaTopics", "systemDesignTopics", "behavioralQuestions"):
-        val = data.get(field)
-        if not isinstance(val, list):
-            errors.append(f"'{field}' must be a list, got: {type(val).__name__}")
-        else:
-            data[field] = [
-                item.strip() for item in val
-                if isinstance(item, str) and item.strip()
-            ]
 
-    # Cap DSA at 60 — Gemini sometimes returns 100+
-    if isinstance(data.get("dsaTopics"), list):
-        data["dsaTopics"] = data["dsaTopics"][:60]
+# ─────────────────────────────────────────────
+# PROMPT FIELDS
+# ─────────────────────────────────────────────
 
-    if errors:
-        raise ValueError("Schema validation failed:\n  " + "\n  ".join(errors))
+# Per-field extraction rules, in prompt order. A prompt only carries the
+# rules for the fields it asks for.
+FIELD_RULES = {
+    "dsaTopics": """\
+[dsaTopics]
+PRIMARY SOURCE: GitHub data. It contains a raw list of LeetCode problem names — extract ALL of them.
+SECONDARY: Web data may have additional problem names.
+- Extract specific problem names: "Two Sum", "LRU Cache", "Median of Two Sorted Arrays"
+- Generic topics like "Arrays" or "Graphs" are ONLY acceptable if zero specific names exist.
+- Remove duplicates. Cap at 50 entries.
+- If GitHub has data, you should find 15 to 50 problem names minimum.""",
+    "systemDesignTopics": """\
+[systemDesignTopics]
+SOURCE: Web and Reddit data.
+- Extract only if clearly present in data.
+- For service-based companies (TCS, Infosys, Wipro): return [] unless it is explicitly in data.
+- For product-based companies: include up to 5 if data supports it.""",
+    "behavioralQuestions": """\
+[behavioralQuestions]
+SOURCE: Reddit and AmbitionBox data.
+- Extract real questions mentioned by interviewees.
+- If genuinely absent: include up to 5 common ones as fallback.
+- Do not exceed 5 entries.""",
+    "interviewProcess": """\
+[interviewProcess]
+SOURCE: Reddit and AmbitionBox. These are your richest sources for this field — read them carefully.
+- Scan Reddit posts for phrases like "round 1", "first round", "OA", "onsite",
+  "phone screen", "coding round", "system design round", "HR round", "bar raiser".
+- Reconstruct the process from what multiple people describe.
+- Format: "Round 1: what happened", "Round 2: what happened"
+- Be specific: "Round 2: 2 medium DSA problems on graphs and DP" is good.
+  "Round 2: Technical" is not acceptable if Reddit has richer detail available.
+- Only use a generic fallback if Reddit AND AmbitionBox are both empty.""",
+    "difficulty": """\
+[difficulty]
+- Infer from company type:
+  Google, Amazon, Apple, Meta, Microsoft, Netflix, DeepMind → Hard
+  Mid-tier product companies (Razorpay, Atlassian, Flipkart, Zomato, Swiggy) → Medium
+  Service-based companies (TCS, Infosys, Wipro, Cognizant, Capgemini) → Easy
+- Return EXACTLY one of: "Easy", "Medium", "Hard"
+""",
+    "avgRounds": """\
+[avgRounds]
+- Extract from Reddit or AmbitionBox if people mention total round counts.
+- Fallback: Service companies = 2, Mid-tier = 4, Big tech = 5.
+- Return a single integer between 1 and 12.""",
+}
+
+# Output template line per field; enrichedInsights has no rule block of its own
+OUTPUT_FIELDS = {
+    "interviewProcess":    '["Round 1: ...", "Round 2: ..."]',
+    "dsaTopics":           '["Problem Name", "..."]',
+    "systemDesignTopics":  '["Topic", "..."]',
+    "behavioralQuestions": '["Question?", "..."]',
+    "difficulty":          '"Easy | Medium | Hard"',
+    "avgRounds":           "<integer>",
+    "enrichedInsights":    (
+        '"Write a rich, detailed paragraph (3-5 sentences) summarizing the company culture, '
+        'general interview advice, red flags, and overall candidate experience based ONLY on '
+        'the Reddit and AmbitionBox data."'
+    ),
+}
+LLM_FIELDS = tuple(OUTPUT_FIELDS)
+
+
+# ─────────────────────────────────────────────
+# MAP-REDUCE MERGE
+# ─────────────────────────────────────────────
+
+# Raw corpora above this many tokens are filtered in chunks
+MAP_REDUCE_THRESHOLD = int(os.getenv("MAP_REDUCE_THRESHOLD", str(2 * PROMPT_TOKEN_BUDGET)))
+MAP_CONCURRENCY      = int(os.getenv("FILTER_MAP_CONCURRENCY", "4"))
+MAP_MAX_CHUNKS       = int(os.getenv("FILTER_MAP_MAX_CHUNKS", "8"))
+
+# Per-field caps after merging — the same limits the prompt asks for
+LIST_CAPS = {
+    "dsaTopics":           60,
+    "systemDesignTopics":  5,
+    "behavioralQuestions": 5,
+}
+DIFFICULTY_ORDER = ("Hard", "Medium", "Easy")   # tie-break: the harder rating wins
+
+_ROUND_RE = re.compile(r"^\s*round\s*(\d+)\s*[:\-–]?", re.I)
+
+
+def _norm(item: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", item.lower()).strip()
 
-    return data
+
+def _union(lists: List[List[str]]) -> List[str]:
+    """Case/punctuation-insensitive union, most-mentioned first, then first-seen order."""
+    votes, first = Counter(), {}
+    for items in lists:
+        for item in dict.fromkeys(items):
+            key = _norm(item)
+            if not key:
+                continue
+            votes[key] += 1
+            first.setdefault(key, (len(first), item))
+    ranked = sorted(first, key=lambda k: (-votes[k], first[k][0]))
+    return [first[k][1] for k in ranked]
+
+
+def _merge_process(lists: List[List[str]]) -> List[str]:
+    """
+    One entry per round number, the most detailed description winning.
+    Unnumbered steps are only kept when no chunk numbered its rounds.
+    """
+    rounds, other = {}, []
+    for items in lists:
+        for item in items:
+            match = _ROUND_RE.match(item)
+            if not match:
+                other.append(item)
+                continue
+            n = int(match.group(1))
+            if n not in rounds or len(item) > len(rounds[n]):
+                rounds[n] = item
+    if rounds:
+        return [rounds[n] for n in sorted(rounds)]
+    return _union([other])
+
+
+def _has_prose(extracted: Dict) -> bool:
+    return any(len((extracted.get(f) or "").strip()) > 100 for f in ("reddit_raw", "ambitionbox_raw"))
+
+
+def merge_partials(partials: List[dict], company: Optional[str], role: Optional[str]) -> dict:
+    """
+    Deterministic reduce step for map-reduce filtering: list fields are
+    unioned and deduplicated, difficulty is a majority vote and avgRounds the
+    (lower) median. The merged result is re-validated like a single response.
+    """
+    merged = {
+        "company":          company or partials[0].get("company"),
+        "role":             role or partials[0].get("role"),
+        "interviewProcess": _merge_process([p.get("interviewProcess", []) for p in partials]),
+    }
+    for field in ("dsaTopics", "systemDesignTopics", "behavioralQuestions"):
+        merged[field] = _union([p.get(field, []) for p in partials])[:LIST_CAPS[field]]
+
+    votes = Counter(p["difficulty"] for p in partials)
+    merged["difficulty"] = max(DIFFICULTY_ORDER, key=lambda d: (votes[d], -DIFFICULTY_ORDER.index(d)))
+    merged["avgRounds"]  = statistics.median_low(p["avgRounds"] for p in partials)
+
+    # The richest summary stands in for the rest — prose does not merge well
+    insights = [p.get("enrichedInsights") for p in partials if isinstance(p.get("enrichedInsights"), str)]
+    if insights:
+        merged["enrichedInsights"] = max(insights, key=len)
+
+    return validate_output(merged)
 
 
 # ─────────────────────────────────────────────
@@ -77,18 +252,31 @@ class GreatFilterAgent:
     Does NOT invent information — if data is absent, fields are empty lists.
     """
 
+    MODEL_NAME = "gemini-2.5-flash-lite"
+
     def __init__(self):
-        self.model = genai.GenerativeModel("gemini-2.5-flash-lite")
+        self._model = None
 
-    def _build_prompt(self, extracted_data: Dict) -> str:
+    @property
+    def model(self):
+        # Rules-only runs never need the SDK
+        if self._model is None:
+            self._model = get_model(self.MODEL_NAME)
+        return self._model
+
+    def _build_prompt(self, extracted_data: Dict, packed: Optional[Dict] = None,
+                      fields=LLM_FIELDS) -> str:
         company     = extracted_data.get("company", "Unknown")
         role        = extracted_data.get("role", "Unknown")
+        rules       = "\n\n".join(FIELD_RULES[f].strip() for f in fields if f in FIELD_RULES)
+        output      = ",\n".join(f'    "{f}": {OUTPUT_FIELDS[f]}' for f in fields)
 
-        # Soft-truncate each source
-        github      = extracted_data.get("github_raw",      "")[:8000]
-        reddit      = extracted_data.get("reddit_raw",      "")[:8000]
-        web         = extracted_data.get("web_raw",         "")[:8000]
-        ambitionbox = extracted_data.get("ambitionbox_raw", "")[:5000]
+        # Most informative passages first, within the prompt token budget
+        packed      = packed or pack_sources(extracted_data)
+        github      = packed["github_raw"]
+        reddit      = packed["reddit_raw"]
+        web         = packed["web_raw"]
+        ambitionbox = packed["ambitionbox_raw"]
 
         # Detect which sources actually have data
         has_github      = len(github.strip())      > 100
@@ -121,47 +309,7 @@ SOURCE AVAILABILITY:
 
 FIELD-BY-FIELD RULES:
 
-[dsaTopics]
-PRIMARY SOURCE: GitHub data. It contains a raw list of LeetCode problem names — extract ALL of them.
-SECONDARY: Web data may have additional problem names.
-- Extract specific problem names: "Two Sum", "LRU Cache", "Median of Two Sorted Arrays"
-- Generic topics like "Arrays" or "Graphs" are ONLY acceptable if zero specific names exist.
-- Remove duplicates. Cap at 50 entries.
-- If GitHub has data, you should find 15 to 50 problem names minimum.
-
-[systemDesignTopics]
-SOURCE: Web and Reddit data.
-- Extract only if clearly present in data.
-- For service-based companies (TCS, Infosys, Wipro): return [] unless it is explicitly in data.
-- For product-based companies: include up to 5 if data supports it.
-
-[behavioralQuestions]
-SOURCE: Reddit and AmbitionBox data.
-- Extract real questions mentioned by interviewees.
-- If genuinely absent: include up to 5 common ones as fallback.
-- Do not exceed 5 entries.
-
-[interviewProcess]
-SOURCE: Reddit and AmbitionBox. These are your richest sources for this field — read them carefully.
-- Scan Reddit posts for phrases like "round 1", "first round", "OA", "onsite",
-  "phone screen", "coding round", "system design round", "HR round", "bar raiser".
-- Reconstruct the process from what multiple people describe.
-- Format: "Round 1: what happened", "Round 2: what happened"
-- Be specific: "Round 2: 2 medium DSA problems on graphs and DP" is good.
-  "Round 2: Technical" is not acceptable if Reddit has richer detail available.
-- Only use a generic fallback if Reddit AND AmbitionBox are both empty.
-
-[difficulty]
-- Infer from company type:
-  Google, Amazon, Apple, Meta, Microsoft, Netflix, DeepMind → Hard
-  Mid-tier product companies (Razorpay, Atlassian, Flipkart, Zomato, Swiggy) → Medium
-  Service-based companies (TCS, Infosys, Wipro, Cognizant, Capgemini) → Easy
-- Return EXACTLY one of: "Easy", "Medium", "Hard"
-
-[avgRounds]
-- Extract from Reddit or AmbitionBox if people mention total round counts.
-- Fallback: Service companies = 2, Mid-tier = 4, Big tech = 5.
-- Return a single integer between 1 and 12.
+{rules}
 
 INPUT DATA:
 
@@ -183,53 +331,124 @@ Return ONLY the raw JSON object below. No markdown fences. No explanation. No pr
 {{
     "company": "{company}",
     "role": "{role}",
-    "interviewProcess": ["Round 1: ...", "Round 2: ..."],
-    "dsaTopics": ["Problem Name", "..."],
-    "systemDesignTopics": ["Topic", "..."],
-    "behavioralQuestions": ["Question?", "..."],
-    "difficulty": "Easy | Medium | Hard",
-    "avgRounds": <integer>
-    "enrichedInsights": "Write a rich, detailed paragraph (3-5 sentences) summarizing the company culture, general interview advice, red flags, and overall candidate experience based ONLY on the Reddit and AmbitionBox data."
-        }}
+{output}
+}}
 """
 
-    def process(self, extracted_data: Dict) -> dict:
-        company = extracted_data.get("company", "unknown")
-        role    = extracted_data.get("role", "unknown")
-        print(f"[GreatFilter] Processing {company} | {role}...")
-
-        prompt = self._build_prompt(extracted_data)
-
+    def _call(self, prompt: str, label: str = "", fill: Optional[Dict] = None) -> dict:
+        """
+        One structured-extraction call: generate, parse, validate. Fields in
+        `fill` were already extracted by rules and override the response.
+        Errors come back as {"error": ...}.
+        """
+        response = ""
         try:
-            response = self.model.generate_content(prompt)
-            raw_text = response.text.strip()
-
-            # Strip markdown fences if Gemini adds them despite instructions
-            for fence in ("```json", "```"):
-                if raw_text.startswith(fence):
-                    raw_text = raw_text[len(fence):]
-            if raw_text.endswith("```"):
-                raw_text = raw_text[:-3]
-            raw_text = raw_text.strip()
-
-            structured = json.loads(raw_text)
-
-        except json.JSONDecodeError:
-            print("[GreatFilter] ❌ Gemini returned invalid JSON")
-            print("Raw output (first 500 chars):\n", response.text[:500])
-            return {"error": "invalid_json", "raw_preview": response.text[:500]}
+            if GEMINI_STREAM:
+                # Fields the rules already own are not worth aborting a stream over
+                checks     = {f: c for f, c in FIELD_VALIDATORS.items() if f not in (fill or {})}
+                structured = generate_json(self.model, prompt, field_checks=checks)
+            else:
+                response   = generate_text(self.model, prompt)
+                structured = parse_json_object(response)
+
+        except StreamAborted as e:
+            print(f"[GreatFilter] ❌ Gemini stream aborted{label}: {e.reason}")
+            if e.invalid_json:
+                return {"error": "invalid_json", "raw_preview": e.preview}
+            return {"error": "validation_failed", "details": e.reason}
+
+        except ResponseBlocked as e:
+            print(f"[GreatFilter] ❌ Gemini returned no text{label}: {e}")
+            return {"error": "response_blocked", "details": str(e)}
+
+        except StreamError:
+            print(f"[GreatFilter] ❌ Gemini returned invalid JSON{label}")
+            print("Raw output (first 500 chars):\n", response[:500])
+            get_llm_cache().discard(model_name(self.model), prompt)
+            return {"error": "invalid_json", "raw_preview": response[:500]}
 
         except Exception as e:
-            print(f"[GreatFilter] ❌ API error: {e}")
+            print(f"[GreatFilter] ❌ API error{label}: {e}")
             return {"error": str(e)}
 
         # ── Validate schema before returning ─────────────────
         try:
-            structured = validate_output(structured)
+            return validate_output({**structured, **(fill or {})})
         except ValueError as ve:
-            print(f"[GreatFilter] ❌ Validation failed:\n{ve}")
+            print(f"[GreatFilter] ❌ Validation failed{label}:\n{ve}")
+            get_llm_cache().discard(model_name(self.model), prompt)
             return {"error": "validation_failed", "details": str(ve)}
 
+    def _map_reduce(self, extracted_data: Dict, fields=LLM_FIELDS, fill: Optional[Dict] = None) -> dict:
+        """Filters each chunk of a large corpus in parallel and merges the partial results."""
+        chunks = chunk_sources(extracted_data, max_chunks=MAP_MAX_CHUNKS)
+        if not chunks:
+            # Nothing scored as signal — one packed prompt still carries each source's best passage
+            print("[GreatFilter] ⚠️ No chunks to map — falling back to a single prompt")
+            return self._call(self._build_prompt(extracted_data, fields=fields), fill=fill)
+
+        prompts = [self._build_prompt(extracted_data, packed=c, fields=fields) for c in chunks]
+
+        with ThreadPoolExecutor(max_workers=min(MAP_CONCURRENCY, len(prompts))) as pool:
+            results = list(pool.map(
+                lambda ip: self._call(ip[1], f" (chunk {ip[0] + 1}/{len(prompts)})", fill),
+                enumerate(prompts),
+            ))
+
+        partials = [r for r in results if "error" not in r]
+        print(f"[GreatFilter] Map: {len(partials)}/{len(results)} chunks returned valid JSON")
+        if not partials:
+            return {"error": "map_reduce_failed", "details": [r.get("error") for r in results]}
+        return merge_partials(partials, extracted_data.get("company"), extracted_data.get("role"))
+
+    def process(self, extracted_data: Dict, mode: str = "auto") -> dict:
+        """
+        Mechanical fields are filled by the rule-based pre-extractor first;
+        Gemini is only asked for the fields the rules could not fill with
+        confidence (typically enrichedInsights).
+
+        mode: "single" sends one packed prompt, "map_reduce" splits the corpus
+        into chunks, "auto" picks map_reduce once the raw text exceeds
+        MAP_REDUCE_THRESHOLD tokens, "rules" never calls Gemini and keeps the
+        rule values even where confidence is low.
+        """
+        company = extracted_data.get("company", "unknown")
+        role    = extracted_data.get("role", "unknown")
+
+        rules  = extract_rules(extracted_data)
+        fill   = rules["fields"] if mode == "rules" else confident_fields(rules)
+        needed = [f for f in LLM_FIELDS if f not in fill]
+        if not _has_prose(extracted_data) and "enrichedInsights" in needed:
+            needed.remove("enrichedInsights")     # nothing to summarise it from
+
+        if mode == "auto":
+            mode = "map_reduce" if raw_tokens(extracted_data) > MAP_REDUCE_THRESHOLD else "single"
+        if not needed:
+            mode = "rules"
+        print(f"[GreatFilter] Processing {company} | {role} ({mode}) — "
+              f"rules filled {len(fill)}/{len(rules['confidence'])} fields"
+              + (f", asking Gemini for {needed}" if mode != "rules" else ""))
+
+        if mode == "rules":
+            try:
+                structured = validate_output({"company": company, "role": role, **fill})
+            except ValueError as ve:
+                print(f"[GreatFilter] ❌ Rules could not fill every field:\n{ve}")
+                return {"error": "rules_incomplete", "details": str(ve)}
+        elif mode == "map_reduce":
+            structured = self._map_reduce(extracted_data, needed, fill)
+        else:
+            structured = self._call(self._build_prompt(extracted_data, fields=needed), fill=fill)
+        if "error" in structured:
+            return structured
+
+        structured["_filter"] = {
+            "mode":        mode,
+            "rule_fields": sorted(fill),
+            "llm_fields":  needed if mode != "rules" else [],
+            "confidence":  rules["confidence"],
+        }
+
         print(f"[GreatFilter] ✅ Validated — "
               f"{len(structured.get('dsaTopics', []))} DSA topics, "
               f"difficulty={structured.get('difficulty')}, "
@@ -239,8 +458,8 @@ Return ONLY the raw JSON object below. No markdown fences. No explanation. No pr
         return structured
 
 
-def run_great_filter(extracted_data: Dict) -> dict:
-    return GreatFilterAgent().process(extracted_data)
+def run_great_filter(extracted_data: Dict, mode: str = "auto") -> dict:
+    return GreatFilterAgent().process(extracted_data, mode)
 
 
 # ─────────────────────────────────────────────
@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from src.utils.paths import DATA_DIR
+
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+
+HTTP_CACHE_DIR = DATA_DIR / "cache" / "http"
+
+# Freshness window per request purpose (seconds). Purposes not listed are never cached.
+CACHE_TTLS = {
+    "github":      7 * 24 * 3600,   # LeetCode CSVs change a few times a year
+    "ambitionbox": 24 * 3600,
+    "search":      24 * 3600,       # Google Custom Search results
+    "page":        3 * 24 * 3600,   # Scraped interview write-ups
+}
+
+# Size bound — least recently used entries are pruned first (a hit counts as a use).
+# Entries past their TTL are kept for revalidation until unused for HTTP_CACHE_MAX_IDLE.
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "5000"))
+HTTP_CACHE_MAX_BYTES   = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))
+HTTP_CACHE_MAX_IDLE    = float(os.getenv("HTTP_CACHE_MAX_IDLE", str(30 * 24 * 3600)))
+PRUNE_EVERY            = 200        # writes between background prunes
+PRUNE_TARGET           = 0.9        # prune down to this share of the caps, not just under them
+
+# Query parameters that identify the caller, not the resource
+_VOLATILE_PARAMS = {"key"}
+
+
+# ─────────────────────────────────────────────
+# CACHE ENTRY
+# ─────────────────────────────────────────────
+
+class CacheEntry:
+    def __init__(self, url: str, body: str, etag: str = "", last_modified: str = "",
+                 fetched_at: float = 0.0):
+        self.url           = url
+        self.body          = body
+        self.etag          = etag
+        self.last_modified = last_modified
+        self.fetched_at    = fetched_at or time.time()
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def validators(self) -> dict:
+        """Conditional-request headers for revalidating a stale entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self) -> dict:
+        return {
+            "url":           self.url,
+            "body":          self.body,
+            "etag":          self.etag,
+            "last_modified": self.last_modified,
+            "fetched_at":    self.fetched_at,
+        }
+
+
+# ─────────────────────────────────────────────
+# HTTP CACHE
+# ─────────────────────────────────────────────
+
+class HttpCache:
+    """
+    Persistent cache of successful GET responses, one JSON file per URL.
+
+    Fresh entries (younger than the purpose's TTL) are served without touching
+    the network. Stale entries are revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged resource costs a 304 instead of a download.
+
+    The directory is bounded by `max_entries` and `max_bytes`: a file's mtime
+    is its last use, and prune() drops entries idle for longer than `max_idle`,
+    then the least recently used until both caps hold. It runs in a background
+    thread on the first write of a process and every `prune_every` writes after.
+    """
+
+    def __init__(self, root: Path = HTTP_CACHE_DIR, ttls: Optional[dict] = None,
+                 max_entries: int = HTTP_CACHE_MAX_ENTRIES, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 max_idle: float = HTTP_CACHE_MAX_IDLE, prune_every: int = PRUNE_EVERY):
+        self.root        = Path(root)
+        self.ttls        = {**CACHE_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.max_idle    = max_idle
+        self.prune_every = prune_every      # 0: only explicit prune() calls
+        self._writes     = 0
+        self._prune_lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def ttl(self, purpose: Optional[str]) -> int:
+        return self.ttls.get(purpose, 0)
+
+    def is_cacheable(self, purpose: Optional[str]) -> bool:
+        return self.ttl(purpose) > 0
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(_normalise(url).encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = CacheEntry(**json.load(f))
+            os.utime(path)          # mtime is the LRU clock
+            return entry
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def is_fresh(self, entry: CacheEntry, purpose: Optional[str]) -> bool:
+        return entry.age() < self.ttl(purpose)
+
+    def put(self, url: str, body: str, headers: dict) -> CacheEntry:
+        entry = CacheEntry(
+            url           = url,
+            body          = body,
+            etag          = headers.get("etag", ""),
+            last_modified = headers.get("last-modified", ""),
+        )
+        self._write(url, entry)
+        return entry
+
+    def touch(self, entry: CacheEntry) -> CacheEntry:
+        """Marks an entry fresh again after a 304 Not Modified."""
+        entry.fetched_at = time.time()
+        self._write(entry.url, entry)
+        return entry
+
+    def _write(self, url: str, entry: CacheEntry):
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry.to_dict(), f)
+        os.replace(tmp, path)   # atomic — concurrent pipelines never see half a file
+
+        self._writes += 1
+        if self.prune_every and self._writes % self.prune_every == 1 and not self._prune_lock.locked():
+            threading.Thread(target=self.prune, name="http-cache-prune", daemon=True).start()
+
+    # ── Eviction ──────────────────────────────────────────────
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        files = []
+        for path in self.root.glob("*/*"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue        # removed by a concurrent prune
+            files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def prune(self) -> Dict[str, int]:
+        """Drops idle entries and orphaned temp files, then LRU entries over the size caps."""
+        removed = {"idle": 0, "lru": 0}
+        if not self._prune_lock.acquire(blocking=False):
+            return removed
+        try:
+            now     = time.time()
+            entries = []
+            for mtime, size, path in self._scan():
+                idle = now - mtime
+                if idle > self.max_idle or (path.suffix == ".tmp" and idle > 3600):
+                    removed["idle"] += _unlink(path)
+                elif path.suffix == ".json":
+                    entries.append((mtime, size, path))
+
+            entries.sort()          # oldest use first
+            count, total = len(entries), sum(size for _, size, _ in entries)
+            if count > self.max_entries or total > self.max_bytes:
+                max_count = int(self.max_entries * PRUNE_TARGET)
+                max_total = int(self.max_bytes * PRUNE_TARGET)
+                for _, size, path in entries:
+                    if count <= max_count and total <= max_total:
+                        break
+                    removed["lru"] += _unlink(path)
+                    count -= 1
+                    total -= size
+
+            if removed["idle"] or removed["lru"]:
+                print(f"[HttpCache] Pruned {removed['idle']} idle and {removed['lru']} LRU entries "
+                      f"({count} left, {total / 1e6:.1f} MB)")
+            return removed
+        finally:
+            self._prune_lock.release()
+
+
+def _unlink(path: Path) -> int:
+    try:
+        path.unlink()
+        return 1
+    except OSError:
+        return 0
+
+
+def _normalise(url: str) -> str:
+    """Drops API keys from the cache key so rotating a key does not bust the cache."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k not in _VOLATILE_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+_cache: Optional[HttpCache] = None
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Process-wide cache, or None when HTTP_CACHE_DISABLED is set."""
+    global _cache
+    if os.getenv("HTTP_CACHE_DISABLED"):
+        return None
+    if _cache is None:
+        _cache = HttpCache()
+    return _cache
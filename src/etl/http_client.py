@@ -0,0 +1,213 @@
+import os
+import atexit
+import asyncio
+import threading
+from typing import Optional
+
+import backoff
+import httpx
+
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+
+class HttpConfig:
+    """
+    Single place for every network knob the extractor uses.
+    Values can be overridden through environment variables or configure_http().
+    """
+    # Per-purpose read timeouts (seconds). Agents pass a purpose, never a number.
+    TIMEOUTS = {
+        "github":      10.0,
+        "search":      10.0,
+        "page":        12.0,
+        "ambitionbox": 15.0,
+        "probe":       6.0,     # liveness checks (HEAD / capped GET), never cached
+    }
+    DEFAULT_TIMEOUT = 10.0
+    CONNECT_TIMEOUT = 5.0
+
+    # Keep-alive pool — shared across hosts, per-host reuse is automatic in httpx
+    MAX_CONNECTIONS      = 40
+    MAX_KEEPALIVE        = 20
+    KEEPALIVE_EXPIRY     = 60.0
+
+    # Retry with exponential backoff on transient failures only
+    MAX_TRIES            = 3
+    MAX_RETRY_TIME       = 20.0
+    RETRY_STATUSES       = {500, 502, 503, 504}
+
+    def __init__(self, **overrides):
+        self.timeouts         = dict(self.TIMEOUTS)
+        self.default_timeout  = float(os.getenv("HTTP_TIMEOUT", self.DEFAULT_TIMEOUT))
+        self.connect_timeout  = self.CONNECT_TIMEOUT
+        self.max_connections  = int(os.getenv("HTTP_MAX_CONNECTIONS", self.MAX_CONNECTIONS))
+        self.max_keepalive    = int(os.getenv("HTTP_MAX_KEEPALIVE", self.MAX_KEEPALIVE))
+        self.keepalive_expiry = self.KEEPALIVE_EXPIRY
+        self.max_tries        = int(os.getenv("HTTP_MAX_TRIES", self.MAX_TRIES))
+        self.max_retry_time   = self.MAX_RETRY_TIME
+        self.retry_statuses   = set(self.RETRY_STATUSES)
+
+        for key, value in overrides.items():
+            if not hasattr(self, key):
+                raise ValueError(f"Unknown HTTP config option: {key!r}")
+            setattr(self, key, value)
+
+    def timeout(self, purpose: Optional[str] = None) -> httpx.Timeout:
+        read = self.timeouts.get(purpose, self.default_timeout)
+        return httpx.Timeout(read, connect=min(self.connect_timeout, read))
+
+
+# Transport failures worth a second attempt. Read timeouts are NOT retried —
+# a slow page stays slow, and retrying would multiply the wait.
+RETRY_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.RemoteProtocolError,
+)
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+# ─────────────────────────────────────────────
+# SHARED CLIENT
+# ─────────────────────────────────────────────
+
+class SharedHttpClient:
+    """
+    Process-wide httpx.AsyncClient living on its own background event loop.
+
+    Because the loop outlives any single extraction, the connection pool does
+    too: repeated hits to googleapis.com, geeksforgeeks.org or
+    raw.githubusercontent.com reuse warm keep-alive connections across agents
+    and across pipeline runs in the same process.
+    """
+
+    def __init__(self, config: Optional[HttpConfig] = None):
+        self.config  = config or HttpConfig()
+        self._loop   = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="http-client-loop", daemon=True)
+        self._thread.start()
+        self._client = self.run(self._open())
+
+    async def _open(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections           = self.config.max_connections,
+            max_keepalive_connections = self.config.max_keepalive,
+            keepalive_expiry          = self.config.keepalive_expiry,
+        )
+        return httpx.AsyncClient(follow_redirects=True, limits=limits,
+                                 timeout=self.config.timeout())
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def run(self, coro):
+        """Runs a coroutine on the client's loop and blocks until it finishes."""
+        if _running_loop() is self._loop:
+            raise RuntimeError("SharedHttpClient.run() called from its own loop — await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def get(self, url: str, headers: Optional[dict] = None,
+                  purpose: Optional[str] = None, max_bytes: Optional[int] = None) -> httpx.Response:
+        """
+        GET with unified timeouts and backoff on transient errors.
+        After the last retry a 5xx response is returned as-is, not raised.
+        With `max_bytes`, the body is streamed and the download stops at the cap.
+        """
+        try:
+            return await self._get_with_retry(url, headers, purpose, max_bytes)
+        except _RetryableStatus as e:
+            return e.response
+
+    async def _get_capped(self, url, headers, purpose, max_bytes: int) -> httpx.Response:
+        """Streams at most `max_bytes` of (decoded) body, then drops the connection."""
+        async with self._client.stream("GET", url, headers=headers,
+                                       timeout=self.config.timeout(purpose)) as resp:
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body.extend(chunk)
+                if len(body) >= max_bytes:
+                    break
+            # Body is already decoded — drop headers that would make httpx decode it again
+            kept = {k: v for k, v in resp.headers.items()
+                    if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+            return httpx.Response(resp.status_code, headers=kept,
+                                  content=bytes(body[:max_bytes]), request=resp.request)
+
+    async def _get_with_retry(self, url, headers, purpose, max_bytes=None) -> httpx.Response:
+        @backoff.on_exception(
+            backoff.expo,
+            RETRY_EXCEPTIONS + (_RetryableStatus,),
+            max_tries = self.config.max_tries,
+            max_time  = self.config.max_retry_time,
+            jitter    = backoff.full_jitter,
+        )
+        async def attempt():
+            if max_bytes:
+                resp = await self._get_capped(url, headers, purpose, max_bytes)
+            else:
+                resp = await self._client.get(url, headers=headers, timeout=self.config.timeout(purpose))
+            if resp.status_code in self.config.retry_statuses:
+                raise _RetryableStatus(resp)
+            return resp
+
+        return await attempt()
+
+    async def head(self, url: str, headers: Optional[dict] = None,
+                   purpose: Optional[str] = None) -> httpx.Response:
+        """Single HEAD request — a cheap existence check, so no retries."""
+        return await self._client.head(url, headers=headers, timeout=self.config.timeout(purpose))
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        try:
+            self.run(self._client.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+_shared: Optional[SharedHttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> SharedHttpClient:
+    """Returns the process-wide client, creating it on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedHttpClient()
+            atexit.register(_shared.close)
+        return _shared
+
+
+def configure_http(**overrides) -> SharedHttpClient:
+    """
+    Replaces the shared client with one built from new settings.
+    Call before the first extraction, e.g. configure_http(max_tries=5).
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+        _shared = SharedHttpClient(HttpConfig(**overrides))
+        atexit.register(_shared.close)
+        return _shared
@@ -0,0 +1,249 @@
+import io
+import re
+import csv
+import time
+import sqlite3
+import tarfile
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+from src.utils.paths import DATA_DIR
+
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+LEETCODE_REPO_TARBALL = (
+    "https://codeload.github.com/krishnadey30/LeetCode-Questions-CompanyWise/tar.gz/refs/heads/master"
+)
+LEETCODE_INDEX_PATH = DATA_DIR / "cache" / "leetcode_index.sqlite"
+
+# '<company>_<window>.csv' — e.g. amazon_alltime.csv, goldman_sachs_6months.csv
+TIME_WINDOWS = ("alltime", "2year", "1year", "6months")
+_FILENAME_RE = re.compile(rf"^(?P<company>.+)_(?P<window>{'|'.join(TIME_WINDOWS)})\.csv$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    company     TEXT NOT NULL,
+    time_window TEXT NOT NULL,
+    problem_id  INTEGER,
+    title       TEXT NOT NULL,
+    difficulty  TEXT,
+    frequency   REAL,
+    acceptance  TEXT,
+    url         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_problems_lookup ON problems (company, time_window, frequency DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+# ─────────────────────────────────────────────
+# CSV PARSING
+# ─────────────────────────────────────────────
+
+def _to_float(value) -> float:
+    try:
+        return float(str(value).strip().rstrip("%"))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_company_csv(raw: str) -> List[dict]:
+    """
+    Parses one company CSV into rows of {id, title, difficulty, frequency, acceptance, url}.
+
+    Column layout:  ID, Title, Acceptance, Difficulty, Frequency, Leetcode Question Link
+    Files without a header row are read positionally with the same layout.
+    Rows keep file order; callers sort by frequency.
+    """
+    rows   = []
+    reader = csv.reader(io.StringIO(raw))
+    header = None
+
+    for parts in reader:
+        parts = [p.strip() for p in parts]
+        if not parts or not any(parts):
+            continue
+        if header is None and parts[0].lower() in ("id", "title"):
+            header = [p.lower() for p in parts]
+            continue
+
+        record = dict(zip(header, parts)) if header else {}
+        if not header:
+            keys   = ("id", "title", "acceptance", "difficulty", "frequency", "leetcode question link")
+            record = dict(zip(keys, parts))
+
+        title = record.get("title", "")
+        if not title or title.replace(" ", "").isdigit():
+            continue
+
+        rows.append({
+            "id":         int(record["id"]) if record.get("id", "").isdigit() else None,
+            "title":      title,
+            "difficulty": record.get("difficulty", "").capitalize(),
+            "frequency":  _to_float(record.get("frequency")),
+            "acceptance": record.get("acceptance", ""),
+            "url":        record.get("leetcode question link", ""),
+        })
+    return rows
+
+
+# ─────────────────────────────────────────────
+# LOCAL INDEX
+# ─────────────────────────────────────────────
+
+class LeetCodeIndex:
+    """
+    SQLite mirror of the whole LeetCode-Questions-CompanyWise repo.
+
+    One bulk download of the repo tarball replaces per-company probing of
+    raw.githubusercontent.com. Lookups are indexed local queries and return
+    problems ranked by frequency, for any time window the repo publishes.
+    """
+    MAX_AGE = 30 * 24 * 3600    # re-sync monthly; the repo changes rarely
+
+    def __init__(self, path: Path = LEETCODE_INDEX_PATH):
+        self.path  = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._companies: Optional[tuple] = None      # (synced_at, company keys)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # ── Status ────────────────────────────────────────────────
+
+    def synced_at(self) -> float:
+        return float(self._meta("synced_at") or 0)
+
+    def is_synced(self) -> bool:
+        return self.synced_at() > 0
+
+    def is_stale(self) -> bool:
+        return time.time() - self.synced_at() > self.MAX_AGE
+
+    # ── Lookups ───────────────────────────────────────────────
+
+    def has_company(self, company_key: str) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT 1 FROM problems WHERE company = ? LIMIT 1", (company_key,)
+            ).fetchone()
+        return row is not None
+
+    def companies(self) -> List[str]:
+        """Every company key, read once per sync (a sync from any process changes synced_at)."""
+        synced = self.synced_at()
+        cached = self._companies
+        if cached and cached[0] == synced:
+            return list(cached[1])
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT DISTINCT company FROM problems ORDER BY company"
+            ).fetchall()
+        self._companies = (synced, [r[0] for r in rows])
+        return list(self._companies[1])
+
+    def top_problems(self, company_key: str, window: str = "alltime", limit: int = 100) -> List[dict]:
+        """Problems for one company file key (e.g. 'goldman_sachs'), most frequent first."""
+        with self._lock:
+            rows = self._connection().execute(
+                """SELECT problem_id, title, difficulty, frequency, url FROM problems
+                   WHERE company = ? AND time_window = ?
+                   ORDER BY frequency DESC, rowid ASC LIMIT ?""",
+                (company_key, window, limit),
+            ).fetchall()
+        return [
+            {"id": r[0], "title": r[1], "difficulty": r[2], "frequency": r[3], "url": r[4]}
+            for r in rows
+        ]
+
+    # ── Sync ──────────────────────────────────────────────────
+
+    def sync(self, force: bool = False, timeout: float = 120.0) -> int:
+        """
+        Downloads the repo tarball once and rebuilds the index in a single transaction.
+        Returns the number of rows indexed (0 if the index was fresh and not forced).
+        """
+        if not force and self.is_synced() and not self.is_stale():
+            return 0
+
+        print("[LeetCodeIndex] Downloading LeetCode-Questions-CompanyWise archive...")
+        with tempfile.TemporaryFile() as archive:
+            with httpx.stream("GET", LEETCODE_REPO_TARBALL, follow_redirects=True, timeout=timeout) as resp:
+                resp.raise_for_status()
+                for chunk in resp.iter_bytes():
+                    archive.write(chunk)
+            archive.seek(0)
+            rows = list(self._rows_from_archive(archive))
+
+        if not rows:
+            raise RuntimeError("Archive contained no company CSVs — index left unchanged")
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM problems")
+                conn.executemany(
+                    """INSERT INTO problems
+                       (company, time_window, problem_id, title, difficulty, frequency, acceptance, url)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    rows,
+                )
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('synced_at', ?)", (str(time.time()),))
+
+        print(f"[LeetCodeIndex] ✅ Indexed {len(rows)} rows for {len(self.companies())} companies")
+        return len(rows)
+
+    @staticmethod
+    def _rows_from_archive(archive):
+        with tarfile.open(fileobj=archive, mode="r:gz") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                match = _FILENAME_RE.match(Path(member.name).name)
+                if not match:
+                    continue
+                raw = tar.extractfile(member).read().decode("utf-8", errors="replace")
+                for row in parse_company_csv(raw):
+                    yield (
+                        match["company"].lower(), match["window"], row["id"], row["title"],
+                        row["difficulty"], row["frequency"], row["acceptance"], row["url"],
+                    )
+
+
+_index: Optional[LeetCodeIndex] = None
+
+
+def get_leetcode_index() -> LeetCodeIndex:
+    global _index
+    if _index is None:
+        _index = LeetCodeIndex()
+    return _index
+
+
+# ─────────────────────────────────────────────
+# ENTRYPOINT
+# ─────────────────────────────────────────────
+
+if __name__ == "__main__":
+    index = get_leetcode_index()
+    index.sync(force=True)
+    company = input("Look up company (default: amazon): ").strip().lower() or "amazon"
+    for row in index.top_problems(company, limit=10):
+        print(f"  {row['frequency']:>8.3f}  {row['difficulty']:<6}  {row['title']}")
@@ -0,0 +1,271 @@
+import os
+import re
+import math
+from typing import Dict, List, Optional
+
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+
+# Token budget for all source text in the filter prompt (≈4 chars per token)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+CHARS_PER_TOKEN     = 4
+
+# GitHub is already a frequency-ranked problem list — it is packed as a prefix
+GITHUB_MAX_LINES = 80
+
+# Free-text fields ranked passage by passage
+PACKED_FIELDS = ("reddit_raw", "ambitionbox_raw", "web_raw")
+
+MIN_PASSAGE_CHARS = 200     # consecutive short lines are merged up to this size
+MAX_PASSAGE_CHARS = 800     # longer lines (a whole Reddit body) are split at sentences
+
+# Section markers written by the extraction agents, and the lines that belong with them
+_HEADER_RE   = re.compile(r"^(=== POST ===|--- (SOURCE|DIRECT): .* ---)$")
+_CONTEXT_RE  = re.compile(r"^(Title|Score): ")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Signal → (weight, pattern). Hits are counted per passage.
+SIGNALS = {
+    "process": (3.0, re.compile(
+        r"\b(round\s*\d|(first|second|third|final|last)\s+round|online assessment|\bOA\b|onsite|"
+        r"on-site|phone screen|telephonic|coding round|technical round|system design round|"
+        r"hr round|managerial round|bar raiser|loop|rounds?)\b", re.I)),
+    "problem": (2.0, re.compile(
+        r"\b(leetcode|lc\s*\d+|medium|hard|easy|two pointers?|sliding window|dynamic programming|"
+        r"\bdp\b|graph|bfs|dfs|binary search|linked list|tree|heap|trie|asked (me )?to)\b", re.I)),
+    "behavioral": (2.0, re.compile(
+        r"(\?|\btell me about\b|\bwhy do you\b|\bbehaviou?ral\b|\bleadership principles?\b|"
+        r"\bconflict\b|\bstar method\b|\bculture fit\b|\bweakness)", re.I)),
+    "experience": (1.0, re.compile(
+        r"\b(interviewer|selected|rejected|offer|ghosted|culture|work[- ]life|manager|team|"
+        r"prepare|preparation|tips?|advice)\b", re.I)),
+}
+GITHUB_NAME_WEIGHT = 2.0    # a passage naming a problem from the GitHub list
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+# ─────────────────────────────────────────────
+# PASSAGES
+# ─────────────────────────────────────────────
+
+class Passage:
+    __slots__ = ("field", "block", "order", "text", "tokens", "score")
+
+    def __init__(self, field: str, block: int, order: int, text: str):
+        self.field  = field
+        self.block  = block
+        self.order  = order
+        self.text   = text
+        self.tokens = estimate_tokens(text) + 1
+        self.score  = 0.0
+
+
+def _split_long(line: str) -> List[str]:
+    if len(line) <= MAX_PASSAGE_CHARS:
+        return [line]
+    pieces, current = [], ""
+    for sentence in _SENTENCE_RE.split(line):
+        if current and len(current) + len(sentence) > MAX_PASSAGE_CHARS:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    # A single run-on "sentence" is still cut to size
+    return [p[i:i + MAX_PASSAGE_CHARS] for p in pieces for i in range(0, len(p), MAX_PASSAGE_CHARS)]
+
+
+def split_passages(field: str, text: str):
+    """
+    Splits one raw field into (headers, passages).
+
+    headers[block] holds the lines that introduce a block — the section marker
+    plus a Reddit post's Title/Score — and is emitted once if any passage of
+    the block is packed. Passages are comments, paragraphs or sentence windows.
+    """
+    headers:  List[List[str]] = []
+    passages: List[Passage]   = []
+
+    for block in re.split(r"\n\s*\n", text):
+        lines = [l.strip() for l in block.split("\n") if l.strip()]
+        if not lines:
+            continue
+        head = []
+        while lines and (_HEADER_RE.match(lines[0]) or _CONTEXT_RE.match(lines[0])):
+            head.append(lines.pop(0))
+        headers.append(head)
+        idx = len(headers) - 1
+
+        current = ""
+        for line in lines:
+            for piece in _split_long(line):
+                if current and len(current) + len(piece) > MIN_PASSAGE_CHARS:
+                    passages.append(Passage(field, idx, len(passages), current))
+                    current = ""
+                current = f"{current}\n{piece}" if current else piece
+        if current:
+            passages.append(Passage(field, idx, len(passages), current))
+
+    return headers, passages
+
+
+def score_passage(passage: Passage, problem_names: List[str]) -> float:
+    """Weighted signal hits per √token — dense passages beat long, rambling ones."""
+    hits = sum(weight * len(pattern.findall(passage.text)) for weight, pattern in SIGNALS.values())
+    if problem_names:
+        lowered = passage.text.lower()
+        hits   += GITHUB_NAME_WEIGHT * sum(name in lowered for name in problem_names)
+    return hits / math.sqrt(passage.tokens)
+
+
+# ─────────────────────────────────────────────
+# PACKING
+# ─────────────────────────────────────────────
+
+def _prepare(extracted: Dict):
+    """GitHub lines plus every free-text passage, scored, with their block headers."""
+    github_lines  = [l.strip() for l in (extracted.get("github_raw") or "").split("\n") if l.strip()]
+    problem_names = [l.lower() for l in github_lines if len(l) > 4]
+
+    headers, passages = {}, []
+    for field in PACKED_FIELDS:
+        headers[field], found = split_passages(field, extracted.get(field) or "")
+        passages.extend(found)
+    for p in passages:
+        p.score = score_passage(p, problem_names)
+
+    ranked = sorted(passages, key=lambda p: (-p.score, PACKED_FIELDS.index(p.field), p.order))
+    return github_lines, headers, passages, ranked
+
+
+def _header_cost(headers: Dict, p: Passage) -> int:
+    return estimate_tokens("\n".join(headers[p.field][p.block])) + 1
+
+
+def _render(headers: Dict, passages: List[Passage], chosen: set) -> Dict[str, str]:
+    """Packed passages written back per field, in original order, one header per block."""
+    packed = {}
+    for field in PACKED_FIELDS:
+        out, last_block = [], None
+        for p in passages:
+            if p.field != field or id(p) not in chosen:
+                continue
+            if p.block != last_block:
+                out.append("")
+                out.extend(headers[field][p.block])
+                last_block = p.block
+            out.append(p.text)
+        packed[field] = "\n".join(out).strip()
+    return packed
+
+
+def raw_tokens(extracted: Dict) -> int:
+    return sum(estimate_tokens(extracted.get(f) or "") for f in ("github_raw",) + PACKED_FIELDS)
+
+
+def pack_sources(extracted: Dict, budget: Optional[int] = None) -> Dict:
+    """
+    Source text for the filter prompt, fitted to a token budget.
+
+    GitHub's problem list is kept as a frequency-ordered prefix. The free-text
+    fields are split into passages, scored for interview-process, problem-name,
+    behavioural and candidate-experience signal, and added greedily, best
+    first, until the budget is spent; passages with no signal are dropped.
+    Every non-empty source gets its best passage before the greedy pass, and
+    packed passages are written back in their original order.
+    Returns {field: packed_text} plus a "_stats" entry.
+    """
+    budget = budget or PROMPT_TOKEN_BUDGET
+    github_lines, headers, passages, ranked = _prepare(extracted)
+
+    github    = "\n".join(github_lines[:GITHUB_MAX_LINES])
+    remaining = budget - estimate_tokens(github)
+    chosen, opened = set(), set()
+
+    def take(p: Passage) -> bool:
+        nonlocal remaining
+        cost = p.tokens
+        if (p.field, p.block) not in opened:
+            cost += _header_cost(headers, p)
+        if cost > remaining:
+            return False
+        remaining -= cost
+        opened.add((p.field, p.block))
+        chosen.add(id(p))
+        return True
+
+    for field in PACKED_FIELDS:
+        best = next((p for p in ranked if p.field == field), None)
+        if best:
+            take(best)
+    for p in ranked:
+        if p.score > 0 and id(p) not in chosen:
+            take(p)
+
+    packed = {"github_raw": github, **_render(headers, passages, chosen)}
+    before = raw_tokens(extracted)
+    packed["_stats"] = {
+        "budget":          budget,
+        "tokens_before":   before,
+        "tokens_after":    budget - remaining,
+        "passages":        len(passages),
+        "passages_packed": len(chosen),
+    }
+    print(f"[Packer] {before} → {budget - remaining} tokens "
+          f"({len(chosen)}/{len(passages)} passages, budget {budget})")
+    return packed
+
+
+def chunk_sources(extracted: Dict, budget: Optional[int] = None, max_chunks: int = 8) -> List[Dict]:
+    """
+    Splits a corpus too large for one prompt into up to `max_chunks` packed chunks.
+
+    Signal-bearing passages are dealt out best first, each to the chunk with
+    the most room left, so every chunk gets a share of the strongest material
+    and chunks fill evenly. GitHub's list is split into consecutive slices of
+    GITHUB_MAX_LINES, one per chunk, until it runs out. Each chunk has the same
+    shape as pack_sources() output and fits `budget` on its own.
+    """
+    budget = budget or PROMPT_TOKEN_BUDGET
+    github_lines, headers, passages, ranked = _prepare(extracted)
+
+    useful = [p for p in ranked if p.score > 0]
+    blocks = {(p.field, p.block): p for p in useful}
+    signal = sum(p.tokens for p in useful) + sum(_header_cost(headers, p) for p in blocks.values())
+    count  = max(1, min(max_chunks, math.ceil((signal + estimate_tokens("\n".join(github_lines))) / budget)))
+
+    slices    = [github_lines[i * GITHUB_MAX_LINES:(i + 1) * GITHUB_MAX_LINES] for i in range(count)]
+    github    = ["\n".join(lines) for lines in slices]
+    remaining = [budget - estimate_tokens(text) for text in github]
+    chosen    = [set() for _ in range(count)]
+    opened    = [set() for _ in range(count)]
+
+    for p in ranked:
+        if p.score <= 0:
+            break
+        costs = [p.tokens + (0 if (p.field, p.block) in opened[i] else _header_cost(headers, p))
+                 for i in range(count)]
+        fits  = [i for i in range(count) if costs[i] <= remaining[i]]
+        if not fits:
+            continue
+        i = max(fits, key=lambda c: (remaining[c], -c))
+        remaining[i] -= costs[i]
+        opened[i].add((p.field, p.block))
+        chosen[i].add(id(p))
+
+    chunks = []
+    for i in range(count):
+        chunk = {"github_raw": github[i], **_render(headers, passages, chosen[i])}
+        chunk["_stats"] = {"budget": budget, "tokens_after": budget - remaining[i],
+                           "passages_packed": len(chosen[i])}
+        if any(chunk[f].strip() for f in ("github_raw",) + PACKED_FIELDS):
+            chunks.append(chunk)
+
+    print(f"[Packer] {raw_tokens(extracted)} tokens → {len(chunks)} chunks of ≤{budget} "
+          f"({sum(len(c) for c in chosen)}/{len(passages)} passages)")
+    return chunks
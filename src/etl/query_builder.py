@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+import httpx
+
+from src.etl.async_engine  import AsyncFetcher
+from src.etl.source_health import get_source_health
+from src.utils.companies   import get_company_registry
+from src.utils.paths       import DATA_DIR, INPUTS_DIR
+
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+# Sites planned for every company, with the URL shapes they are known to use.
+# {slug} is the registry's hyphenated company id ('goldman-sachs').
+SITE_URL_TEMPLATES = {
+    "GeeksforGeeks": [
+        "https://www.geeksforgeeks.org/dsa/{slug}-sde-sheet-interview-questions-and-answers/",
+        "https://www.geeksforgeeks.org/{slug}-interview-experience/",
+    ],
+    "InterviewBit": [
+        "https://www.interviewbit.com/{slug}-interview-questions/",
+    ],
+    "PrepInsta": [
+        "https://prepinsta.com/{slug}/",
+    ],
+}
+SITE_DOMAINS = {
+    "GeeksforGeeks": "geeksforgeeks.org",
+    "InterviewBit":  "interviewbit.com",
+    "PrepInsta":     "prepinsta.com",
+}
+
+VALID_TTL   = 14 * 24 * 3600   # re-check a known-good URL every two weeks
+INVALID_TTL = 3 * 24 * 3600    # and give a dead query another go after three days
+
+# Validated query state lives beside the other caches; data/inputs holds the seeds
+QUERY_STATE_DIR = DATA_DIR / "cache" / "queries"
+
+# Only these prove a URL is gone — anything else (5xx, 429, 403, timeouts) is "unknown"
+DEAD_STATUSES = (404, 410)
+
+
+# ─────────────────────────────────────────────
+# QUERY PLANNER
+# ─────────────────────────────────────────────
+
+class QueryPlanner:
+    """
+    Resolves {company}_{role}_queries.json to concrete, validated URLs.
+
+    Queries are seeded from data/inputs (or a default set per site) and the
+    validated state is kept in data/cache/queries, so the tracked input files
+    are never rewritten.
+
+    Each query names a site and a search query. The planner tries, in order,
+    the stored url / initial_url_guess, the site's known URL templates and —
+    if Google Custom Search is configured — the top hits for search_query.
+    Candidates are checked with a HEAD request; the first live one is written
+    back as {"url", "valid": true, "checked_at"}. Later runs reuse it until
+    VALID_TTL, so the web agent can scrape known-good pages straight away.
+    Queries whose every candidate returned 404/410 are marked invalid and left
+    alone for INVALID_TTL; a query that could not be checked (network error,
+    server error) keeps its previous state and is retried on the next run.
+    """
+    HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/134.0.0.0 Safari/537.36"
+        )
+    }
+
+    def __init__(self, inputs_dir: Path = INPUTS_DIR, state_dir: Path = QUERY_STATE_DIR):
+        self.inputs_dir = Path(inputs_dir)
+        self.state_dir  = Path(state_dir)
+        self.api_key    = os.getenv("GOOGLE_SEARCH_API_KEY")
+        self.cx         = os.getenv("GOOGLE_SEARCH_CX")
+
+    @staticmethod
+    def _filename(company: str, role: str) -> str:
+        slug = get_company_registry().identifier(company, "gfg")
+        return f"{slug}_{role.strip().lower()}_queries.json"
+
+    def path_for(self, company: str, role: str) -> Path:
+        """Where the validated state for this pair is stored."""
+        return self.state_dir / self._filename(company, role)
+
+    # ── Query files ───────────────────────────────────────────
+
+    def load(self, company: str, role: str) -> List[dict]:
+        """Stored state, else the seed file in data/inputs, else a fresh set (one per known site)."""
+        for path in (self.path_for(company, role), self.inputs_dir / self._filename(company, role)):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                continue
+
+        term = f"{company.lower()} {role.lower()} interview questions"
+        return [
+            {"site": site, "search_query": f"{term} site:{SITE_DOMAINS[site]}",
+             "initial_url_guess": "", "url": "", "valid": False}
+            for site in SITE_URL_TEMPLATES
+        ]
+
+    def save(self, company: str, role: str, queries: List[dict]):
+        path = self.path_for(company, role)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(queries, f, indent=2)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _is_current(query: dict) -> bool:
+        checked = query.get("checked_at")
+        if not checked:
+            return False
+        ttl = VALID_TTL if query.get("valid") else INVALID_TTL
+        return time.time() - checked < ttl
+
+    # ── Planning ──────────────────────────────────────────────
+
+    async def plan(self, company: str, role: str, fetcher: AsyncFetcher) -> List[str]:
+        """Known-good URLs for this pair, validating stale or unchecked queries first."""
+        queries = self.load(company, role)
+        stale   = [q for q in queries if not self._is_current(q)]
+
+        if stale:
+            await asyncio.gather(*(self._resolve(q, company, fetcher) for q in stale))
+            try:
+                self.save(company, role, queries)
+            except OSError as e:
+                print(f"[Planner] ⚠️ Could not save queries: {e}")
+
+        urls = [q["url"] for q in queries if q.get("valid") and q.get("url")]
+        print(f"[Planner] {len(urls)}/{len(queries)} known-good URLs for '{company} {role}'"
+              + (f" ({len(stale)} re-checked)" if stale else ""))
+        return urls
+
+    def _candidates(self, query: dict, company: str) -> List[str]:
+        slug      = get_company_registry().identifier(company, "gfg")
+        templates = [t.format(slug=slug) for t in SITE_URL_TEMPLATES.get(query.get("site"), [])]
+        urls      = [query.get("url"), query.get("initial_url_guess")] + templates
+        return [u for u in dict.fromkeys(urls) if u]
+
+    async def _resolve(self, query: dict, company: str, fetcher: AsyncFetcher):
+        url, unknown = await self._first_live(self._candidates(query, company), fetcher)
+        if not url and not unknown:
+            url, unknown = await self._first_live(await self._search(query, fetcher), fetcher)
+
+        if not url and unknown:
+            # Could not tell (offline, server errors) — keep the last verdict and retry next run
+            return
+
+        query["valid"]      = bool(url)
+        query["url"]        = url or query.get("url", "")
+        query["checked_at"] = time.time()
+
+    async def _first_live(self, urls: List[str], fetcher: AsyncFetcher) -> Tuple[Optional[str], bool]:
+        """First live URL, and whether any candidate before it could not be checked."""
+        unknown = False
+        for url in urls:
+            live = await self._is_live(url, fetcher)
+            if live:
+                return url, unknown
+            unknown = unknown or live is None
+        return None, unknown
+
+    async def _is_live(self, url: str, fetcher: AsyncFetcher) -> Optional[bool]:
+        """True if the URL answers 200, False if it is gone (404/410), None if undecided."""
+        try:
+            resp = await fetcher.head(url, headers=self.HEADERS, purpose="probe")
+            if resp.status_code in (403, 405):
+                # Some sites refuse HEAD — a capped GET answers the same question.
+                # "probe" is not a cacheable purpose, so the stub never lands in the page cache.
+                resp = await fetcher.get(url, headers=self.HEADERS, purpose="probe", max_bytes=4096)
+        except httpx.HTTPError:
+            return None
+        if resp.status_code == 200:
+            return True
+        return False if resp.status_code in DEAD_STATUSES else None
+
+    async def _search(self, query: dict, fetcher: AsyncFetcher) -> List[str]:
+        """Top Custom Search hits on the query's own site; [] without API keys or quota."""
+        if not self.api_key or not self.cx or get_source_health().open_reason("google_search"):
+            return []
+        url = (
+            f"https://www.googleapis.com/customsearch/v1"
+            f"?q={quote(query['search_query'])}"
+            f"&key={self.api_key}&cx={self.cx}&num=3"
+        )
+        try:
+            resp = await fetcher.get(url, purpose="search")
+            if resp.status_code != 200:
+                return []
+            links = [item.get("link", "") for item in resp.json().get("items", [])]
+        except (httpx.HTTPError, ValueError):
+            return []
+        domain = SITE_DOMAINS.get(query.get("site"), "")
+        return [l for l in links if urlsplit(l).hostname and urlsplit(l).hostname.endswith(domain)]
+
+
+_planner: Optional[QueryPlanner] = None
+
+
+def get_query_planner() -> QueryPlanner:
+    global _planner
+    if _planner is None:
+        _planner = QueryPlanner()
+    return _planner
@@ -0,0 +1,203 @@
+import os
+import gzip
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.utils.paths import DATA_DIR
+from src.utils.companies import company_slug, output_key
+
+
+RAW_STORE_DIR = DATA_DIR / "raw_store"
+
+# Extraction output field → source key, as written by extractor._finalize
+RAW_FIELDS = {
+    "github":      "github_raw",
+    "reddit":      "reddit_raw",
+    "web":         "web_raw",
+    "ambitionbox": "ambitionbox_raw",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha         TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    created_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    company     TEXT NOT NULL,
+    slug        TEXT NOT NULL,
+    role        TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    meta        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS payloads (
+    run_id      TEXT NOT NULL REFERENCES runs(run_id),
+    source      TEXT NOT NULL,
+    sha         TEXT NOT NULL REFERENCES blobs(sha),
+    status      TEXT,
+    reason      TEXT,
+    char_count  INTEGER,
+    PRIMARY KEY (run_id, source)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_lookup ON runs (slug, role, created_at DESC);
+"""
+
+
+# ─────────────────────────────────────────────
+# RAW STORE
+# ─────────────────────────────────────────────
+
+class RawStore:
+    """
+    Content-addressed archive of every extraction payload.
+
+    Each SourceResult body is stored once as objects/<sha[:2]>/<sha>.gz,
+    keyed by the SHA-256 of its text, so the same GitHub list fetched for
+    five roles or on ten days costs one blob. index.sqlite links blobs to
+    runs (company, role, time, status per source), and load_run() rebuilds
+    the exact dict run_multi_agent_extraction returned — ready to replay
+    through the filter without scraping again.
+    """
+
+    def __init__(self, root: Path = RAW_STORE_DIR):
+        self.root  = Path(root)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.root / "objects" / sha[:2] / f"{sha}.gz"
+
+    # ── Blobs ─────────────────────────────────────────────────
+
+    def put_blob(self, text: str) -> str:
+        """Stores `text` if it is new and returns its hash."""
+        data = text.encode("utf-8")
+        sha  = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(sha)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            compressed = gzip.compress(data, compresslevel=6, mtime=0)
+            tmp        = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(compressed)
+            os.replace(tmp, path)
+            with self._lock, self._connection() as conn:
+                conn.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?)",
+                             (sha, len(data), len(compressed), time.time()))
+        return sha
+
+    def get_blob(self, sha: str) -> str:
+        return gzip.decompress(self._blob_path(sha).read_bytes()).decode("utf-8")
+
+    # ── Runs ──────────────────────────────────────────────────
+
+    def record_run(self, extracted: Dict) -> str:
+        """Archives one extraction result and returns its run id."""
+        company = extracted.get("company", "")
+        role    = extracted.get("role", "")
+        run_id  = f"{time.strftime('%Y%m%d_%H%M%S')}_{output_key(company, role)}_{uuid.uuid4().hex[:6]}"
+        meta    = {k: extracted.get(k) for k in ("sufficiency", "pipeline_ok", "extraction")}
+        sources = extracted.get("source_metadata", {})
+
+        rows = []
+        for source, field in RAW_FIELDS.items():
+            sha  = self.put_blob(extracted.get(field) or "")
+            info = sources.get(source, {})
+            rows.append((run_id, source, sha, info.get("status"), info.get("reason"),
+                         info.get("char_count")))
+
+        with self._lock, self._connection() as conn:
+            conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                         (run_id, company, company_slug(company), role, time.time(),
+                          json.dumps(meta, default=str)))
+            conn.executemany("INSERT INTO payloads VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return run_id
+
+    def load_run(self, run_id: str) -> Dict:
+        """The extraction dict for `run_id`, in the shape run_multi_agent_extraction returns."""
+        with self._lock:
+            conn = self._connection()
+            run  = conn.execute("SELECT company, role, meta FROM runs WHERE run_id = ?",
+                                (run_id,)).fetchone()
+            rows = conn.execute("SELECT source, sha, status, reason, char_count FROM payloads "
+                                "WHERE run_id = ?", (run_id,)).fetchall()
+        if run is None:
+            raise KeyError(f"No stored run '{run_id}'")
+
+        company, role, meta = run
+        extracted = {"company": company, "role": role, "source_metadata": {}}
+        for source, sha, status, reason, char_count in rows:
+            extracted[RAW_FIELDS[source]] = self.get_blob(sha)
+            extracted["source_metadata"][source] = {
+                "source": source, "status": status, "reason": reason, "char_count": char_count,
+            }
+        extracted.update(json.loads(meta))
+        return extracted
+
+    def runs(self, company: Optional[str] = None, role: Optional[str] = None,
+             limit: int = 20) -> List[dict]:
+        """Stored runs, newest first, optionally for one company and/or role."""
+        query, args = "SELECT run_id, company, role, created_at FROM runs WHERE 1=1", []
+        if company:
+            query += " AND slug = ?"
+            args.append(company_slug(company))
+        if role:
+            query += " AND lower(role) = lower(?)"
+            args.append(role)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        args.append(limit)
+
+        with self._lock:
+            rows = self._connection().execute(query, args).fetchall()
+        return [{"run_id": r[0], "company": r[1], "role": r[2], "created_at": r[3]} for r in rows]
+
+    def latest_run(self, company: str, role: str) -> Optional[str]:
+        found = self.runs(company, role, limit=1)
+        return found[0]["run_id"] if found else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            conn = self._connection()
+            runs = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            refs = conn.execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+            blobs, size, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs"
+            ).fetchone()
+        return {"runs": runs, "payloads": refs, "blobs": blobs,
+                "raw_bytes": size, "stored_bytes": stored}
+
+
+_store: Optional[RawStore] = None
+
+
+def get_raw_store() -> RawStore:
+    global _store
+    if _store is None:
+        _store = RawStore()
+    return _store
+
+
+# ─────────────────────────────────────────────
+# ENTRYPOINT
+# ─────────────────────────────────────────────
+
+if __name__ == "__main__":
+    store = get_raw_store()
+    print(json.dumps(store.stats(), indent=2))
+    for run in store.runs(limit=10):
+        print(f"  {run['run_id']:<45} {run['company']} | {run['role']}")
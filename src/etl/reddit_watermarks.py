@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from filelock import FileLock, Timeout
+
+from src.utils.paths import DATA_DIR
+from src.utils.companies import company_slug
+
+
+REDDIT_CACHE_DIR = DATA_DIR / "cache" / "reddit"
+
+
+# ─────────────────────────────────────────────
+# WATERMARK STORE
+# ─────────────────────────────────────────────
+
+class RedditWatermarkStore:
+    """
+    Per-company record of what the Reddit agent has already crawled.
+
+    For every (role, subreddit) it keeps the post IDs seen (kept or
+    rejected), the newest post timestamp and the last crawl time, plus the
+    extracted text of every post that passed the filters — the corpus.
+    Later runs only ask Reddit for posts newer than the watermark and merge
+    them with the stored corpus. A full 'top' + 'new' crawl is repeated every
+    FULL_RECRAWL_AFTER seconds; it skips only posts already in the corpus,
+    so a post rejected while new (low score) is re-checked once it has grown.
+
+    Every role of a company shares one file and roles run concurrently, so
+    save() re-reads the file under a file lock and merges into it.
+
+    File layout (data/cache/reddit/<company_slug>.json):
+      {"queries": {"<role>": {"<sub>": {"last_crawl", "newest_created", "seen_ids": {id: created_utc}}}},
+       "posts":   {"<role>": {"<post_id>": {"sub", "score", "created_utc", "text"}}}}
+    """
+    FULL_RECRAWL_AFTER  = 7 * 24 * 3600
+    MAX_SEEN_IDS        = 500
+    MAX_POSTS_PER_ROLE  = 200
+    LOCK_TIMEOUT        = 5.0
+
+    def __init__(self, company: str, root: Path = REDDIT_CACHE_DIR):
+        self.path      = Path(root) / f"{company_slug(company)}.json"
+        self._lock     = threading.Lock()
+        self._filelock = FileLock(f"{self.path}.lock", timeout=self.LOCK_TIMEOUT)
+        self._data     = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("queries", {})
+        data.setdefault("posts", {})
+        for subs in data["queries"].values():
+            for mark in subs.values():
+                if isinstance(mark.get("seen_ids"), list):      # older files: ids without times
+                    mark["seen_ids"] = dict.fromkeys(mark["seen_ids"], 0.0)
+        return data
+
+    @staticmethod
+    def _role_key(role: str) -> str:
+        return role.strip().lower()
+
+    # ── Watermarks ────────────────────────────────────────────
+
+    def watermark(self, role: str, sub: str) -> Optional[dict]:
+        return self._data["queries"].get(self._role_key(role), {}).get(sub)
+
+    def needs_full_crawl(self, role: str, sub: str) -> bool:
+        mark = self.watermark(role, sub)
+        return mark is None or time.time() - mark.get("last_crawl", 0) > self.FULL_RECRAWL_AFTER
+
+    def newest_created(self, role: str, sub: str) -> float:
+        mark = self.watermark(role, sub)
+        return mark.get("newest_created", 0.0) if mark else 0.0
+
+    def is_seen(self, role: str, sub: str, post_id: str) -> bool:
+        """Seen by an earlier crawl, kept or rejected — the incremental stop marker."""
+        mark = self.watermark(role, sub)
+        return bool(mark) and post_id in mark.get("seen_ids", {})
+
+    def in_corpus(self, role: str, post_id: str) -> bool:
+        return post_id in self._data["posts"].get(self._role_key(role), {})
+
+    def mark_crawled(self, role: str, sub: str, seen_ids: Dict[str, float],
+                     newest_created: Optional[float] = None, full: bool = False):
+        """
+        Records a crawl of one subreddit; `seen_ids` maps post id → created_utc.
+        `newest_created=None` keeps the previous watermark (used when some
+        qualifying posts were left unhydrated, so they are picked up next run).
+        Only a complete full crawl resets the weekly full-recrawl clock.
+        """
+        mark = {
+            "last_crawl":     time.time() if full else 0.0,
+            "last_checked":   time.time(),
+            "newest_created": newest_created or 0.0,
+            "seen_ids":       dict(seen_ids),
+        }
+        with self._lock:
+            queries      = self._data["queries"].setdefault(self._role_key(role), {})
+            queries[sub] = self._merge_mark(queries.get(sub), mark)
+
+    @classmethod
+    def _merge_mark(cls, a: Optional[dict], b: dict) -> dict:
+        a    = a or {}
+        seen = {**a.get("seen_ids", {}), **b.get("seen_ids", {})}
+        # Newest first, so the cap drops the oldest posts
+        kept = sorted(seen.items(), key=lambda item: -item[1])[:cls.MAX_SEEN_IDS]
+        return {
+            "last_crawl":     max(a.get("last_crawl", 0.0), b.get("last_crawl", 0.0)),
+            "last_checked":   max(a.get("last_checked", 0.0), b.get("last_checked", 0.0)),
+            "newest_created": max(a.get("newest_created", 0.0), b.get("newest_created", 0.0)),
+            "seen_ids":       dict(kept),
+        }
+
+    # ── Corpus ────────────────────────────────────────────────
+
+    def record_post(self, role: str, sub: str, post_id: str, score: int,
+                    created_utc: float, text: str):
+        with self._lock:
+            posts = self._data["posts"].setdefault(self._role_key(role), {})
+            posts[post_id] = {"sub": sub, "score": score, "created_utc": created_utc, "text": text}
+            self._cap_posts(posts)
+
+    @classmethod
+    def _cap_posts(cls, posts: dict):
+        if len(posts) > cls.MAX_POSTS_PER_ROLE:
+            oldest = sorted(posts, key=lambda pid: posts[pid]["created_utc"])
+            for pid in oldest[: len(posts) - cls.MAX_POSTS_PER_ROLE]:
+                del posts[pid]
+
+    def stored_posts(self, role: str, exclude: Iterable[str] = ()) -> list:
+        """Stored posts for this role, best-scored first."""
+        exclude = set(exclude)
+        posts   = self._data["posts"].get(self._role_key(role), {})
+        ranked  = [
+            {"id": pid, **entry} for pid, entry in posts.items() if pid not in exclude
+        ]
+        return sorted(ranked, key=lambda p: (-p["score"], -p["created_utc"]))
+
+    def save(self):
+        """
+        Merges this run into the file under the file lock: load → merge → save.
+        Another role's crawl that saved since this store was loaded is kept.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with self._filelock, self._lock:
+                data = self._load()
+                for role, subs in self._data["queries"].items():
+                    queries = data["queries"].setdefault(role, {})
+                    for sub, mark in subs.items():
+                        queries[sub] = self._merge_mark(queries.get(sub), mark)
+                for role, posts in self._data["posts"].items():
+                    merged = data["posts"].setdefault(role, {})
+                    merged.update(posts)
+                    self._cap_posts(merged)
+
+                tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+                self._data = data
+        except Timeout as e:
+            print(f"[Reddit] ⚠️ Watermark file busy, not saved: {e}")
@@ -0,0 +1,216 @@
+import re
+import statistics
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.companies import company_slug
+
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+# Fields a rule result is trusted for without asking the LLM
+CONFIDENCE_THRESHOLD = 0.75
+
+# The same company tiers the filter prompt spells out, keyed by company_slug()
+COMPANY_TIERS = {
+    "Hard":   {"google", "amazon", "apple", "meta", "facebook", "microsoft", "netflix", "deepmind"},
+    "Medium": {"razorpay", "atlassian", "flipkart", "zomato", "swiggy"},
+    "Easy":   {"tcs", "infosys", "wipro", "cognizant", "capgemini"},
+}
+TIER_ROUNDS = {"Hard": 5, "Medium": 4, "Easy": 2}
+
+MAX_DSA_TOPICS   = 50
+MIN_DSA_TOPICS   = 15       # the prompt expects at least this many when GitHub has data
+MAX_LIST_ENTRIES = 5        # systemDesignTopics, behavioralQuestions
+
+GENERIC_BEHAVIORAL = [
+    "Tell me about yourself.",
+    "Why do you want to join this company?",
+    "Describe a challenging project you worked on.",
+    "Tell me about a time you handled a conflict in your team.",
+    "Where do you see yourself in five years?",
+]
+
+_NUMBER_WORDS = {w: i for i, w in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve".split())}
+_NUM = r"(\d{1,2}|" + "|".join(_NUMBER_WORDS) + r")"
+
+_TOTAL_RE      = re.compile(rf"\b{_NUM}\s+(?:\w+\s+)?rounds?\b", re.I)
+_ROUND_NUM_RE  = re.compile(r"\bround\s*(\d{1,2})\b", re.I)
+_NEXT_ROUND    = r"(?!,?\s*\b(?:round|r)\s*\d)"      # a description ends where the next round begins
+_ROUND_DESC_RE = re.compile(
+    r"\b(?:round|r)\s*(\d{1,2})\s*(?::|-|–|was|is|were)\s*(?:an?\s+|the\s+)?"
+    rf"((?:{_NEXT_ROUND}[^.;\n]){{8,160}})", re.I)
+_QUESTION_RE   = re.compile(r"([A-Z][^.?!\n\"“”:]{10,180}\?)")
+_ASKED_RE      = re.compile(r"\b(you|your|tell me|describe|why|how would|what would|walk me)\b", re.I)
+_SD_MENTION_RE = re.compile(r"\b(system design|design round|hld|lld)\b", re.I)
+_SD_TOPIC_RE   = re.compile(
+    r"\bdesign(?:ing)?\s+(?:(?:on|of|for)\s+)?(?:design(?:ing)?\s+)?(?:a|an|the)?\s*"
+    r"(?!(?:was|is|were|went|round|rounds)\b)([A-Za-z][\w'\- ]{2,40}?)"
+    r"(?=[.,;:!?)\n]|\s+(?:and|with|for|in|on|using|which|that)\b|$)", re.I)
+_SD_LEAD_RE    = re.compile(r"^(?:(?:on|of|for|a|an|the|design|designing)\s+)+", re.I)
+_SD_STOPWORDS  = {"round", "rounds", "interview", "question", "questions", "problem", "patterns", "discussion"}
+_POST_SPLIT_RE = re.compile(r"=== POST ===|\n\s*\n")
+
+
+# ─────────────────────────────────────────────
+# FIELD RULES
+# ─────────────────────────────────────────────
+# Each rule returns (value, confidence). Confidence 0.0 means "no idea".
+
+def _posts(*texts: str) -> List[str]:
+    return [p for text in texts for p in _POST_SPLIT_RE.split(text or "") if p.strip()]
+
+
+def company_tier(company: str) -> Optional[str]:
+    slug = company_slug(company)
+    return next((tier for tier, names in COMPANY_TIERS.items() if slug in names), None)
+
+
+def rule_difficulty(company: str) -> Tuple[Optional[str], float]:
+    tier = company_tier(company)
+    return (tier, 0.95) if tier else (None, 0.0)
+
+
+def rule_dsa_topics(github_raw: str) -> Tuple[List[str], float]:
+    names = list(dict.fromkeys(l.strip() for l in (github_raw or "").split("\n") if len(l.strip()) > 2))
+    names = names[:MAX_DSA_TOPICS]
+    if not names:
+        return [], 0.0
+    return names, 0.95 if len(names) >= MIN_DSA_TOPICS else 0.6
+
+
+def _to_int(token: str) -> int:
+    return int(token) if token.isdigit() else _NUMBER_WORDS[token.lower()]
+
+
+def rule_avg_rounds(company: str, posts: List[str]) -> Tuple[Optional[int], float]:
+    """Median of per-post round counts ('5 rounds', 'round 4'); tier default when nobody says."""
+    counts = []
+    for post in posts:
+        found = [_to_int(m) for m in _TOTAL_RE.findall(post)]
+        found += [int(m) for m in _ROUND_NUM_RE.findall(post)]
+        found  = [n for n in found if 1 <= n <= 12]
+        if found:
+            counts.append(max(found))
+
+    if counts:
+        confidence = 0.9 if len(counts) >= 3 else 0.75 if len(counts) == 2 else 0.55
+        return statistics.median_low(counts), confidence
+
+    tier = company_tier(company)
+    return (TIER_ROUNDS[tier], 0.6) if tier else (None, 0.0)
+
+
+def rule_interview_process(posts: List[str]) -> Tuple[List[str], float]:
+    """'Round N: …' from explicit round descriptions; the most-described round N wins."""
+    described: Dict[int, List[str]] = {}
+    backers:   Dict[int, int]       = {}
+    for post in posts:
+        seen = set()
+        for num, desc in _ROUND_DESC_RE.findall(post):
+            n = int(num)
+            if not 1 <= n <= 12:
+                continue
+            described.setdefault(n, []).append(desc.strip().rstrip(","))
+            if n not in seen:
+                backers[n] = backers.get(n, 0) + 1
+                seen.add(n)
+
+    if not described:
+        return [], 0.0
+
+    rounds     = sorted(described)
+    process    = [f"Round {n}: {max(described[n], key=len)}" for n in rounds]
+    contiguous = rounds == list(range(1, len(rounds) + 1))
+    confirmed  = sum(backers[n] >= 2 for n in rounds)
+
+    confidence = 0.5
+    if contiguous and len(rounds) >= 2 and confirmed >= len(rounds) // 2 + 1:
+        confidence = 0.85
+    elif contiguous and len(rounds) >= 2:
+        confidence = 0.65
+    return process, confidence
+
+
+def rule_behavioral(posts: List[str], has_prose: bool) -> Tuple[List[str], float]:
+    if not has_prose:
+        return list(GENERIC_BEHAVIORAL), 0.9     # the prompt's own fallback
+
+    questions, seen = [], set()
+    for post in posts:
+        for q in _QUESTION_RE.findall(post):
+            key = re.sub(r"\W+", " ", q.lower()).strip()
+            if key not in seen and _ASKED_RE.search(q):
+                seen.add(key)
+                questions.append(q.strip())
+    questions = questions[:MAX_LIST_ENTRIES]
+    return questions, 0.8 if len(questions) >= 3 else 0.4
+
+
+def rule_system_design(posts: List[str]) -> Tuple[List[str], float]:
+    """'design(ing) X' topics; trusted only when most of them are named in two or more posts."""
+    if not any(_SD_MENTION_RE.search(p) for p in posts):
+        return [], 0.85         # nothing in the data — the prompt says return []
+
+    topics:  Dict[str, str] = {}
+    backers: Dict[str, int] = {}
+    for post in posts:
+        seen = set()
+        for topic in _SD_TOPIC_RE.findall(post):
+            topic = _SD_LEAD_RE.sub("", topic.strip())
+            key   = topic.lower()
+            if len(key) < 3 or key.split()[-1] in _SD_STOPWORDS:
+                continue
+            topics.setdefault(key, topic[0].upper() + topic[1:])
+            if key not in seen:
+                backers[key] = backers.get(key, 0) + 1
+                seen.add(key)
+
+    keys = list(topics)[:MAX_LIST_ENTRIES]
+    if not keys:
+        return [], 0.3
+    confirmed  = sum(backers[k] >= 2 for k in keys)
+    confidence = 0.8 if confirmed >= len(keys) // 2 + 1 else 0.6
+    return [topics[k] for k in keys], confidence
+
+
+# ─────────────────────────────────────────────
+# PRE-EXTRACTOR
+# ─────────────────────────────────────────────
+
+def extract_rules(extracted: Dict) -> Dict:
+    """
+    Fills the mechanical filter fields locally, each with a confidence in [0, 1].
+
+    Returns {"fields": {...}, "confidence": {...}}. Fields the rules cannot
+    fill at all are absent from "fields". enrichedInsights is prose and is
+    never filled here.
+    """
+    company     = extracted.get("company", "")
+    github      = extracted.get("github_raw") or ""
+    reddit      = extracted.get("reddit_raw") or ""
+    web         = extracted.get("web_raw") or ""
+    ambitionbox = extracted.get("ambitionbox_raw") or ""
+
+    posts     = _posts(reddit, ambitionbox)
+    has_prose = len(reddit.strip()) > 100 or len(ambitionbox.strip()) > 100
+
+    results = {
+        "difficulty":          rule_difficulty(company),
+        "dsaTopics":           rule_dsa_topics(github),
+        "avgRounds":           rule_avg_rounds(company, posts),
+        "interviewProcess":    rule_interview_process(posts),
+        "behavioralQuestions": rule_behavioral(posts, has_prose),
+        "systemDesignTopics":  rule_system_design(_posts(reddit, web)),
+    }
+
+    fields     = {k: v for k, (v, c) in results.items() if c > 0}
+    confidence = {k: round(c, 2) for k, (v, c) in results.items()}
+    return {"fields": fields, "confidence": confidence}
+
+
+def confident_fields(rules: Dict, threshold: float = CONFIDENCE_THRESHOLD) -> Dict:
+    """The subset of rule-filled fields trusted without the LLM."""
+    return {k: v for k, v in rules["fields"].items() if rules["confidence"].get(k, 0) >= threshold}
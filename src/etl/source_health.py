@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Set
+
+from filelock import FileLock, Timeout
+
+from src.utils.paths import DATA_DIR
+from src.utils.companies import company_slug
+
+
+SOURCE_HEALTH_PATH = DATA_DIR / "cache" / "source_health.json"
+
+
+# ─────────────────────────────────────────────
+# SOURCE HEALTH
+# ─────────────────────────────────────────────
+
+class SourceHealth:
+    """
+    Negative-result cache and circuit breakers, shared by every pipeline process.
+
+    Negative cache — "this source has nothing for this company", e.g. an
+    AmbitionBox 404 or a company missing from the LeetCode repo. The next run
+    skips the request until the entry expires.
+
+    Circuit breaker — one per source (github, reddit, ambitionbox,
+    google_search). FAILURE_THRESHOLD consecutive failures, or one quota
+    error, open it for a cool-down; while open the source is skipped outright.
+    After the cool-down the breaker is half-open: exactly one caller gets a
+    trial call (the others keep skipping), success closes the breaker and
+    failure re-opens it. A trial that never reports back expires after
+    TRIAL_TIMEOUT.
+
+    State lives in data/cache/source_health.json, so a breaker tripped by
+    one batch worker or CLI run is seen by all others. Checks are answered
+    from an in-memory copy that is re-read every REFRESH_INTERVAL seconds;
+    changes apply to the copy at once and are merged into the file under a
+    file lock. Called from an event loop, that disk work runs in a worker
+    thread (asyncio.to_thread) so it never stalls other fetches; from plain
+    threads it runs inline. If the lock cannot be taken quickly the write is
+    dropped — health tracking never blocks extraction.
+
+    File layout:
+      {"breakers": {"<source>": {"failures", "open_until", "reason", "trial_until"}},
+       "missing":  {"<source>:<company_slug>": {"until", "reason"}}}
+    """
+    FAILURE_THRESHOLD = 3
+    COOLDOWN          = 10 * 60         # generic failures (timeouts, 5xx, blocks)
+    QUOTA_COOLDOWN    = 60 * 60         # 429 / quota exhausted — quotas reset slowly
+    NOT_FOUND_TTL     = 7 * 24 * 3600   # a 404 for a company rarely flips within a week
+    TRIAL_TIMEOUT     = 2 * 60          # a half-open trial that never reported back
+    LOCK_TIMEOUT      = 2.0
+    REFRESH_INTERVAL  = 5.0
+
+    def __init__(self, path: Path = SOURCE_HEALTH_PATH):
+        self.path      = Path(path)
+        self._lock     = FileLock(f"{self.path}.lock", timeout=self.LOCK_TIMEOUT)
+        self._data     = self._load()       # unlocked: the file is only ever replaced atomically
+        self._read_at  = time.monotonic()
+        self._pending: List[Callable[[dict], None]] = []
+        self._mem_lock = threading.RLock()  # guards _data and _pending
+        self._io_lock  = threading.Lock()   # one refresh or flush at a time
+        self._tasks: Set[asyncio.Future] = set()
+
+    # ── Storage ───────────────────────────────────────────────
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("breakers", {})
+        data.setdefault("missing", {})
+        return data
+
+    def _save(self, data: dict):
+        now = time.time()
+        data["missing"] = {k: v for k, v in data["missing"].items() if v["until"] > now}
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _background(self, work: Callable[[], None]):
+        """Runs blocking disk work off the event loop when called from one, inline otherwise."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            work()
+            return
+        task = loop.create_task(asyncio.to_thread(work))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _refresh(self):
+        """Re-reads the file, keeping changes not yet flushed on top of it."""
+        with self._io_lock:
+            data = self._load()
+            with self._mem_lock:
+                for change in self._pending:
+                    change(data)
+                self._data = data
+
+    def _flush(self):
+        """Merges pending changes into the file under the file lock: load → mutate → save."""
+        with self._io_lock:
+            with self._mem_lock:
+                changes, self._pending = self._pending, []
+            if not changes:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self._lock:
+                    data = self._load()
+                    for change in changes:
+                        change(data)
+                    self._save(data)
+            except (Timeout, OSError) as e:
+                print(f"[Health] ⚠️ Could not update source health: {e}")
+                return
+            with self._mem_lock:
+                for change in self._pending:
+                    change(data)
+                self._data    = data
+                self._read_at = time.monotonic()
+
+    def _state(self) -> dict:
+        with self._mem_lock:
+            stale = time.monotonic() - self._read_at > self.REFRESH_INTERVAL
+            if stale:
+                self._read_at = time.monotonic()    # one refresh in flight at a time
+        if stale:
+            self._background(self._refresh)
+        return self._data
+
+    def _apply(self, change: Callable[[dict], None]):
+        with self._mem_lock:
+            change(self._data)
+            self._pending.append(change)
+
+    def _update(self, change: Callable[[dict], None]):
+        """Applies `change(data)` to the in-memory state now and to the file in the background."""
+        self._apply(change)
+        self._background(self._flush)
+
+    # ── Negative cache ────────────────────────────────────────
+
+    @staticmethod
+    def _missing_key(source: str, company: str) -> str:
+        return f"{source}:{company_slug(company)}"
+
+    def known_missing(self, source: str, company: str) -> Optional[str]:
+        """Reason string if `source` recently had nothing for `company`, else None."""
+        entry = self._state()["missing"].get(self._missing_key(source, company))
+        if entry and entry["until"] > time.time():
+            return entry["reason"]
+        return None
+
+    def remember_missing(self, source: str, company: str, reason: str, ttl: float = None):
+        entry = {"until": time.time() + (ttl or self.NOT_FOUND_TTL), "reason": reason}
+        self._update(lambda data: data["missing"].__setitem__(self._missing_key(source, company), entry))
+
+    # ── Circuit breakers ──────────────────────────────────────
+
+    def open_reason(self, source: str) -> Optional[str]:
+        """
+        Why `source` is being skipped right now, or None if calls may go through.
+        Past its cool-down a breaker lets exactly one trial caller through.
+        """
+        self._state()
+        with self._mem_lock:
+            breaker = self._data["breakers"].get(source)
+            if not breaker or not breaker.get("open_until"):
+                return None
+            now       = time.time()
+            remaining = breaker["open_until"] - now
+            if remaining > 0:
+                return f"{breaker['reason']} — retry in {remaining / 60:.0f} min"
+            if breaker.get("trial_until", 0) > now:
+                return f"{breaker['reason']} — trial call in progress"
+
+            def claim(data):
+                current = data["breakers"].get(source)
+                if current:
+                    current["trial_until"] = now + self.TRIAL_TIMEOUT
+
+            self._apply(claim)
+        self._background(self._flush)
+        print(f"[Health] 🔌 {source} circuit half-open — trial call")
+        return None
+
+    def record_success(self, source: str):
+        if self._state()["breakers"].get(source, {}).get("failures"):
+            self._update(lambda data: data["breakers"].pop(source, None))
+
+    def record_failure(self, source: str, reason: str, quota: bool = False):
+        """
+        Counts one failure. Opens the breaker at FAILURE_THRESHOLD, or
+        immediately for quota errors (retrying cannot help until it resets).
+        A failed half-open trial re-opens it for another cool-down.
+        """
+        def change(data):
+            breaker = data["breakers"].setdefault(source, {"failures": 0, "open_until": 0})
+            breaker["failures"]   += 1
+            breaker["reason"]      = reason
+            breaker["trial_until"] = 0
+            if quota or breaker["failures"] >= self.FAILURE_THRESHOLD:
+                cooldown = self.QUOTA_COOLDOWN if quota else self.COOLDOWN
+                breaker["open_until"] = time.time() + cooldown
+
+        self._update(change)
+        open_for = self._data["breakers"].get(source, {}).get("open_until", 0) - time.time()
+        if open_for > 0:
+            print(f"[Health] 🔌 {source} circuit open for {open_for / 60:.0f} min: {reason}")
+
+
+_health: Optional[SourceHealth] = None
+
+
+def get_source_health() -> SourceHealth:
+    global _health
+    if _health is None:
+        _health = SourceHealth()
+    return _health
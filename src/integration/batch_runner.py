@@ -0,0 +1,242 @@
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.etl.extractor             import set_source_concurrency
+from src.etl.leetcode_index        import get_leetcode_index
+from src.integration.build_schedule import run_pipeline
+from src.utils.paths               import INPUTS_DIR, OUTPUTS_DIR, ensure_data_dirs
+from src.utils.companies           import company_slug, output_key
+from src.utils.llm_cache           import get_llm_cache
+
+
+# ─────────────────────────────────────────────
+# INPUT LOADING
+# ─────────────────────────────────────────────
+
+def _display_company(raw: str) -> str:
+    return raw.replace("-", " ").replace("_", " ").title()
+
+
+def _display_role(raw: str) -> str:
+    # Short roles are acronyms (SDE, SE); longer ones are words (Analyst)
+    return raw.upper() if len(raw) <= 4 else raw.title()
+
+
+def pairs_from_inputs(pattern: str = "*_queries.json") -> List[Tuple[str, str]]:
+    """
+    (company, role) pairs from data/inputs/{company}_{role}_queries.json filenames.
+    'maximus-india_analyst_queries.json' → ('Maximus India', 'Analyst')
+    """
+    pairs = []
+    for path in sorted(INPUTS_DIR.glob(pattern)):
+        stem = path.name[: -len("_queries.json")]
+        if "_" not in stem:
+            print(f"[Batch] ⚠️ Skipping {path.name}: expected <company>_<role>_queries.json")
+            continue
+        company, role = stem.rsplit("_", 1)
+        pairs.append((_display_company(company), _display_role(role)))
+    return pairs
+
+
+def pairs_for_company(company: str) -> List[Tuple[str, str]]:
+    """
+    Every role with an input file for `company` — a whole-company refresh.
+    Role runs share one GitHub and one AmbitionBox fetch (see SHARED_SOURCES)
+    and each writes its own {company}__{role} output.
+    """
+    slug  = company_slug(company)
+    pairs = [(company, role) for c, role in pairs_from_inputs() if company_slug(c) == slug]
+    if not pairs:
+        print(f"[Batch] ⚠️ No input files for '{company}' — running SDE only")
+        pairs = [(company, "SDE")]
+    return pairs
+
+
+def pairs_from_file(path: Path) -> List[Tuple[str, str]]:
+    """
+    Reads pairs from a JSON list ([["Amazon", "SDE"], {"company": "TCS", "role": "SDE"}])
+    or from a text file with one 'Company,Role' per line.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix == ".json":
+        pairs = []
+        for item in json.loads(text):
+            if isinstance(item, dict):
+                pairs.append((item["company"], item["role"]))
+            else:
+                company, role = item
+                pairs.append((company, role))
+        return pairs
+
+    pairs = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        company, _, role = line.partition(",")
+        pairs.append((company.strip(), role.strip() or "SDE"))
+    return pairs
+
+
+# ─────────────────────────────────────────────
+# BATCH RUN
+# ─────────────────────────────────────────────
+
+def _unique_outputs(pairs: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], List[dict]]:
+    """
+    Pairs that write distinct output files, in input order, plus the dropped ones.
+    Aliases ('Facebook' / 'Meta') share an output key — running both in parallel
+    would have one silently overwrite the other, so only the first one runs.
+    """
+    kept, owner, clashes = [], {}, []
+    for company, role in pairs:
+        pair = (company.strip(), role.strip())
+        key  = output_key(*pair)
+        if key not in owner:
+            owner[key] = pair
+            kept.append(pair)
+        elif owner[key] != pair:
+            print(f"[Batch] ⚠️ {pair[0]} | {pair[1]} writes the same output as "
+                  f"{owner[key][0]} | {owner[key][1]} — skipped")
+            clashes.append({"company": pair[0], "role": pair[1], "output": f"{key}_insights.json",
+                            "same_as": {"company": owner[key][0], "role": owner[key][1]}})
+    return kept, clashes
+
+
+def _run_one(company: str, role: str, extraction_options: dict) -> dict:
+    started = time.monotonic()
+    try:
+        result = run_pipeline(company, role, **extraction_options)
+    except Exception as e:
+        # run_pipeline is not supposed to raise — record it rather than kill the batch
+        result = {"error": "unhandled_exception", "reason": str(e)}
+
+    entry = {
+        "company":   company,
+        "role":      role,
+        "status":    "error" if "error" in result else "ok",
+        "elapsed_s": round(time.monotonic() - started, 1),
+        "output":    f"{output_key(company, role)}_insights.json",
+    }
+    if "error" in result:
+        entry["error"]  = result["error"]
+        entry["reason"] = result.get("reason", result.get("details", ""))
+    else:
+        entry["dsa_topics"] = len(result.get("dsaTopics", []))
+        entry["difficulty"] = result.get("difficulty")
+        entry["sources"]    = result.get("_sources", {})
+    return entry
+
+
+def run_batch(pairs: List[Tuple[str, str]], max_workers: int = 4,
+              source_caps: dict = None, **extraction_options) -> dict:
+    """
+    Runs run_pipeline for every (company, role) pair on one shared worker pool.
+
+    Concurrency is bounded at three levels:
+      - max_workers pipelines at once (this pool)
+      - per-source caps inside the shared extraction loop (source_caps)
+      - the process-wide Gemini rate limit (GEMINI_RPM) in the filter stage
+
+    Writes data/outputs/batch_report_<timestamp>.json and returns the report.
+    """
+    if source_caps:
+        set_source_concurrency(**source_caps)
+
+    # One bulk download serves every company in the batch; no-op while fresh
+    try:
+        get_leetcode_index().sync()
+    except Exception as e:
+        print(f"[Batch] ⚠️ LeetCode index sync failed, GitHub agent will probe per company: {e}")
+
+    pairs, clashes = _unique_outputs(pairs)
+    print(f"\n{'═'*60}")
+    print(f"  BATCH PIPELINE — {len(pairs)} company/role pairs, {max_workers} workers")
+    print(f"{'═'*60}")
+
+    started = time.monotonic()
+    entries = []
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch") as pool:
+        futures = {
+            pool.submit(_run_one, company, role, extraction_options): (company, role)
+            for company, role in pairs
+        }
+        for future in as_completed(futures):
+            entry = future.result()
+            entries.append(entry)
+            mark = "✅" if entry["status"] == "ok" else "❌"
+            print(f"[Batch] {mark} {entry['company']} | {entry['role']} "
+                  f"({entry['elapsed_s']}s) — {len(entries)}/{len(pairs)} done")
+
+    # Report in input order, not completion order
+    order   = {pair: i for i, pair in enumerate(pairs)}
+    entries.sort(key=lambda e: order[(e["company"], e["role"])])
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "total":        len(entries),
+        "succeeded":    sum(e["status"] == "ok" for e in entries),
+        "failed":       sum(e["status"] != "ok" for e in entries),
+        "elapsed_s":    round(time.monotonic() - started, 1),
+        "max_workers":  max_workers,
+        "skipped":      clashes,
+        "llm_cache":    get_llm_cache().stats(),
+        "runs":         entries,
+    }
+
+    ensure_data_dirs()
+    report_file = OUTPUTS_DIR / f"batch_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+
+    print(f"\n{'═'*60}")
+    print(f"  BATCH COMPLETE — {report['succeeded']}/{report['total']} succeeded "
+          f"in {report['elapsed_s']}s")
+    print(f"  LLM cache: {report['llm_cache']['hits']} hits / {report['llm_cache']['misses']} misses")
+    print(f"  Report: {report_file}")
+    print(f"{'═'*60}\n")
+
+    return report
+
+
+# ─────────────────────────────────────────────
+# ENTRYPOINT
+# ─────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the ETL pipeline for many companies at once.")
+    parser.add_argument("--file",     type=Path, help="JSON or 'Company,Role' text file of pairs")
+    parser.add_argument("--company",  help="Refresh every role with an input file for this company")
+    parser.add_argument("--workers",  type=int, default=4, help="Concurrent pipelines (default: 4)")
+    parser.add_argument("--deadline", type=float, default=None, help="Per-run extraction deadline in seconds")
+    parser.add_argument("--fast",     action="store_true", help="Use fast extraction mode")
+    parser.add_argument("--replay",   action="store_true", help="Re-filter the latest archived extraction per pair")
+    parser.add_argument("--filter-mode", choices=("auto", "single", "map_reduce", "rules"), default="auto",
+                        help="Filter strategy; 'rules' skips Gemini entirely (default: auto)")
+    args = parser.parse_args()
+
+    if args.company:
+        pairs = pairs_for_company(args.company)
+    else:
+        pairs = pairs_from_file(args.file) if args.file else pairs_from_inputs()
+    if not pairs:
+        print("[Batch] No company/role pairs found.")
+        sys.exit(1)
+
+    options = {"mode": "fast" if args.fast else "full", "filter_mode": args.filter_mode}
+    if args.replay:
+        options["replay"] = "latest"
+    if args.deadline:
+        options["deadline_s"] = args.deadline
+
+    report = run_batch(pairs, max_workers=args.workers, **options)
+    sys.exit(0 if report["failed"] == 0 else 1)
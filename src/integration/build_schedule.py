@@ -2,10 +2,14 @@ import os
 import sys
 import json
 from pathlib import Path
+from typing import Optional
 
 from src.etl.extractor    import run_multi_agent_extraction
+from src.etl.dedup        import dedupe_extracted
+from src.etl.raw_store    import get_raw_store
 from src.etl.great_filter import run_great_filter
 from src.utils.paths      import OUTPUTS_DIR
+from src.utils.companies  import output_key
 
 # ── Future agents — uncomment when built ────────────────────
 # from src.etl.confidence_agent import run_confidence_agent
@@ -24,29 +28,54 @@ def _banner(phase: str, message: str):
 
 
 def _save_json(data: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4)
 
 
-def _company_slug(company: str) -> str:
-    return company.lower().replace(" ", "_").replace(".", "")
-
-
 # ─────────────────────────────────────────────
 # PIPELINE
 # ─────────────────────────────────────────────
 
-def run_pipeline(company: str, role: str) -> dict:
+def _archive_extraction(extracted: dict) -> str:
+    """Stores the raw payloads in the content-addressed RawStore; '' if that fails."""
+    try:
+        run_id = get_raw_store().record_run(extracted)
+        print(f"[Pipeline] Raw payloads archived as run {run_id}")
+        return run_id
+    except Exception as e:
+        print(f"[Pipeline] ⚠️ Could not archive raw payloads: {e}")
+        return ""
+
+
+def _replayed_extraction(company: str, role: str, replay: str) -> dict:
+    """Loads a stored extraction — `replay` is a run id or 'latest' for this company/role."""
+    store  = get_raw_store()
+    run_id = store.latest_run(company, role) if replay == "latest" else replay
+    if not run_id:
+        raise KeyError(f"No stored run for {company} | {role}")
+    print(f"[Pipeline] Replaying stored run {run_id} — no scraping")
+    return {**store.load_run(run_id), "run_id": run_id}
+
+
+def run_pipeline(company: str, role: str, replay: Optional[str] = None,
+                 filter_mode: str = "auto", **extraction_options) -> dict:
     """
     ETL pipeline with explicit gate checks at every phase.
 
     Returns the final output dict.
     On failure returns a dict with an 'error' key — never raises.
+    extraction_options are passed through to run_multi_agent_extraction
+    (mode, deadline_s, speculative_ambitionbox, ...).
+    replay='latest' (or a stored run id) skips extraction and feeds the
+    archived raw payloads from the RawStore into the filter instead.
+    filter_mode is passed to the filter ("rules" never calls Gemini).
 
     Phases:
       1. EXTRACT  → multi-agent parallel scraping
       2. GATE     → sufficiency check (halt here if data is too thin)
-      3. FILTER   → Gemini cleans + structures the data
+      3. FILTER   → near-duplicate passages dropped, rules fill the mechanical fields,
+                    Gemini structures the rest
       4. GATE     → schema validation (halt here if output is malformed)
       5. SAVE     → single output file written to disk
     """
@@ -57,14 +86,21 @@ def run_pipeline(company: str, role: str) -> dict:
     print(f"  Role    : {role}")
     print(f"{'═'*60}")
 
-    slug        = _company_slug(company)
-    output_file = OUTPUTS_DIR / f"{slug}_insights.json"
+    # One file per company *and* role — a batch runs a company's roles in parallel
+    output_file = OUTPUTS_DIR / f"{output_key(company, role)}_insights.json"
 
 
     # ── PHASE 1: EXTRACT ──────────────────────────────────────
-    _banner("PHASE 1 · EXTRACT", "Running multi-agent data extraction...")
-
-    extracted = run_multi_agent_extraction(company, role)
+    if replay:
+        _banner("PHASE 1 · EXTRACT", "Loading archived raw payloads...")
+        try:
+            extracted = _replayed_extraction(company, role, replay)
+        except KeyError as e:
+            return {"error": "replay_not_found", "company": company, "role": role, "reason": e.args[0]}
+    else:
+        _banner("PHASE 1 · EXTRACT", "Running multi-agent data extraction...")
+        extracted = run_multi_agent_extraction(company, role, **extraction_options)
+        extracted["run_id"] = _archive_extraction(extracted)
 
     # ── GATE: halt if data floor not met ─────────────────────
     if not extracted.get("pipeline_ok"):
@@ -100,7 +136,8 @@ def run_pipeline(company: str, role: str) -> dict:
     # ── PHASE 2: FILTER ───────────────────────────────────────
     _banner("PHASE 2 · FILTER", "Structuring data with Gemini...")
 
-    filtered = run_great_filter(extracted)
+    # Mirrored writeups and cross-posts would otherwise eat the prompt budget
+    filtered = run_great_filter(dedupe_extracted(extracted), filter_mode)
 
     # ── GATE: halt if filter returned an error ────────────────
     if "error" in filtered:
@@ -126,6 +163,7 @@ def run_pipeline(company: str, role: str) -> dict:
 
     final_output = {
         **filtered,
+        "_run_id":  extracted.get("run_id", ""),
         "_sources": {
             k: {"status": v.get("status"), "chars": v.get("char_count")}
             for k, v in extracted["source_metadata"].items()
@@ -1,22 +1,19 @@
 import json
-import os
 from datetime import datetime, timedelta
-import google.generativeai as genai
 from dotenv import load_dotenv
-from src.utils.paths import OUTPUTS_DIR
+from src.utils.paths import OUTPUTS_DIR, ensure_data_dirs
+from src.utils.gemini import GEMINI_STREAM, ResponseBlocked, StreamAborted, generate_json, generate_text, get_model, model_name
+from src.utils.json_stream import StreamError, parse_json_object
+from src.utils.llm_cache import get_llm_cache
+from src.utils.companies import company_slug, insights_path
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
 
 # ─────────────────────────────────────────────
 # HELPERS
 # ─────────────────────────────────────────────
 
-def _company_slug(company: str) -> str:
-    return company.lower().replace(" ", "_").replace(".", "")
-
-
 def _compute_start_date() -> str:
     """Study plan starts from tomorrow."""
     return (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -49,6 +46,25 @@ def _inject_ids_and_dates(schedule: list, start_date: str) -> list:
     return schedule
 
 
+def _check_day_block(block) -> None:
+    """One schedule entry: {"day": int, "tasks": [...]} — checked as soon as it streams in."""
+    if not isinstance(block, dict):
+        raise ValueError(f"schedule entry must be an object, got: {type(block).__name__}")
+    if not isinstance(block.get("day"), int):
+        raise ValueError(f"schedule entry has no integer 'day': {block.get('day')!r}")
+    if not isinstance(block.get("tasks"), list):
+        raise ValueError(f"day {block['day']} has no 'tasks' list")
+
+
+def _check_schedule(value) -> None:
+    if not isinstance(value, list) or not value:
+        raise ValueError("'schedule' must be a non-empty list")
+
+
+PLAN_FIELD_CHECKS = {"schedule": _check_schedule}
+PLAN_ITEM_CHECKS  = {"schedule": _check_day_block}
+
+
 # ─────────────────────────────────────────────
 # RECOMMENDATION AGENT
 # ─────────────────────────────────────────────
@@ -67,8 +83,8 @@ def generate_study_plan(
     """
     print(f"\n[RecommendationAgent] Generating {duration_days}-day plan for {company} | {role}...")
 
-    slug          = _company_slug(company)
-    insights_file = OUTPUTS_DIR / f"{slug}_insights.json"
+    slug          = company_slug(company)
+    insights_file = insights_path(company, role)
 
     # ── Pre-flight check ──────────────────────────────────────
     if not insights_file.exists():
@@ -180,25 +196,31 @@ OUTPUT — RAW JSON ONLY. NO MARKDOWN. NO EXPLANATION.
 """
 
     # ── Call Gemini (full flash — this is the expensive call) ─
-    model = genai.GenerativeModel("gemini-2.5-flash-lite")
+    model = get_model("gemini-2.5-flash-lite")
 
+    response = ""
     try:
-        response = model.generate_content(prompt)
-        raw_text = response.text.strip()
-
-        for fence in ("```json", "```"):
-            if raw_text.startswith(fence):
-                raw_text = raw_text[len(fence):]
-        if raw_text.endswith("```"):
-            raw_text = raw_text[:-3]
-        raw_text = raw_text.strip()
-
-        plan = json.loads(raw_text)
-
-    except json.JSONDecodeError:
+        if GEMINI_STREAM:
+            # A malformed day block aborts the stream instead of waiting for all 30
+            plan = generate_json(model, prompt, field_checks=PLAN_FIELD_CHECKS,
+                                 item_checks=PLAN_ITEM_CHECKS)
+        else:
+            response = generate_text(model, prompt)
+            plan     = parse_json_object(response)
+
+    except StreamAborted as e:
+        print(f"[RecommendationAgent] ❌ Gemini stream aborted: {e.reason}")
+        return {"error": "invalid_json", "preview": e.preview[:400]}
+
+    except ResponseBlocked as e:
+        print(f"[RecommendationAgent] ❌ Gemini returned no text: {e}")
+        return {"error": "response_blocked", "details": str(e)}
+
+    except StreamError:
         print("[RecommendationAgent] ❌ Gemini returned invalid JSON")
-        print("Preview:\n", response.text[:400])
-        return {"error": "invalid_json", "preview": response.text[:400]}
+        print("Preview:\n", response[:400])
+        get_llm_cache().discard(model_name(model), prompt)
+        return {"error": "invalid_json", "preview": response[:400]}
 
     except Exception as e:
         print(f"[RecommendationAgent] ❌ {e}")
@@ -213,6 +235,7 @@ OUTPUT — RAW JSON ONLY. NO MARKDOWN. NO EXPLANATION.
     total_tasks = sum(len(d.get("tasks", [])) for d in plan.get("schedule", []))
 
     # ── Save — per-company filename ───────────────────────────
+    ensure_data_dirs()
     output_file = OUTPUTS_DIR / f"{slug}_schedule.json"
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(plan, f, indent=4)
@@ -2,15 +2,12 @@ import json
 from flask import Flask, jsonify, request
 from src.recommendation.agents.gemini_agent import generate_study_plan
 from src.recommendation.core.rescheduler    import reschedule_by_completed_days
-from src.utils.paths import OUTPUTS_DIR
+from src.utils.paths import OUTPUTS_DIR, ensure_data_dirs
+from src.utils.companies import company_slug, insights_path
 
 app = Flask(__name__)
 
 
-def _company_slug(company: str) -> str:
-    return company.lower().replace(" ", "_").replace(".", "")
-
-
 # ─────────────────────────────────────────────
 # ROUTES
 # ─────────────────────────────────────────────
@@ -38,8 +35,7 @@ def generate():
         return jsonify({"status": "error", "message": "Field 'company' is required."}), 400
 
     # Pre-flight: ETL insights must exist before we spend an API call
-    slug          = _company_slug(company)
-    insights_file = OUTPUTS_DIR / f"{slug}_insights.json"
+    insights_file = insights_path(company, role)
 
     if not insights_file.exists():
         return jsonify({
@@ -100,7 +96,7 @@ def get_schedule(company: str):
 
     Example: GET /schedule/google
     """
-    slug = _company_slug(company)
+    slug = company_slug(company)
     path = OUTPUTS_DIR / f"{slug}_schedule.json"
 
     if not path.exists():
@@ -124,9 +120,9 @@ def list_schedules():
     """
     schedules = []
     for file in OUTPUTS_DIR.glob("*_schedule.json"):
-        company_slug = file.stem.replace("_schedule", "")
+        slug = file.stem.replace("_schedule", "")
         schedules.append({
-            "company": company_slug,
+            "company": slug,
             "file":    file.name,
         })
 
@@ -138,6 +134,7 @@ def list_schedules():
 # ─────────────────────────────────────────────
 
 if __name__ == "__main__":
+    ensure_data_dirs()
     print("Recommendation API running on http://localhost:5000")
     print("Routes:")
     print("  POST /generate-plan          — generate study plan (calls Gemini)")
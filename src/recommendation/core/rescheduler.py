@@ -1,6 +1,7 @@
 import json
 from datetime import datetime
 from src.utils.paths import OUTPUTS_DIR
+from src.utils.companies import company_slug
 
 
 def reschedule_by_completed_days(
@@ -26,7 +27,7 @@ def reschedule_by_completed_days(
     Returns:
         The updated plan dict (also saved back to disk).
     """
-    slug = company.lower().replace(" ", "_").replace(".", "")
+    slug = company_slug(company)
     path = OUTPUTS_DIR / f"{slug}_schedule.json"
 
     if not path.exists():
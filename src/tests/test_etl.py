@@ -0,0 +1,1421 @@
+import io
+import os
+import json
+import tarfile
+import contextlib
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from src.etl import async_engine, extractor
+from src.etl.async_engine import AsyncFetcher, Deadline, SingleFlight
+from src.etl.dedup import dedupe_extracted
+from src.etl.great_filter import GreatFilterAgent, merge_partials
+from src.etl.query_builder import QueryPlanner
+from src.etl.prompt_packer import chunk_sources, estimate_tokens, pack_sources
+from src.etl.raw_store import RawStore
+from src.etl.reddit_watermarks import RedditWatermarkStore
+from src.integration import batch_runner, build_schedule
+from src.etl.http_cache import HttpCache
+from src.etl import content_extract, leetcode_index
+from src.etl.leetcode_index import LeetCodeIndex, parse_company_csv
+from src.etl.source_health import SourceHealth
+from src.etl.rule_extractor import (
+    confident_fields, extract_rules, rule_interview_process, rule_system_design,
+)
+from src.utils import gemini
+from src.utils import companies
+from src.utils.companies import CompanyRegistry, canonical_name, company_slug
+from src.utils.json_stream import JsonObjectStream, StreamError, parse_json_object
+from src.utils.llm_cache import LLMCache
+from src.utils.rate_limit import KeyedRateLimiter, TokenBucket
+
+
+# The dummy Reddit post from great_filter.py's __main__
+DUMMY_REDDIT = (
+    "=== POST ===\nTitle: Meta SDE Interview Experience\n"
+    "Content: Had 5 rounds total. Round 1 was a phone screen with easy LC, "
+    "Round 2 was coding with two mediums on arrays and sliding window, "
+    "Round 3 another coding round with graphs, Round 4 system design on "
+    "designing Instagram feed, Round 5 was behavioral with Meta values questions.\n"
+    "Comment: They really focus on problem-solving speed and clean code.\n"
+    "Comment: System design was 45 mins, very detailed on scalability."
+)
+
+
+# ─────────────────────────────────────────────
+# RULE EXTRACTOR
+# ─────────────────────────────────────────────
+
+def test_round_descriptions_stop_at_next_round():
+    process, _ = rule_interview_process([DUMMY_REDDIT])
+    assert process == [
+        "Round 1: phone screen with easy LC",
+        "Round 2: coding with two mediums on arrays and sliding window",
+        "Round 5: behavioral with Meta values questions",
+    ]
+
+
+def test_system_design_topic_drops_lead_words():
+    topics, confidence = rule_system_design([DUMMY_REDDIT])
+    assert topics == ["Instagram feed"]
+    assert confidence < 0.75
+
+
+def test_system_design_topic_confirmed_by_several_posts():
+    posts = ["HLD round: design a URL shortener.", "System design was designing the URL shortener."]
+    topics, confidence = rule_system_design(posts)
+    assert topics == ["URL shortener"]
+    assert confidence >= 0.75
+
+
+def test_system_design_without_mention_is_confidently_empty():
+    assert rule_system_design(["Two coding rounds on arrays."]) == ([], 0.85)
+
+
+def test_extract_rules_and_confident_fields():
+    rules = extract_rules({"company": "Meta", "reddit_raw": DUMMY_REDDIT,
+                           "github_raw": "\n".join(f"Problem {i}" for i in range(20))})
+    assert rules["fields"]["difficulty"] == "Hard"
+    assert rules["fields"]["avgRounds"] == 5
+    assert len(rules["fields"]["dsaTopics"]) == 20
+
+    trusted = confident_fields(rules)
+    assert trusted["difficulty"] == "Hard"
+    assert "dsaTopics" in trusted
+    assert "systemDesignTopics" not in trusted
+    assert "enrichedInsights" not in rules["fields"]
+
+
+# ─────────────────────────────────────────────
+# STREAMED JSON
+# ─────────────────────────────────────────────
+
+def test_stream_emits_fields_and_items_as_they_close():
+    stream = JsonObjectStream()
+    events = []
+    for chunk in ['```json\n{"a": 1, "li', 'st": [{"x": "}"}, 2', '], "s": "q\\"uote"}\n```']:
+        events += stream.feed(chunk)
+    assert events == [
+        ("field", "a", 1),
+        ("item", "list", {"x": "}"}),
+        ("item", "list", 2),
+        ("field", "list", [{"x": "}"}, 2]),
+        ("field", "s", 'q"uote'),
+    ]
+    assert stream.done
+    assert stream.close() == {"a": 1, "list": [{"x": "}"}, 2], "s": 'q"uote'}
+
+
+def test_stream_truncated_response_fails_on_close():
+    stream = JsonObjectStream()
+    assert stream.feed('{"a": [1, 2') == [("item", "a", 1)]
+    with pytest.raises(StreamError):
+        stream.close()
+
+
+def test_stream_rejects_prose_immediately():
+    with pytest.raises(StreamError):
+        JsonObjectStream().feed("Sure! Here is the JSON you asked for: {}")
+
+
+def test_parse_json_object_accepts_fence():
+    assert parse_json_object('```json\n{"k": [true, null]}\n```') == {"k": [True, None]}
+    with pytest.raises(StreamError):
+        parse_json_object('{"k": 1')
+
+
+class _Chunk:
+    def __init__(self, text=None):
+        self._text = text
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError("The response has no valid Part")
+        return self._text
+
+
+class _Model:
+    model_name = "test-model"
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls     = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        return [_Chunk(t) for t in self.responses.pop(0)]
+
+
+@pytest.fixture
+def llm_cache(tmp_path, monkeypatch):
+    cache = LLMCache(tmp_path / "llm.sqlite")
+    monkeypatch.setattr(gemini, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(gemini, "GEMINI_LIMITER", TokenBucket(rate=1000, capacity=1000))
+    return cache
+
+
+def _positive(value):
+    if value <= 0:
+        raise ValueError("must be positive")
+
+
+def test_generate_json_aborts_on_failed_item_check_and_retries(llm_cache):
+    model  = _Model(['{"n": [1, -1', ', 3]}'], ['{"n": [1, 2]}'])
+    result = gemini.generate_json(model, "p", item_checks={"n": _positive})
+    assert result == {"n": [1, 2]}
+    assert model.calls == 2
+
+
+def test_generate_json_blocked_candidate_is_not_a_validation_failure(llm_cache):
+    model = _Model([None])
+    with pytest.raises(gemini.ResponseBlocked):
+        gemini.generate_json(model, "p", max_attempts=3)
+    assert model.calls == 1
+
+
+def test_generate_json_cache_hit_runs_item_checks(llm_cache):
+    llm_cache.put("test-model", "p", json.dumps({"n": [1, -1]}))
+    model  = _Model(['{"n": [4]}'])
+    result = gemini.generate_json(model, "p", item_checks={"n": _positive})
+    assert result == {"n": [4]}
+    assert model.calls == 1
+    assert llm_cache.get("test-model", "p") == '{"n": [4]}'
+
+
+# ─────────────────────────────────────────────
+# SOURCE HEALTH
+# ─────────────────────────────────────────────
+
+def _end_cooldown(health: SourceHealth, source: str):
+    health._update(lambda data: data["breakers"][source].__setitem__("open_until", 1))
+
+
+def test_breaker_opens_after_threshold_and_allows_one_trial(tmp_path):
+    health = SourceHealth(tmp_path / "health.json")
+    for _ in range(SourceHealth.FAILURE_THRESHOLD - 1):
+        health.record_failure("reddit", "HTTP 503")
+    assert health.open_reason("reddit") is None
+
+    health.record_failure("reddit", "HTTP 503")
+    assert "HTTP 503" in health.open_reason("reddit")
+
+    # Cool-down over: one caller gets the trial, everyone else keeps skipping
+    _end_cooldown(health, "reddit")
+    assert health.open_reason("reddit") is None
+    assert "trial call in progress" in health.open_reason("reddit")
+
+    health.record_failure("reddit", "still down")
+    assert "retry in" in health.open_reason("reddit")
+
+    _end_cooldown(health, "reddit")
+    assert health.open_reason("reddit") is None
+    health.record_success("reddit")
+    assert health.open_reason("reddit") is None
+    assert SourceHealth(tmp_path / "health.json").open_reason("reddit") is None
+
+
+def test_quota_error_opens_breaker_at_once_and_is_shared(tmp_path):
+    SourceHealth(tmp_path / "health.json").record_failure("google_search", "429", quota=True)
+    assert "429" in SourceHealth(tmp_path / "health.json").open_reason("google_search")
+
+
+def test_negative_cache_persists_and_expires(tmp_path):
+    health = SourceHealth(tmp_path / "health.json")
+    health.remember_missing("github", "Meta Platforms", "404")
+    health.remember_missing("ambitionbox", "Meta", "gone", ttl=-1)
+    other = SourceHealth(tmp_path / "health.json")
+    assert other.known_missing("github", "Meta Platforms") == "404"
+    assert other.known_missing("ambitionbox", "Meta") is None
+
+
+def test_source_health_flushes_off_the_event_loop(tmp_path):
+    async def main():
+        health = SourceHealth(tmp_path / "health.json")
+        health.remember_missing("github", "Acme", "404")
+        assert health.known_missing("github", "Acme") == "404"    # visible before the flush lands
+        await asyncio.gather(*health._tasks)
+        return health
+
+    asyncio.run(main())
+    assert SourceHealth(tmp_path / "health.json").known_missing("github", "Acme") == "404"
+
+
+@pytest.fixture
+def agent_health(tmp_path, monkeypatch):
+    """Fresh SourceHealth and CompanyRegistry for the agents; the LeetCode index is unsynced."""
+    health = SourceHealth(tmp_path / "health.json")
+    monkeypatch.setattr(extractor, "get_source_health", lambda: health)
+    monkeypatch.setattr(extractor, "get_company_registry",
+                        lambda: CompanyRegistry(tmp_path / "registry.json"))
+    monkeypatch.setattr(extractor, "get_leetcode_index",
+                        lambda: type("Index", (), {"is_synced": lambda self: False})())
+    return health
+
+
+def _half_open(health: SourceHealth, source: str):
+    for _ in range(SourceHealth.FAILURE_THRESHOLD):
+        health.record_failure(source, "HTTP 503")
+    _end_cooldown(health, source)
+
+
+def test_cached_miss_does_not_take_the_half_open_trial(agent_health, fetcher_for):
+    _half_open(agent_health, "ambitionbox")
+    agent_health.remember_missing("ambitionbox", "Acme", "Not found")
+
+    result = asyncio.run(extractor.AmbitionBoxAgent().extract_async("Acme", "SDE", fetcher_for()))
+    assert result.reason == "Cached miss: Not found"
+    assert agent_health.open_reason("ambitionbox") is None        # the trial is still free
+
+
+@pytest.mark.parametrize("source, run", [
+    ("github",      lambda f: extractor.GitHubCodingAgent().extract_async("Acme", f)),
+    ("ambitionbox", lambda f: extractor.AmbitionBoxAgent().extract_async("Acme", "SDE", f)),
+])
+def test_trial_that_only_finds_404s_closes_the_breaker(agent_health, fetcher_for, source, run):
+    _half_open(agent_health, source)
+    fetcher = fetcher_for(*[(404, "", {})] * 4)
+
+    result = asyncio.run(run(fetcher))
+    assert result.status == "failed"
+    assert agent_health.known_missing(source, "Acme")
+    assert source not in agent_health._state()["breakers"]
+
+
+def test_trial_that_fails_reopens_the_breaker(agent_health, fetcher_for):
+    _half_open(agent_health, "github")
+    asyncio.run(extractor.GitHubCodingAgent().extract_async("Acme", fetcher_for((503, "", {}))))
+    assert "retry in" in agent_health.open_reason("github")
+
+
+# ─────────────────────────────────────────────
+# SOURCE CONCURRENCY
+# ─────────────────────────────────────────────
+
+def test_source_slots_are_per_event_loop():
+    async def slot():
+        return extractor._source_slot("reddit")
+
+    first, second = asyncio.run(slot()), asyncio.run(slot())
+    assert first is not second
+
+    async def capped():
+        return await extractor._capped("reddit", lambda: asyncio.sleep(0, result="ok"))
+
+    assert asyncio.run(capped()) == "ok"       # a semaphore from a closed loop is never reused
+
+
+# ─────────────────────────────────────────────
+# SINGLE FLIGHT
+# ─────────────────────────────────────────────
+
+def test_single_flight_collapses_concurrent_calls():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["done"] * 3
+    assert len(calls) == 1
+
+
+def test_single_flight_survives_one_cancelled_caller():
+    async def main():
+        flight  = SingleFlight()
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.02)
+            return "done"
+
+        quitter = asyncio.create_task(flight.do("k", work))
+        stayer  = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        quitter.cancel()
+        assert await stayer == "done"
+        assert quitter.cancelled()
+
+    asyncio.run(main())
+
+
+def test_single_flight_cancels_work_when_every_caller_leaves():
+    async def main():
+        flight    = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert not flight.in_flight("k")
+
+    asyncio.run(main())
+
+
+def test_single_flight_ignores_task_from_another_loop():
+    flight = SingleFlight()
+
+    async def start():
+        asyncio.ensure_future(flight.do("k", lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        assert flight.in_flight("k")
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(start())        # left in flight on a loop that stops running
+
+    async def again():
+        assert not flight.in_flight("k")
+        return await flight.do("k", lambda: asyncio.sleep(0, result="fresh"))
+
+    assert asyncio.run(again()) == "fresh"
+
+    leftover = asyncio.all_tasks(loop)
+    for task in leftover:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*leftover, return_exceptions=True))
+    loop.close()
+
+
+# ─────────────────────────────────────────────
+# HTTP CACHE
+# ─────────────────────────────────────────────
+
+class _Http:
+    """Stands in for SharedHttpClient: replies from a list, records request headers."""
+
+    def __init__(self, *replies):
+        self.replies  = list(replies)
+        self.requests = []
+
+    async def get(self, url, headers=None, purpose=None, max_bytes=None):
+        self.requests.append(headers or {})
+        status, body, reply_headers = self.replies.pop(0)
+        payload = {"content": body} if isinstance(body, bytes) else {"text": body}
+        return httpx.Response(status, headers=reply_headers, request=httpx.Request("GET", url),
+                              **payload)
+
+
+@pytest.fixture
+def fetcher_for(tmp_path, monkeypatch):
+    monkeypatch.setattr(async_engine, "DOMAIN_LIMITER", KeyedRateLimiter(1000, 1000))
+
+    def make(*replies):
+        fetcher       = AsyncFetcher(http=_Http(*replies), use_cache=False)
+        fetcher.cache = HttpCache(tmp_path / "http", prune_every=0)
+        return fetcher
+    return make
+
+
+def _expire(cache: HttpCache, url: str):
+    entry = cache.get(url)
+    entry.fetched_at = time.time() - 30 * 24 * 3600
+    cache._write(url, entry)
+
+
+def test_cache_key_ignores_api_key(tmp_path):
+    cache = HttpCache(tmp_path)
+    assert cache._path("https://x.com/s?q=a&key=1") == cache._path("https://X.com/s?q=a&key=2")
+
+
+def test_fresh_entry_served_without_network(fetcher_for):
+    fetcher = fetcher_for((200, "csv", {"etag": '"v1"'}))
+    url     = "https://example.com/a.csv"
+    first   = asyncio.run(fetcher.get(url, purpose="github"))
+    second  = asyncio.run(fetcher.get(url, purpose="github"))
+    assert (first.text, first.from_cache) == ("csv", False)
+    assert (second.text, second.from_cache) == ("csv", True)
+    assert len(fetcher.http.requests) == 1
+
+
+def test_stale_entry_revalidates_with_304(fetcher_for):
+    fetcher = fetcher_for((200, "csv", {"etag": '"v1"', "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+                          (304, "", {}))
+    url = "https://example.com/a.csv"
+    asyncio.run(fetcher.get(url, purpose="github"))
+    _expire(fetcher.cache, url)
+
+    resp = asyncio.run(fetcher.get(url, purpose="github"))
+    assert (resp.status_code, resp.text, resp.from_cache) == (200, "csv", True)
+    assert fetcher.http.requests[1] == {"If-None-Match": '"v1"',
+                                        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert fetcher.cache.is_fresh(fetcher.cache.get(url), "github")
+
+
+def test_stale_entry_replaced_on_200(fetcher_for):
+    fetcher = fetcher_for((200, "old", {"etag": '"v1"'}), (200, "new", {"etag": '"v2"'}))
+    url = "https://example.com/a.csv"
+    asyncio.run(fetcher.get(url, purpose="github"))
+    _expire(fetcher.cache, url)
+    assert asyncio.run(fetcher.get(url, purpose="github")).text == "new"
+    assert fetcher.cache.get(url).etag == '"v2"'
+
+
+def test_uncacheable_purpose_and_capped_body_not_cached(fetcher_for):
+    fetcher = fetcher_for((200, "x" * 10, {}), (200, "y" * 10, {}))
+    asyncio.run(fetcher.get("https://example.com/p", purpose="probe"))
+    asyncio.run(fetcher.get("https://example.com/q", purpose="page", max_bytes=10))
+    assert fetcher.cache.get("https://example.com/p") is None
+    assert fetcher.cache.get("https://example.com/q") is None
+
+
+def test_prune_drops_least_recently_used(tmp_path):
+    cache = HttpCache(tmp_path / "http", max_entries=5, prune_every=0)
+    urls  = [f"https://example.com/{i}" for i in range(6)]
+    for age, url in zip(range(60, 0, -10), urls):
+        cache.put(url, "body", {})
+        past = time.time() - age
+        os.utime(cache._path(url), (past, past))
+    cache.get(urls[0])                          # oldest write, but just used
+
+    assert cache.prune() == {"idle": 0, "lru": 2}
+    kept = [u for u in urls if cache.get(u)]
+    assert kept == [urls[0], urls[3], urls[4], urls[5]]
+
+
+def test_prune_drops_idle_entries_and_respects_byte_cap(tmp_path):
+    cache = HttpCache(tmp_path / "http", max_bytes=10_000, max_idle=3600, prune_every=0)
+    cache.put("https://example.com/old", "x", {})
+    past = time.time() - 7200
+    os.utime(cache._path("https://example.com/old"), (past, past))
+    for i in range(4):
+        cache.put(f"https://example.com/{i}", "y" * 4000, {})
+
+    removed = cache.prune()
+    assert removed["idle"] == 1 and removed["lru"] >= 2
+    assert sum(p.stat().st_size for p in (tmp_path / "http").glob("*/*.json")) <= 9000
+
+
+# ─────────────────────────────────────────────
+# HTML EXTRACTION
+# ─────────────────────────────────────────────
+
+POST_LINE = "Entrevista técnica: 3 rounds, über Zürich — “graphs”"
+
+
+def _page(body: str, charset: str = "") -> str:
+    meta = f'<meta charset="{charset}">' if charset else ""
+    return f"<html><head>{meta}<title>t</title></head><body>{body}</body></html>"
+
+
+def test_html_bytes_decode_as_utf8_without_declared_charset():
+    page = _page(f"<nav>Home | Jobs | Salaries | Reviews</nav><p>{POST_LINE}</p>").encode()
+    assert content_extract.html_to_text(page) == POST_LINE
+
+
+def test_html_bytes_follow_meta_then_response_charset():
+    line = "Entretien à Paris: trois tours, très technique"
+    page = _page(f"<p>{line}</p>", "iso-8859-1").encode("latin-1")
+    assert content_extract.html_to_text(page) == line
+
+    bare = _page(f"<p>{line}</p>").encode("cp1252")
+    assert content_extract.html_to_text(bare, encoding="windows-1252") == line
+    assert content_extract.html_to_text(bare, encoding="no-such-charset") != line
+
+
+def test_html_extraction_stops_feeding_once_enough_is_collected(monkeypatch):
+    monkeypatch.setattr(content_extract, "FEED_CHUNK", 256)
+    page  = _page("".join(f"<p>{POST_LINE} #{i}</p>" for i in range(2000))).encode()
+    feeds = []
+    real  = content_extract.etree.HTMLParser
+
+    class CountingParser:
+        def __init__(self, **kwargs):
+            self._parser = real(**kwargs)
+
+        def feed(self, data):
+            feeds.append(data)
+            self._parser.feed(data)
+
+        def close(self):
+            return self._parser.close()
+
+    monkeypatch.setattr(content_extract.etree, "HTMLParser", CountingParser)
+    text = content_extract.html_to_text(page, max_lines=3)
+
+    assert text.splitlines() == [f"{POST_LINE} #{i}" for i in range(3)]
+    assert len(feeds) < 5 and len(page) > 100 * 256
+
+
+def test_fetcher_decodes_with_meta_charset_when_header_has_none(fetcher_for):
+    line    = "Entretien à Paris: trois tours, très technique"
+    fetcher = fetcher_for((200, _page(f"<p>{line}</p>", "iso-8859-1").encode("latin-1"),
+                           {"content-type": "text/html"}))
+    resp    = asyncio.run(fetcher.get("https://example.com/fr", purpose="page"))
+    assert content_extract.html_to_text(resp.text) == line
+
+
+# ─────────────────────────────────────────────
+# RATE LIMITS
+# ─────────────────────────────────────────────
+
+def test_token_bucket_burst_then_waits():
+    bucket = TokenBucket(rate=100, capacity=2)
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == pytest.approx(0.01, abs=0.005)
+
+
+def test_token_bucket_refunds_cancelled_waiter():
+    async def main():
+        bucket = TokenBucket(rate=1, capacity=1)
+        await bucket.acquire_async()
+        waiter = asyncio.create_task(bucket.acquire_async())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return bucket._reserve()
+
+    # Without the refund the next caller would wait ~2 s behind the cancelled one
+    assert asyncio.run(main()) < 1.05
+
+
+def test_keyed_rate_limiter_isolates_keys_and_applies_overrides():
+    limiter = KeyedRateLimiter(rate=1, capacity=1, overrides={"fast.com": (50, 5)})
+    assert limiter.bucket("a.com") is limiter.bucket("a.com")
+    assert limiter.bucket("a.com") is not limiter.bucket("b.com")
+    assert (limiter.bucket("fast.com").rate, limiter.bucket("fast.com").capacity) == (50, 5)
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(limiter.acquire_async("a.com"), limiter.acquire_async("b.com"))
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) < 0.1
+
+
+# ─────────────────────────────────────────────
+# DEADLINE
+# ─────────────────────────────────────────────
+
+def test_unlimited_deadline_never_caps():
+    deadline = Deadline(None)
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    assert deadline.cap(12.0) == 12.0
+
+
+def test_deadline_caps_step_timeouts_to_what_is_left():
+    deadline = Deadline(0.5)
+    assert deadline.cap(10.0) <= 0.5
+    assert deadline.cap(0.1) == 0.1
+
+
+def test_expired_deadline_caps_to_zero():
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    assert deadline.expired()
+    assert deadline.remaining() == 0.0
+    assert deadline.cap(5.0) == 0.0
+
+
+class _Driver:
+    """Stands in for a Chrome WebDriver whose page loads never finish in time."""
+
+    def __init__(self):
+        self.load_timeouts = []
+        self.scripts       = []
+        self.title         = "Interview questions"
+        self.page_source   = "<html><body><p>partial page</p></body></html>"
+
+    def set_page_load_timeout(self, timeout):
+        self.load_timeouts.append(timeout)
+
+    def get(self, url):
+        from selenium.common.exceptions import TimeoutException
+        raise TimeoutException("page load timed out")
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        return 1 if script == "return 1" else "complete"
+
+    def quit(self):
+        pass
+
+
+def test_browser_fetch_caps_page_load_to_the_deadline(monkeypatch):
+    from src.etl.browser_pool import BrowserPool
+    pool   = BrowserPool(max_size=1)
+    driver = _Driver()
+
+    def launch():
+        pool._uses[id(driver)] = 0
+        return driver
+    monkeypatch.setattr(pool, "_launch", launch)
+
+    html = pool.fetch_html("https://example.com", deadline=Deadline(2.0))
+    assert html == driver.page_source
+    assert 0 < driver.load_timeouts[0] <= 2.0
+    assert "window.stop();" in driver.scripts
+    assert pool._idle.qsize() == 1               # a slow page does not cost the warm session
+
+    expired = Deadline(0.01)
+    time.sleep(0.02)
+    with pytest.raises(TimeoutError):
+        pool.fetch_html("https://example.com", deadline=expired)
+    assert len(driver.load_timeouts) == 1
+
+
+# ─────────────────────────────────────────────
+# LEETCODE INDEX
+# ─────────────────────────────────────────────
+
+AMAZON_CSV = """ID,Title,Acceptance,Difficulty,Frequency,Leetcode Question Link
+1,Two Sum,46.7%,Easy,3.5,https://leetcode.com/problems/two-sum
+146,LRU Cache,35.2%,Medium,"4.1%",https://leetcode.com/problems/lru-cache
+
+,,,,,
+"""
+
+
+def test_parse_company_csv_with_header():
+    rows = parse_company_csv(AMAZON_CSV)
+    assert [r["title"] for r in rows] == ["Two Sum", "LRU Cache"]
+    assert rows[1] == {"id": 146, "title": "LRU Cache", "difficulty": "Medium", "frequency": 4.1,
+                       "acceptance": "35.2%", "url": "https://leetcode.com/problems/lru-cache"}
+
+
+def test_parse_company_csv_positional_and_junk_rows():
+    rows = parse_company_csv("42,Trapping Rain Water,55%,HARD,n/a,https://x\n7,123,1%,Easy,1,\n")
+    assert len(rows) == 1
+    assert (rows[0]["id"], rows[0]["difficulty"], rows[0]["frequency"]) == (42, "Hard", 0.0)
+
+
+def _tarball(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, text in files.items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_leetcode_index_sync_and_lookup(tmp_path, monkeypatch):
+    archive = _tarball({
+        "repo-master/amazon_alltime.csv":       AMAZON_CSV,
+        "repo-master/goldman_sachs_6months.csv": "1,Two Sum,1%,Easy,9,u\n",
+        "repo-master/README.md":                 "not a company file",
+    })
+
+    @contextlib.contextmanager
+    def stream(method, url, **kwargs):
+        yield httpx.Response(200, content=archive, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(leetcode_index.httpx, "stream", stream)
+    index = LeetCodeIndex(tmp_path / "index.sqlite")
+    assert not index.is_synced()
+    assert index.sync() == 3
+    assert index.sync() == 0                    # fresh — no second download
+
+    assert index.companies() == ["amazon", "goldman_sachs"]
+    assert [p["title"] for p in index.top_problems("amazon")] == ["LRU Cache", "Two Sum"]
+    assert index.top_problems("goldman_sachs", window="6months")[0]["frequency"] == 9.0
+    assert index.top_problems("goldman_sachs") == []
+    assert index.has_company("amazon") and not index.has_company("meta")
+
+
+def _synced_index(tmp_path, monkeypatch, files: dict) -> LeetCodeIndex:
+    archive = _tarball({f"repo-master/{name}": text for name, text in files.items()})
+
+    @contextlib.contextmanager
+    def stream(method, url, **kwargs):
+        yield httpx.Response(200, content=archive, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(leetcode_index.httpx, "stream", stream)
+    index = LeetCodeIndex(tmp_path / "index.sqlite")
+    index.sync()
+    return index
+
+
+def test_leetcode_companies_read_once_per_sync(tmp_path, monkeypatch):
+    index = _synced_index(tmp_path, monkeypatch, {"amazon_alltime.csv": AMAZON_CSV})
+    assert index.companies() == ["amazon"]
+
+    with index._connection() as conn:
+        conn.execute("INSERT INTO problems (company, time_window, title) VALUES ('meta', 'alltime', 'x')")
+    assert index.companies() == ["amazon"]          # cached until the next sync
+
+    # A sync from another process moves synced_at
+    with index._connection() as conn:
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'synced_at'", (str(time.time() + 1),))
+    assert index.companies() == ["amazon", "meta"]
+
+
+def test_index_lookup_fuzzy_matches_only_after_direct_keys_miss(tmp_path, monkeypatch, agent_health):
+    index = _synced_index(tmp_path, monkeypatch, {"amazon_alltime.csv": AMAZON_CSV})
+    scans = []
+    real  = index.companies
+    monkeypatch.setattr(index, "companies", lambda: scans.append(1) or real())
+    agent = extractor.GitHubCodingAgent()
+
+    assert agent._from_index(index, ["amazon"], "Amazon").status == "partial"
+    assert scans == []
+
+    assert agent._from_index(index, ["amazn"], "Amazn").status == "partial"
+    assert len(scans) == 1
+
+
+# ─────────────────────────────────────────────
+# COMPANY REGISTRY
+# ─────────────────────────────────────────────
+
+def test_canonical_name_snaps_near_misses_only():
+    assert canonical_name("  Goldman   SACHS ") == "goldman sachs"
+    assert canonical_name("Goldmann Sachs") == "goldman sachs"
+    assert canonical_name("Acme Robotics") == "acme robotics"
+    assert company_slug("J.P. Morgan") == "jp_morgan"
+    assert company_slug("Flipkrt") == "flipkart"
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Meta", "Facebook"),
+    ("JPMorgan Chase", "JP Morgan"),
+    ("J.P. Morgan", "jp morgan"),
+    ("Maximus-India", "Maximus India"),
+    ("D.E. Shaw", "DE Shaw"),
+    ("goldman_sachs", "Goldmann Sachs"),
+])
+def test_aliases_share_one_canonical_key(first, second):
+    assert canonical_name(first) == canonical_name(second)
+    assert company_slug(first) == company_slug(second)
+
+
+def test_slug_turns_hyphens_into_separator(tmp_path):
+    registry = CompanyRegistry(tmp_path / "registry.json")
+    assert company_slug("Maximus-India") == "maximus_india"
+    assert registry.candidates("Maximus_India", "ambitionbox") == ["maximus-india"]
+    assert registry.candidates("Maximus-India", "github") == ["maximus_india", "maximusindia"]
+
+
+def test_registry_candidates_per_source(tmp_path):
+    registry = CompanyRegistry(tmp_path / "registry.json")
+    assert registry.candidates("Meta", "github") == ["facebook", "meta"]
+    assert registry.candidates("Goldman Sachs", "github") == ["goldman_sachs", "goldmansachs"]
+    assert registry.candidates("Goldman Sachs", "ambitionbox") == ["goldman-sachs"]
+    with pytest.raises(ValueError):
+        registry.candidates("Meta", "glassdoor")
+
+
+def test_registry_resolution_persists(tmp_path):
+    CompanyRegistry(tmp_path / "registry.json").resolve("Goldmann Sachs", "github", "goldmansachs")
+    registry = CompanyRegistry(tmp_path / "registry.json")
+    assert registry.candidates("goldman sachs", "github") == ["goldmansachs"]
+    registry.resolve("Facebook", "ambitionbox", "meta-platforms")
+    assert registry.resolved("Meta", "ambitionbox") == "meta-platforms"
+    assert registry.identifier("Goldman Sachs", "ambitionbox") == "goldman-sachs"
+
+
+# ─────────────────────────────────────────────
+# NEAR-DUPLICATE REMOVAL
+# ─────────────────────────────────────────────
+
+EXPERIENCE = (
+    "I interviewed for the SDE role last month and the process had four rounds in total. "
+    "The online assessment had two medium problems on graphs and dynamic programming, "
+    "then a phone screen on arrays, followed by a system design round about a rate limiter "
+    "and finally a hiring manager round with behavioural questions about conflict."
+)
+
+
+def test_dedupe_drops_copies_across_sources_keeping_the_first():
+    extracted = {
+        "company":         "Acme",
+        "github_raw":      "Two Sum\nTwo Sum",
+        "reddit_raw":      f"=== POST ===\n{EXPERIENCE}",
+        "web_raw":         f"--- SOURCE: blog ---\n{EXPERIENCE.replace('last month', 'in March')}\n\n"
+                           "--- SOURCE: guide ---\n" + "Practise sliding window and heaps daily. " * 6,
+        "ambitionbox_raw": "",
+    }
+    out = dedupe_extracted(extracted)
+
+    assert EXPERIENCE in out["reddit_raw"]
+    assert "blog" not in out["web_raw"]             # its only passage was a copy — header goes too
+    assert "--- SOURCE: guide ---" in out["web_raw"]
+    assert out["github_raw"] == extracted["github_raw"]
+    assert out["dedup"]["dropped"] == 1
+    assert extracted["web_raw"].startswith("--- SOURCE: blog")     # input left untouched
+
+
+def test_dedupe_keeps_distinct_passages():
+    extracted = {"reddit_raw": EXPERIENCE, "web_raw": "Completely different advice on resumes. " * 8}
+    out = dedupe_extracted(extracted)
+    assert out["dedup"]["dropped"] == 0
+    assert EXPERIENCE in out["reddit_raw"]
+
+
+# ─────────────────────────────────────────────
+# RAW STORE
+# ─────────────────────────────────────────────
+
+def _extraction(reddit: str) -> dict:
+    return {
+        "company": "Goldman Sachs", "role": "SDE",
+        "github_raw": "Two Sum\nLRU Cache", "reddit_raw": reddit, "web_raw": "", "ambitionbox_raw": "",
+        "source_metadata": {"github": {"status": "ok", "reason": None, "char_count": 17},
+                            "reddit": {"status": "ok", "reason": None, "char_count": len(reddit)}},
+        "pipeline_ok": True,
+    }
+
+
+def test_raw_store_round_trip_shares_blobs(tmp_path):
+    store  = RawStore(tmp_path / "raw")
+    first  = store.record_run(_extraction("post one"))
+    second = store.record_run(_extraction("post two"))
+
+    loaded = store.load_run(first)
+    assert loaded["reddit_raw"] == "post one"
+    assert loaded["github_raw"] == "Two Sum\nLRU Cache"
+    assert loaded["source_metadata"]["reddit"]["char_count"] == 8
+    assert loaded["pipeline_ok"] is True
+
+    # github and the two empty fields are stored once across both runs
+    assert store.stats()["blobs"] == 4 and store.stats()["payloads"] == 8
+    assert {r["run_id"] for r in store.runs("goldman sachs", "sde")} == {first, second}
+    with pytest.raises(KeyError):
+        store.load_run("missing")
+
+
+def test_replay_loads_latest_stored_run(tmp_path, monkeypatch):
+    store  = RawStore(tmp_path / "raw")
+    run_id = store.record_run(_extraction("archived post"))
+    monkeypatch.setattr(build_schedule, "get_raw_store", lambda: store)
+
+    replayed = build_schedule._replayed_extraction("Goldman Sachs", "SDE", "latest")
+    assert replayed["run_id"] == run_id
+    assert replayed["reddit_raw"] == "archived post"
+    with pytest.raises(KeyError):
+        build_schedule._replayed_extraction("Goldman Sachs", "Data Scientist", "latest")
+
+
+# ─────────────────────────────────────────────
+# BATCH RUNNER
+# ─────────────────────────────────────────────
+
+def test_batch_roles_of_one_company_keep_separate_outputs(tmp_path, monkeypatch, llm_cache):
+    store = RawStore(tmp_path / "raw")
+    sources = {s: {"status": "ok", "reason": None, "char_count": 8}
+               for s in ("github", "reddit", "web", "ambitionbox")}
+    for role in ("SDE", "Analyst"):
+        store.record_run({**_extraction(f"{role} post"), "company": "Meta", "role": role,
+                          "source_metadata": sources, "sufficiency": {"sources_passing": 3}})
+
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    for module in (build_schedule, batch_runner, companies):
+        monkeypatch.setattr(module, "OUTPUTS_DIR", outputs)
+    monkeypatch.setattr(build_schedule, "get_raw_store", lambda: store)
+    monkeypatch.setattr(build_schedule, "run_great_filter",
+                        lambda extracted, mode: {"dsaTopics": [extracted["reddit_raw"].strip()]})
+    monkeypatch.setattr(batch_runner, "get_llm_cache", lambda: llm_cache)
+    monkeypatch.setattr(batch_runner, "get_leetcode_index",
+                        lambda: type("Index", (), {"sync": lambda self: None})())
+
+    report = batch_runner.run_batch([("Meta", "SDE"), ("Meta", "Analyst"), ("Facebook", "SDE")],
+                                    max_workers=3, replay="latest", filter_mode="rules")
+
+    assert report["succeeded"] == 2 and report["total"] == 2
+    assert report["skipped"][0]["company"] == "Facebook"
+    for role in ("SDE", "Analyst"):
+        path = companies.insights_path("Meta", role)
+        assert path.name == f"meta__{role.lower()}_insights.json"
+        assert json.loads(path.read_text())["dsaTopics"] == [f"{role} post"]
+
+
+def test_shared_sources_fetch_once_for_concurrent_role_runs():
+    shared, calls = extractor.SharedCompanySources(), []
+
+    def fetcher(data):
+        async def fetch():
+            calls.append(data)
+            await asyncio.sleep(0.05)
+            return extractor.SourceResult("github", data)
+        return fetch
+
+    async def role_runs():
+        # 'Facebook' and 'Meta' are one company — the SDE and Analyst runs join one fetch
+        return await asyncio.gather(shared.get("github", "Meta", fetcher("x" * 200)),
+                                    shared.get("github", "Facebook", fetcher("y" * 200)))
+
+    sde, analyst = asyncio.run(role_runs())
+    assert sde is analyst and len(calls) == 1
+
+    later = asyncio.run(shared.get("github", "meta", fetcher("z" * 200)))
+    assert later is sde and len(calls) == 1
+
+    # Unusable results are not shared — the next role run fetches again
+    asyncio.run(shared.get("ambitionbox", "Meta", fetcher("")))
+    asyncio.run(shared.get("ambitionbox", "Meta", fetcher("")))
+    assert len(calls) == 3
+
+
+def test_pairs_for_company_collects_every_role(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_runner, "INPUTS_DIR", tmp_path)
+    for name in ("meta_sde", "facebook_analyst", "amazon_sde"):
+        (tmp_path / f"{name}_queries.json").write_text("[]")
+
+    assert batch_runner.pairs_for_company("Meta") == [("Meta", "Analyst"), ("Meta", "SDE")]
+    assert batch_runner.pairs_for_company("Netflix") == [("Netflix", "SDE")]
+
+
+# ─────────────────────────────────────────────
+# PROMPT PACKING
+# ─────────────────────────────────────────────
+
+FILLER = "The weather in the city was pleasant and the coffee shop nearby was quiet. "
+
+
+def test_pack_sources_keeps_signal_within_budget():
+    extracted = {
+        "github_raw": "\n".join(f"Problem {i}" for i in range(100)),
+        "reddit_raw": DUMMY_REDDIT + "\n\n" + "\n\n".join(FILLER * 4 for _ in range(40)),
+        "web_raw":    FILLER * 3,
+    }
+    packed = pack_sources(extracted, budget=600)
+
+    assert packed["github_raw"].count("\n") == 79             # GITHUB_MAX_LINES prefix
+    assert "Round 4 system design" in packed["reddit_raw"]
+    assert "Title: Meta SDE Interview Experience" in packed["reddit_raw"]
+    assert packed["_stats"]["tokens_after"] <= 600
+    assert packed["_stats"]["tokens_before"] > 600
+    assert packed["reddit_raw"].count(FILLER.strip()) < 40 * 4
+
+
+def test_pack_sources_gives_every_source_its_best_passage():
+    extracted = {"reddit_raw": DUMMY_REDDIT, "web_raw": FILLER * 2, "ambitionbox_raw": ""}
+    packed    = pack_sources(extracted, budget=2000)
+    assert FILLER.strip() in packed["web_raw"]                 # no signal, but the only web passage
+    assert packed["ambitionbox_raw"] == ""
+    assert estimate_tokens(packed["reddit_raw"]) <= packed["_stats"]["tokens_after"]
+
+
+# ─────────────────────────────────────────────
+# MAP-REDUCE FILTERING
+# ─────────────────────────────────────────────
+
+def _partial(**overrides) -> dict:
+    partial = {"difficulty": "Medium", "avgRounds": 4, "interviewProcess": [], "dsaTopics": [],
+               "systemDesignTopics": [], "behavioralQuestions": []}
+    return {**partial, **overrides}
+
+
+def test_chunk_sources_spreads_signal_and_fits_budget():
+    posts = [f"=== POST ===\nTitle: Post {i}\nRound 1 was an online assessment with two medium "
+             f"graph problems and a sliding window question, round 2 was system design. " * 3
+             for i in range(30)]
+    extracted = {"github_raw": "\n".join(f"Problem {i}" for i in range(200)),
+                 "reddit_raw": "\n\n".join(posts)}
+    chunks = chunk_sources(extracted, budget=800, max_chunks=4)
+
+    assert len(chunks) == 4
+    assert [c["github_raw"].split("\n")[0] for c in chunks] == ["Problem 0", "Problem 80", "Problem 160", ""]
+    assert all(c["_stats"]["tokens_after"] <= 800 for c in chunks)
+    assert all("Round 1" in c["reddit_raw"] for c in chunks)
+
+
+def test_chunk_sources_without_signal_is_empty():
+    assert chunk_sources({"reddit_raw": "lorem ipsum dolor sit amet " * 3000}) == []
+
+
+def test_map_reduce_falls_back_to_single_prompt_without_chunks():
+    agent, prompts = GreatFilterAgent(), []
+
+    def call(prompt, label="", fill=None):
+        prompts.append(prompt)
+        return _partial()
+
+    agent._call = call
+    extracted   = {"company": "Acme", "role": "SDE", "reddit_raw": "lorem ipsum dolor sit amet " * 3000}
+    assert agent._map_reduce(extracted) == _partial()
+    assert len(prompts) == 1
+
+
+def test_merge_partials_unions_votes_and_takes_median():
+    merged = merge_partials([
+        _partial(difficulty="Hard", avgRounds=5, dsaTopics=["Two Sum", "LRU Cache"],
+                 interviewProcess=["Round 1: OA", "Round 2: coding"], enrichedInsights="short"),
+        _partial(difficulty="Hard", avgRounds=3, dsaTopics=["two sum", "Merge Intervals"],
+                 interviewProcess=["Round 1: OA with two mediums"], enrichedInsights="much longer text"),
+        _partial(difficulty="Medium", avgRounds=4, dsaTopics=["LRU cache!"]),
+    ], "Acme", "SDE")
+
+    assert (merged["company"], merged["role"]) == ("Acme", "SDE")
+    assert merged["difficulty"] == "Hard"
+    assert merged["avgRounds"] == 4
+    assert merged["dsaTopics"] == ["Two Sum", "LRU Cache", "Merge Intervals"]
+    assert merged["interviewProcess"] == ["Round 1: OA with two mediums", "Round 2: coding"]
+    assert merged["enrichedInsights"] == "much longer text"
+
+
+def test_merge_partials_difficulty_tie_goes_to_harder():
+    merged = merge_partials([_partial(difficulty="Easy"), _partial(difficulty="Medium")], "Acme", "SDE")
+    assert merged["difficulty"] == "Medium"
+
+
+# ─────────────────────────────────────────────
+# QUERY PLANNER
+# ─────────────────────────────────────────────
+
+class _Probe:
+    """Stands in for AsyncFetcher: status per URL, None meaning a connection error."""
+
+    def __init__(self, statuses: dict, default=404):
+        self.statuses = statuses
+        self.default  = default
+        self.purposes = []
+
+    async def _reply(self, url, purpose):
+        self.purposes.append(purpose)
+        status = self.statuses.get(url, self.default)
+        if status is None:
+            raise httpx.ConnectError("offline")
+        return async_engine.FetchResponse(url, status, "")
+
+    async def head(self, url, headers=None, purpose=None):
+        return await self._reply(url, purpose)
+
+    async def get(self, url, headers=None, purpose=None, max_bytes=None):
+        return await self._reply(url, purpose)
+
+
+@pytest.fixture
+def planner(tmp_path):
+    planner = QueryPlanner(inputs_dir=tmp_path / "inputs", state_dir=tmp_path / "state")
+    planner.api_key = None
+    (tmp_path / "inputs").mkdir()
+    seed = [{"site": "PrepInsta", "search_query": "acme", "initial_url_guess": "https://prepinsta.com/old/",
+             "url": "https://prepinsta.com/old/", "valid": True, "checked_at": 1}]
+    (tmp_path / "inputs" / "acme_sde_queries.json").write_text(json.dumps(seed))
+    return planner
+
+
+def test_planner_writes_state_outside_inputs(planner, tmp_path):
+    probe = _Probe({"https://prepinsta.com/acme/": 200})
+    urls  = asyncio.run(planner.plan("Acme", "SDE", probe))
+
+    assert urls == ["https://prepinsta.com/acme/"]
+    assert set(probe.purposes) == {"probe"}
+    assert json.loads((tmp_path / "inputs" / "acme_sde_queries.json").read_text())[0]["checked_at"] == 1
+    assert planner.load("Acme", "SDE")[0]["url"] == "https://prepinsta.com/acme/"
+
+
+def test_planner_marks_invalid_only_on_404(planner):
+    asyncio.run(planner.plan("Acme", "SDE", _Probe({}, default=410)))
+    query = planner.load("Acme", "SDE")[0]
+    assert query["valid"] is False and query["checked_at"] > 1
+
+
+def test_planner_keeps_previous_url_when_offline(planner):
+    for status in (None, 503):
+        assert asyncio.run(planner.plan("Acme", "SDE", _Probe({}, default=status))) == ["https://prepinsta.com/old/"]
+        query = planner.load("Acme", "SDE")[0]
+        assert (query["valid"], query["checked_at"]) == (True, 1)
+
+
+def test_planner_falls_back_to_capped_get_when_head_refused(planner):
+    class HeadRefused(_Probe):
+        async def head(self, url, headers=None, purpose=None):
+            return async_engine.FetchResponse(url, 405, "")
+
+    assert asyncio.run(planner.plan("Acme", "SDE", HeadRefused({}, default=200))) == ["https://prepinsta.com/old/"]
+
+
+# ─────────────────────────────────────────────
+# REDDIT AGENT
+# ─────────────────────────────────────────────
+
+class _Comments:
+    def replace_more(self, limit=None):
+        pass
+
+    def list(self):
+        return []
+
+
+class _Post:
+    def __init__(self, post_id: str, created: float, score: int = 50):
+        self.id          = post_id
+        self.created_utc = created
+        self.score       = score
+        self.title       = f"Interview {post_id}"
+        self.selftext    = f"Post {post_id}: online assessment, two rounds of coding, then a manager round. " * 2
+        self.comments    = _Comments()
+
+
+class _Reddit:
+    """Stands in for praw.Reddit: r/csMajors serves `posts`, every other subreddit is empty."""
+
+    def __init__(self, **kwargs):
+        self.posts    = []
+        self.searches = []
+
+    @property
+    def auth(self):
+        raise RuntimeError("no auth in tests")
+
+    def subreddit(self, name):
+        reddit = self
+
+        class Sub:
+            def search(self, query, sort, limit):
+                reddit.searches.append((name, sort))
+                if name != "csMajors":
+                    return []
+                posts = sorted(reddit.posts, key=lambda p: -(p.created_utc if sort == "new" else p.score))
+                return posts[:limit]
+        return Sub()
+
+
+@pytest.fixture
+def reddit_agent(tmp_path, monkeypatch):
+    import praw
+    monkeypatch.setattr(praw, "Reddit", _Reddit)
+    monkeypatch.setattr(extractor, "get_source_health", lambda: SourceHealth(tmp_path / "health.json"))
+    monkeypatch.setattr(extractor, "RedditWatermarkStore",
+                        lambda company: RedditWatermarkStore(company, root=tmp_path / "reddit"))
+
+    def make(posts, **kwargs):
+        agent = extractor.RedditExperienceAgent(**kwargs)
+        agent.reddit.posts = posts
+        return agent
+    return make
+
+
+def _force_full_crawl(tmp_path, role="SDE"):
+    path = tmp_path / "reddit" / "acme.json"
+    data = json.loads(path.read_text())
+    for mark in data["queries"][role.lower()].values():
+        mark["last_crawl"] = 0
+    path.write_text(json.dumps(data))
+
+
+def test_reddit_low_score_post_is_rechecked_on_full_recrawl(reddit_agent, tmp_path):
+    rising = _Post("rising", created=100, score=2)
+    agent  = reddit_agent([_Post("good", created=50), rising])
+    agent.extract("Acme", "SDE")
+    assert agent._store.is_seen("SDE", "csMajors", "rising")
+    assert not agent._store.in_corpus("SDE", "rising")
+
+    # Incremental run: nothing newer than the watermark, the rejected post stays skipped
+    agent = reddit_agent([_Post("good", created=50), rising])
+    agent.extract("Acme", "SDE")
+    assert agent._fresh == []
+
+    rising.score = 80
+    _force_full_crawl(tmp_path)
+    agent = reddit_agent([_Post("good", created=50), rising])
+    result = agent.extract("Acme", "SDE")
+    assert [post.id for _, post, _ in agent._fresh] == ["rising"]
+    assert "Post rising" in result.data and "Post good" in result.data     # good comes from the corpus
+
+
+def test_reddit_incremental_run_only_fetches_newer_posts(reddit_agent):
+    agent = reddit_agent([_Post("a", created=10), _Post("b", created=20)])
+    agent.extract("Acme", "SDE")
+    assert ("csMajors", "top") in agent.reddit.searches
+
+    agent = reddit_agent([_Post("a", created=10), _Post("b", created=20), _Post("c", created=30)])
+    result = agent.extract("Acme", "SDE")
+    assert ("csMajors", "top") not in agent.reddit.searches
+    assert [post.id for _, post, _ in agent._fresh] == ["c"]
+    assert all(f"Post {pid}" in result.data for pid in "abc")
+
+
+def test_reddit_buffer_cutoff_leaves_unhydrated_posts_for_later(reddit_agent):
+    posts = [_Post(f"p{i}", created=i) for i in range(1, 6)]
+    agent = reddit_agent(posts, parallel=False)
+    agent.TARGET_CHAR_COUNT = 1
+    result = agent.extract("Acme", "SDE")
+    assert result.status == "ok"
+    assert result.data.count("=== POST ===") == 1
+    hydrated = {post.id for _, post, _ in agent._fresh}
+    assert len(hydrated) == 2           # the post that overflowed the buffer still joins the corpus
+
+    agent = reddit_agent(posts, parallel=False)
+    agent.TARGET_CHAR_COUNT = 10_000
+    agent.extract("Acme", "SDE")
+    assert {post.id for _, post, _ in agent._fresh} == {p.id for p in posts} - hydrated
+
+
+def test_reddit_parallel_collection_stops_when_buffer_full(reddit_agent):
+    agent = reddit_agent([_Post(f"p{i}", created=i) for i in range(10)])
+    agent.TARGET_CHAR_COUNT = 1
+    result = agent.extract("Acme", "SDE")
+    assert result.data.count("=== POST ===") == 1
+    assert len(agent.reddit.searches) >= 1
+
+
+def test_reddit_rate_limit_wait_is_capped_by_the_deadline(reddit_agent, monkeypatch):
+    expired = Deadline(0.01)
+    time.sleep(0.02)
+    sleeps  = []
+    monkeypatch.setattr(extractor.time, "sleep", sleeps.append)
+    limits  = {"remaining": 0, "reset_timestamp": time.time() + 60}
+
+    for deadline in (Deadline(0.5), expired):
+        agent = reddit_agent([], deadline=deadline)
+        agent.reddit = type("Reddit", (), {"auth": type("Auth", (), {"limits": limits})})()
+        agent._respect_rate_limit()
+
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= 0.5       # the expired run does not wait at all
+
+
+def test_watermark_saves_merge_concurrent_roles(tmp_path):
+    sde = RedditWatermarkStore("Amazon", root=tmp_path)
+    se  = RedditWatermarkStore("Amazon", root=tmp_path)
+    sde.mark_crawled("SDE", "csMajors", {"a": 1.0}, newest_created=1.0, full=True)
+    sde.record_post("SDE", "csMajors", "a", 10, 1.0, "text a")
+    se.mark_crawled("SE", "csMajors", {"b": 2.0}, newest_created=2.0, full=True)
+    se.record_post("SE", "csMajors", "b", 10, 2.0, "text b")
+    sde.save()
+    se.save()
+
+    fresh = RedditWatermarkStore("Amazon", root=tmp_path)
+    assert fresh.in_corpus("SDE", "a") and fresh.in_corpus("SE", "b")
+    assert fresh.is_seen("SDE", "csMajors", "a") and fresh.is_seen("SE", "csMajors", "b")
+
+
+def test_watermark_seen_ids_cap_drops_oldest(tmp_path, monkeypatch):
+    monkeypatch.setattr(RedditWatermarkStore, "MAX_SEEN_IDS", 3)
+    store = RedditWatermarkStore("Acme", root=tmp_path)
+    store.mark_crawled("SDE", "csMajors", {"old": 1.0, "new": 9.0})
+    store.mark_crawled("SDE", "csMajors", {"mid": 5.0, "newer": 8.0})
+    assert list(store.watermark("SDE", "csMajors")["seen_ids"]) == ["new", "newer", "mid"]
+    assert store.newest_created("SDE", "csMajors") == 0.0       # incremental marks keep the old watermark
+
+
+# ─────────────────────────────────────────────
+# MULTI-AGENT EXTRACTION
+# ─────────────────────────────────────────────
+
+class _Agent:
+    """Scripted agent: finishes after `delay` seconds with `chars` characters of data."""
+
+    def __init__(self, source: str, delay: float, chars: int, log: list):
+        self.source, self.delay, self.chars, self.log = source, delay, chars, log
+
+    async def extract_async(self, *args):
+        self.log.append(("start", self.source))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.log.append(("cancelled", self.source))
+            raise
+        status = "ok" if self.chars else "failed"
+        return extractor.SourceResult(self.source, "x" * self.chars, status)
+
+
+class _NoFetcher:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def extraction(monkeypatch):
+    """make(**{source: (delay, chars)}) → (run(**options) → extraction dict, event log)."""
+    monkeypatch.setattr(extractor, "AsyncFetcher", _NoFetcher)
+    monkeypatch.setattr(extractor, "SHARED_SOURCES", extractor.SharedCompanySources())
+
+    def make(**script):
+        log    = []
+        agents = {key: _Agent(key, *script[key], log) for key in script}
+        monkeypatch.setattr(extractor, "_build_agents", lambda deadline: (dict(agents), {}))
+
+        def run(**options):
+            started = time.monotonic()
+            result  = asyncio.run(extractor.run_multi_agent_extraction_async("Acme", "SDE", **options))
+            result["elapsed"] = time.monotonic() - started
+            return result
+        return run, log
+    return make
+
+
+def test_speculative_ambitionbox_cancelled_once_reddit_and_web_are_usable(extraction):
+    run, log = extraction(github=(0.01, 300), reddit=(0.02, 500), web=(0.03, 900),
+                          ambitionbox=(5.0, 600))
+    result = run()
+
+    assert ("start", "ambitionbox") in log and ("cancelled", "ambitionbox") in log
+    assert result["source_metadata"]["ambitionbox"]["status"] == "skipped"
+    assert result["pipeline_ok"] and result["elapsed"] < 1.0
+
+
+def test_speculative_ambitionbox_result_used_when_reddit_is_weak(extraction):
+    run, log = extraction(github=(0.05, 300), reddit=(0.01, 0), web=(0.01, 0),
+                          ambitionbox=(0.02, 600))
+    result = run()
+
+    assert log.count(("start", "ambitionbox")) == 1      # started up front, not relaunched
+    assert result["ambitionbox_raw"] == "x" * 600
+    assert result["sufficiency"]["details"]["ambitionbox"] == "✅ compensating source"
+    assert result["pipeline_ok"]
+
+
+def test_ambitionbox_not_started_without_speculation_when_sources_are_strong(extraction):
+    run, log = extraction(github=(0.01, 300), reddit=(0.01, 500), web=(0.01, 900),
+                          ambitionbox=(0.01, 600))
+    result = run(speculative_ambitionbox=False)
+
+    assert ("start", "ambitionbox") not in log
+    assert result["source_metadata"]["ambitionbox"]["reason"] == "Reddit and Web were sufficient"
+
+
+def test_incremental_sufficiency_passes_at_two_sources_and_quality_bar():
+    gate = extractor.IncrementalSufficiency(min_total_chars=1000)
+    gate.feed(extractor.SourceResult("github", "x" * 300))
+    assert not gate.gate_passed()
+
+    gate.feed(extractor.SourceResult("reddit", "x" * 500))
+    assert gate.gate_passed() and not gate.quality_met() and not gate.satisfied()
+
+    gate.feed(extractor.SourceResult("web", "x" * 300))          # under the web threshold
+    assert gate.report["sources_passing"] == 2 and gate.satisfied()
+
+
+def test_fast_mode_returns_once_the_gate_passes(extraction):
+    run, log = extraction(github=(0.01, 300), reddit=(0.02, 500), web=(5.0, 900),
+                          ambitionbox=(5.0, 600))
+    result = run(mode="fast")
+
+    info = result["extraction"]
+    assert info["early_exit"] and info["unfinished"] == ["web"]
+    assert result["source_metadata"]["web"]["status"] == "skipped"
+    assert result["source_metadata"]["ambitionbox"]["status"] == "skipped"
+    assert result["pipeline_ok"] and result["elapsed"] < 1.0
+
+
+def test_fast_mode_waits_for_the_quality_bar(extraction):
+    run, log = extraction(github=(0.01, 300), reddit=(0.02, 500), web=(0.1, 900),
+                          ambitionbox=(5.0, 600))
+    result = run(mode="fast", min_total_chars=1500)
+
+    assert not result["extraction"]["early_exit"]
+    assert result["web_raw"] == "x" * 900
+    assert ("cancelled", "web") not in log
+
+
+def test_full_mode_rejects_unknown_mode(extraction):
+    run, _ = extraction(github=(0.01, 300))
+    with pytest.raises(ValueError):
+        run(mode="turbo")
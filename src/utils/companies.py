@@ -0,0 +1,230 @@
+import os
+import re
+import json
+import difflib
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.paths import DATA_DIR, OUTPUTS_DIR
+
+
+COMPANY_REGISTRY_PATH = DATA_DIR / "cache" / "company_registry.json"
+
+
+# ─────────────────────────────────────────────
+# KNOWN COMPANIES
+# ─────────────────────────────────────────────
+
+# Lowercase name/alias → file key in the LeetCode-Questions-CompanyWise repo
+COMPANY_ALIASES = {
+    "jp morgan":      "jpmorgan",
+    "j.p. morgan":    "jpmorgan",
+    "jpmorgan chase": "jpmorgan",
+    "facebook":       "facebook",
+    "meta":           "facebook",      # repo uses 'facebook', not 'meta'
+    "microsoft":      "microsoft",
+    "google":         "google",
+    "amazon":         "amazon",
+    "goldman sachs":  "goldman_sachs",
+    "de shaw":        "de_shaw",
+    "d.e. shaw":      "de_shaw",
+    "thoughtworks":   "thoughtworks",
+    "flipkart":       "flipkart",
+    "adobe":          "adobe",
+    "oracle":         "oracle",
+    "uber":           "uber",
+    "linkedin":       "linkedin",
+    "atlassian":      "atlassian",
+    "samsung":        "samsung",
+    "cisco":          "cisco",
+    "infosys":        "infosys",
+    "tcs":            "tcs",
+    "wipro":          "wipro",
+    "razorpay":       "razorpay",
+    "swiggy":         "swiggy",
+    "zomato":         "zomato",
+    "paytm":          "paytm",
+    "apple":          "apple",
+    "netflix":        "netflix",
+    "twitter":        "twitter",
+    "airbnb":         "airbnb",
+    "lyft":           "lyft",
+    "salesforce":     "salesforce",
+    "bloomberg":      "bloomberg",
+    "intuit":         "intuit",
+    "snapchat":       "snapchat",
+    "spotify":        "spotify",
+    "vmware":         "vmware",
+    "paypal":         "paypal",
+    "nvidia":         "nvidia",
+    "yelp":           "yelp",
+    "dropbox":        "dropbox",
+    "quora":          "quora",
+}
+
+# The one name a company is known by when its file key is not simply the
+# key with spaces. Every alias of the same key canonicalises to this name.
+CANONICAL_NAMES = {
+    "facebook": "meta",
+    "jpmorgan": "jp morgan",
+}
+
+# Where AmbitionBox's slug differs from the hyphenated canonical name
+AMBITIONBOX_SLUGS: Dict[str, str] = {}
+
+SOURCES      = ("github", "ambitionbox", "gfg")
+FUZZY_CUTOFF = 0.85
+
+
+# ─────────────────────────────────────────────
+# SLUG HELPERS
+# ─────────────────────────────────────────────
+
+def _clean(name: str) -> str:
+    """Lowercase, single-spaced; hyphens and underscores count as spaces ('Maximus-India')."""
+    return " ".join(re.sub(r"[-_]+", " ", name.lower()).split())
+
+
+def _slug(name: str, sep: str) -> str:
+    return re.sub(r"[\s\-_]+", sep, _clean(name).replace(".", ""))
+
+
+def _canonical_for_key(key: str) -> str:
+    return CANONICAL_NAMES.get(key, key.replace("_", " "))
+
+
+def closest_name(name: str, candidates: Iterable[str], cutoff: float = FUZZY_CUTOFF) -> Optional[str]:
+    """Best fuzzy match for `name` among `candidates`, or None below `cutoff`."""
+    matches = difflib.get_close_matches(name, list(candidates), n=1, cutoff=cutoff)
+    return matches[0] if matches else None
+
+
+@lru_cache(maxsize=1024)
+def canonical_name(company: str) -> str:
+    """
+    Lowercase canonical name, one per company. Every alias of a known company
+    maps to the same name ('Facebook' and 'Meta' → 'meta'); near-misses
+    ('Goldmann Sachs', 'Flipkrt') snap to the closest known alias first;
+    anything else is returned cleaned but unchanged.
+    """
+    cleaned = _clean(company)
+    alias   = cleaned if cleaned in COMPANY_ALIASES else closest_name(cleaned, COMPANY_ALIASES)
+    return _canonical_for_key(COMPANY_ALIASES[alias]) if alias else cleaned
+
+
+def company_slug(company: str) -> str:
+    """File key for everything under data/outputs and data/cache — 'Goldman Sachs' → 'goldman_sachs'."""
+    return _slug(canonical_name(company), "_")
+
+
+def output_key(company: str, role: str) -> str:
+    """
+    File key for one company/role run — ('Amazon', 'SDE') → 'amazon__sde'.
+    Slugs never contain '__', so the company part is always recoverable.
+    """
+    return f"{company_slug(company)}__{_slug(role, '_')}"
+
+
+def insights_path(company: str, role: Optional[str] = None) -> Path:
+    """
+    The pipeline's insights file for `company`/`role`. Without a role, the most
+    recently written role file for the company; older company-only files
+    ({slug}_insights.json) are still found when no role file exists.
+    """
+    slug = company_slug(company)
+    if role:
+        path = OUTPUTS_DIR / f"{output_key(company, role)}_insights.json"
+        return path if path.exists() else OUTPUTS_DIR / f"{slug}_insights.json"
+    found = sorted(OUTPUTS_DIR.glob(f"{slug}__*_insights.json"), key=lambda p: p.stat().st_mtime)
+    return found[-1] if found else OUTPUTS_DIR / f"{slug}_insights.json"
+
+
+# ─────────────────────────────────────────────
+# COMPANY REGISTRY
+# ─────────────────────────────────────────────
+
+class CompanyRegistry:
+    """
+    Per-source identifiers for a company, plus a persisted record of which
+    identifier each source actually answered to.
+
+    Before a source has resolved, `candidates()` lists every identifier worth
+    trying (alias, underscored, squashed). Once an agent reports a hit via
+    `resolve()`, later runs get only that identifier — no more 404 probing.
+    Only positive resolutions are stored; a miss today may exist tomorrow.
+
+    File layout (data/cache/company_registry.json):
+      {"<canonical name>": {"github": "goldman_sachs", "ambitionbox": "goldman-sachs"}}
+    """
+
+    def __init__(self, path: Path = COMPANY_REGISTRY_PATH):
+        self.path  = Path(path)
+        self._lock = threading.Lock()
+        self._resolved: Optional[Dict[str, Dict[str, str]]] = None
+
+    def _data(self) -> Dict[str, Dict[str, str]]:
+        if self._resolved is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._resolved = json.load(f)
+            except (OSError, ValueError):
+                self._resolved = {}
+        return self._resolved
+
+    # ── Identifiers ───────────────────────────────────────────
+
+    def resolved(self, company: str, source: str) -> Optional[str]:
+        with self._lock:
+            return self._data().get(canonical_name(company), {}).get(source)
+
+    def candidates(self, company: str, source: str) -> List[str]:
+        """Identifiers to try for `source`, best first. Just one once resolved."""
+        known = self.resolved(company, source)
+        if known:
+            return [known]
+
+        name = canonical_name(company)
+        if source == "github":
+            variants = [COMPANY_ALIASES.get(name), _slug(name, "_").replace("-", "_"),
+                        re.sub(r"[\s.\-]", "", name)]
+        elif source == "ambitionbox":
+            variants = [AMBITIONBOX_SLUGS.get(name), _slug(name, "-")]
+        elif source == "gfg":
+            variants = [_slug(name, "-")]
+        else:
+            raise ValueError(f"Unknown source '{source}', expected one of {SOURCES}")
+        return [v for v in dict.fromkeys(variants) if v]
+
+    def identifier(self, company: str, source: str) -> str:
+        return self.candidates(company, source)[0]
+
+    # ── Resolution cache ──────────────────────────────────────
+
+    def resolve(self, company: str, source: str, identifier: str):
+        """Records that `source` answered to `identifier` for this company."""
+        name = canonical_name(company)
+        with self._lock:
+            entry = self._data().setdefault(name, {})
+            if entry.get(source) == identifier:
+                return
+            entry[source] = identifier
+            self._save()
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._resolved, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+_registry: Optional[CompanyRegistry] = None
+
+
+def get_company_registry() -> CompanyRegistry:
+    global _registry
+    if _registry is None:
+        _registry = CompanyRegistry()
+    return _registry
@@ -0,0 +1,194 @@
+import os
+import time
+import threading
+from typing import Callable, Dict, Optional
+
+from src.utils.rate_limit import TokenBucket
+from src.utils.llm_cache  import get_llm_cache
+from src.utils.json_stream import JsonObjectStream, StreamError, parse_json_object
+
+
+# ─────────────────────────────────────────────
+# GLOBAL GEMINI RATE LIMIT
+# ─────────────────────────────────────────────
+
+# Requests per minute allowed across every thread in the process.
+# Batch runs share this budget, so parallel pipelines never trip the API quota.
+GEMINI_RPM   = float(os.getenv("GEMINI_RPM", "15"))
+GEMINI_BURST = float(os.getenv("GEMINI_BURST", "3"))
+
+GEMINI_LIMITER = TokenBucket(rate=GEMINI_RPM / 60.0, capacity=GEMINI_BURST)
+
+# Streamed JSON calls: on by default, retried this many times when aborted early
+GEMINI_STREAM          = os.getenv("GEMINI_STREAM", "1") != "0"
+GEMINI_STREAM_ATTEMPTS = int(os.getenv("GEMINI_STREAM_ATTEMPTS", "2"))
+
+
+# ─────────────────────────────────────────────
+# LAZY CLIENT SETUP
+# ─────────────────────────────────────────────
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def get_model(name: str):
+    """
+    genai.GenerativeModel(name), importing and configuring the SDK on first use.
+    Modules that only might call Gemini stay cheap to import.
+    """
+    global _configured
+    import google.generativeai as genai
+
+    with _configure_lock:
+        if not _configured:
+            from dotenv import load_dotenv
+            load_dotenv()
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            _configured = True
+    return genai.GenerativeModel(name)
+
+
+# ─────────────────────────────────────────────
+# RATE-LIMITED CALLS
+# ─────────────────────────────────────────────
+
+def generate_content(model, prompt: str, **kwargs):
+    """
+    model.generate_content behind the process-wide rate limit.
+    Blocks the calling thread until a request slot is free.
+    """
+    GEMINI_LIMITER.acquire()
+    return model.generate_content(prompt, **kwargs)
+
+
+def model_name(model) -> str:
+    return getattr(model, "model_name", type(model).__name__)
+
+
+class ResponseBlocked(Exception):
+    """The model returned no text — a safety block, recitation stop or empty candidate."""
+
+
+def response_text(response) -> str:
+    """response.text, with the SDK's ValueError for a text-less candidate made explicit."""
+    try:
+        return response.text
+    except ValueError as e:
+        candidates = getattr(response, "candidates", None) or []
+        reason     = getattr(candidates[0], "finish_reason", None) if candidates else None
+        feedback   = getattr(response, "prompt_feedback", None)
+        raise ResponseBlocked(f"No text in response (finish_reason={reason}, "
+                              f"prompt_feedback={feedback}): {e}") from None
+
+
+def generate_text(model, prompt: str, use_cache: bool = True, **kwargs) -> str:
+    """
+    Response text for `prompt`, served from the LLM response cache when the
+    same model has already answered the same (normalized) prompt.
+    Only misses spend a rate-limit slot and tokens.
+    """
+    cache = get_llm_cache() if use_cache else None
+    name  = model_name(model)
+
+    if cache:
+        cached = cache.get(name, prompt)
+        if cached is not None:
+            print(f"[Gemini] ⚡ Cache hit for {name} ({len(prompt)} char prompt)")
+            return cached
+
+    text = response_text(generate_content(model, prompt, **kwargs))
+    if cache:
+        cache.put(name, prompt, text)
+    return text
+
+
+# ─────────────────────────────────────────────
+# STREAMED JSON CALLS
+# ─────────────────────────────────────────────
+
+Checks = Optional[Dict[str, Callable]]
+
+
+class StreamAborted(Exception):
+    """Every streamed attempt was malformed or failed a field check."""
+
+    def __init__(self, reason: str, preview: str = "", invalid_json: bool = True):
+        super().__init__(reason)
+        self.reason       = reason
+        self.preview      = preview
+        self.invalid_json = invalid_json
+
+
+def _run_checks(kind: str, key: str, value, field_checks: Checks, item_checks: Checks):
+    checks = item_checks if kind == "item" else field_checks
+    if checks and key in checks:
+        checks[key](value)
+
+
+def _check_object(result: dict, field_checks: Checks, item_checks: Checks):
+    """The same checks a stream runs, applied to an already-complete object."""
+    for key, value in result.items():
+        if isinstance(value, list):
+            for item in value:
+                _run_checks("item", key, item, field_checks, item_checks)
+        _run_checks("field", key, value, field_checks, item_checks)
+
+
+def generate_json(model, prompt: str, field_checks: Checks = None, item_checks: Checks = None,
+                  use_cache: bool = True, max_attempts: int = GEMINI_STREAM_ATTEMPTS) -> dict:
+    """
+    Streams a JSON-object response and parses it as it arrives.
+
+    field_checks[key](value) runs the moment a top-level field closes and
+    item_checks[key](item) for each element of a top-level array; either may
+    raise ValueError. A structural error or failed check abandons the stream
+    right away (no paying for the rest of a broken completion) and the call is
+    retried up to `max_attempts` times before StreamAborted is raised.
+    A chunk with no text (blocked or empty candidate) raises ResponseBlocked
+    at once. Complete responses go into the LLM cache like generate_text(),
+    and cached hits must pass the same checks.
+    """
+    cache = get_llm_cache() if use_cache else None
+    name  = model_name(model)
+
+    if cache:
+        cached = cache.get(name, prompt)
+        if cached is not None:
+            try:
+                result = parse_json_object(cached)
+                _check_object(result, field_checks, item_checks)
+                print(f"[Gemini] ⚡ Cache hit for {name} ({len(prompt)} char prompt)")
+                return result
+            except ValueError:
+                cache.discard(name, prompt)
+
+    failure = None
+    for attempt in range(1, max_attempts + 1):
+        stream = JsonObjectStream()
+        GEMINI_LIMITER.acquire()
+        started, first_field = time.monotonic(), None
+        try:
+            for chunk in model.generate_content(prompt, stream=True):
+                for kind, key, value in stream.feed(response_text(chunk)):
+                    _run_checks(kind, key, value, field_checks, item_checks)
+                    if first_field is None and kind == "field":
+                        first_field = time.monotonic() - started
+                if stream.done:
+                    break
+            result = stream.close()
+        except StreamError as e:
+            failure = StreamAborted(str(e), stream.text[:500], invalid_json=True)
+        except ValueError as e:
+            failure = StreamAborted(str(e), stream.text[:500], invalid_json=False)
+        else:
+            if cache:
+                cache.put(name, prompt, stream.text)
+            print(f"[Gemini] Streamed {len(stream.text)} chars in {time.monotonic() - started:.1f}s "
+                  f"(first field after {first_field or 0:.1f}s)")
+            return result
+
+        print(f"[Gemini] ⚠️ Stream aborted after {len(stream.text)} chars "
+              f"(attempt {attempt}/{max_attempts}): {failure.reason}")
+
+    raise failure
@@ -0,0 +1,88 @@
+import sys
+import json
+import argparse
+import subprocess
+
+from src.utils.paths import PROJECT_ROOT
+
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+
+# Entry points that must start fast, with the budget each one gets (seconds)
+TARGETS = {
+    "src.recommendation.app":              1.0,
+    "src.recommendation.core.rescheduler": 1.0,
+    "src.analytics.analytics_agent":       1.0,
+    "src.etl.extractor":                   2.0,
+    "src.integration.build_schedule":      2.0,
+}
+
+# Modules that should only load when their code path actually runs
+HEAVY_MODULES = ("selenium", "webdriver_manager", "praw", "google.generativeai")
+
+# Runs in a fresh interpreter so nothing is already in sys.modules
+_PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+# ─────────────────────────────────────────────
+# BENCHMARK
+# ─────────────────────────────────────────────
+
+def measure(module: str, repeats: int = 3) -> dict:
+    """Best-of-`repeats` cold import time of `module`, plus any heavy modules it dragged in."""
+    runs = []
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=PROJECT_ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1]}
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda r: r["seconds"])
+    return {"module": module, "seconds": round(best["seconds"], 3), "heavy": best["heavy"]}
+
+
+def run_benchmark(targets: dict = TARGETS, repeats: int = 3) -> bool:
+    """Prints a table and returns True when every target is within budget and heavy-free."""
+    print(f"\n{'─'*72}")
+    print(f" IMPORT-TIME BENCHMARK (best of {repeats}, fresh interpreter each)")
+    print(f"{'─'*72}")
+
+    all_ok = True
+    for module, budget in targets.items():
+        result = measure(module, repeats)
+        if "error" in result:
+            all_ok = False
+            print(f"  ❌ {module:<38} failed: {result['error']}")
+            continue
+        ok = result["seconds"] <= budget and not result["heavy"]
+        all_ok &= ok
+        heavy = f"  loads {result['heavy']}" if result["heavy"] else ""
+        print(f"  {'✅' if ok else '⚠️'} {module:<38} {result['seconds']:>6.3f}s / {budget:.1f}s{heavy}")
+
+    print(f"{'─'*72}\n")
+    return all_ok
+
+
+# ─────────────────────────────────────────────
+# ENTRYPOINT
+# ─────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold import time of the app's entry points.")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: all entry points)")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    targets = {m: TARGETS.get(m, 1.0) for m in args.modules} if args.modules else TARGETS
+    sys.exit(0 if run_benchmark(targets, args.repeats) else 1)
@@ -0,0 +1,194 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# ─────────────────────────────────────────────
+# INCREMENTAL JSON OBJECT PARSER
+# ─────────────────────────────────────────────
+
+_WHITESPACE = " \t\r\n"
+
+# Characters tolerated before the opening brace (a ```json fence and blank lines)
+MAX_PREAMBLE = 16
+
+
+class StreamError(ValueError):
+    """The streamed text cannot be (or has stopped being) one JSON object."""
+
+
+class JsonObjectStream:
+    """
+    Parses one top-level JSON object as it arrives in chunks.
+
+    feed() returns the events completed by the new text:
+      ("field", key, value) — a top-level field has closed
+      ("item",  key, value) — an element of a top-level array field has closed
+    so callers can validate each field the moment it is complete, long before
+    the closing brace. A leading markdown fence is skipped; anything else that
+    is not JSON raises StreamError immediately. close() checks the object was
+    finished and returns it.
+    """
+
+    def __init__(self):
+        self.text   = ""
+        self.result: Dict[str, Any] = {}
+        self._pos   = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._start = 0           # where the current key or value began
+        self._item: Optional[int] = None
+        self._depth = 0
+        self._array = False       # current value is a top-level array
+        self._in_string = False
+        self._escape    = False
+
+    # ── Public API ────────────────────────────────────────────
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        self.text += chunk
+        events: List[Tuple[str, str, Any]] = []
+        while self._pos < len(self.text):
+            if not self._step(self.text[self._pos], events):
+                break
+        return events
+
+    def close(self) -> Dict[str, Any]:
+        if self._state != "done":
+            raise StreamError(f"Response ended inside the JSON object (state: {self._state})")
+        return self.result
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    # ── Scanner ───────────────────────────────────────────────
+
+    def _load(self, start: int, end: int) -> Any:
+        try:
+            return json.loads(self.text[start:end])
+        except ValueError as e:
+            raise StreamError(f"Invalid JSON value for '{self._key}': {e}") from None
+
+    def _string_char(self, ch: str) -> bool:
+        """Advances through a string; returns True on its closing quote."""
+        if self._escape:
+            self._escape = False
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            return True
+        return False
+
+    def _emit_field(self, value: Any, events: list):
+        self.result[self._key] = value
+        events.append(("field", self._key, value))
+        self._state = "after_value"
+
+    def _emit_item(self, end: int, events: list):
+        if self._item is not None:
+            events.append(("item", self._key, self._load(self._item, end)))
+            self._item = None
+
+    def _step(self, ch: str, events: list) -> bool:
+        """Consumes one character. Returns False when more text is needed first."""
+        state = self._state
+
+        if state == "start":
+            if ch in _WHITESPACE:
+                pass
+            elif ch == "`":
+                newline = self.text.find("\n", self._pos)
+                if newline == -1:
+                    if len(self.text) - self._pos > MAX_PREAMBLE:
+                        raise StreamError("Expected a JSON object, got a long preamble")
+                    return False
+                self._pos = newline
+            elif ch == "{":
+                self._state = "key_or_end"
+            else:
+                raise StreamError(f"Expected '{{' to open the JSON object, got {ch!r}")
+
+        elif state == "key_or_end":
+            if ch == '"':
+                self._state, self._start, self._in_string = "key", self._pos, True
+            elif ch == "}":
+                self._state = "done"
+            elif ch not in _WHITESPACE:
+                raise StreamError(f"Expected a field name, got {ch!r}")
+
+        elif state == "key":
+            if self._string_char(ch):
+                self._key   = self._load(self._start, self._pos + 1)
+                self._state = "colon"
+
+        elif state == "colon":
+            if ch == ":":
+                self._state = "value_start"
+            elif ch not in _WHITESPACE:
+                raise StreamError(f"Expected ':' after '{self._key}', got {ch!r}")
+
+        elif state == "value_start":
+            if ch in _WHITESPACE:
+                pass
+            elif ch in "{[":
+                self._state, self._start, self._depth = "container", self._pos, 1
+                self._array, self._item = ch == "[", None
+            elif ch == '"':
+                self._state, self._start, self._in_string = "string", self._pos, True
+            elif ch in "-0123456789tfn":
+                self._state, self._start = "scalar", self._pos
+            else:
+                raise StreamError(f"Unexpected {ch!r} at the start of '{self._key}'")
+
+        elif state == "string":
+            if self._string_char(ch):
+                self._emit_field(self._load(self._start, self._pos + 1), events)
+
+        elif state == "scalar":
+            if ch in _WHITESPACE + ",}":
+                self._emit_field(self._load(self._start, self._pos), events)
+                return True         # the terminator is handled by after_value
+
+        elif state == "container":
+            self._container_char(ch, events)
+
+        elif state == "after_value":
+            if ch == ",":
+                self._state = "key_or_end"
+            elif ch == "}":
+                self._state = "done"
+            elif ch not in _WHITESPACE:
+                raise StreamError(f"Expected ',' or '}}' after '{self._key}', got {ch!r}")
+
+        self._pos += 1
+        return True
+
+    def _container_char(self, ch: str, events: list):
+        top = self._array and self._depth == 1      # directly inside a top-level array
+
+        if self._in_string:
+            self._string_char(ch)
+            return
+        if top and self._item is None and ch not in _WHITESPACE + ",]":
+            self._item = self._pos
+
+        if ch == '"':
+            self._in_string = True
+        elif ch in "{[":
+            self._depth += 1
+        elif ch == "," and top:
+            self._emit_item(self._pos, events)
+        elif ch in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                if self._array:
+                    self._emit_item(self._pos, events)
+                self._emit_field(self._load(self._start, self._pos + 1), events)
+
+
+def parse_json_object(text: str) -> Dict[str, Any]:
+    """Parses a complete response with the same leniency (leading fence) as the stream."""
+    stream = JsonObjectStream()
+    stream.feed(text)
+    return stream.close()
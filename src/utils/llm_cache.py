@@ -0,0 +1,118 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+from src.utils.paths import DATA_DIR
+
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+
+LLM_CACHE_PATH = DATA_DIR / "cache" / "llm_responses.sqlite"
+
+LLM_CACHE_TTL         = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    response    TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses (last_used);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompt text with line endings unified and leading/trailing whitespace removed per line."""
+    return "\n".join(line.strip() for line in prompt.strip().splitlines())
+
+
+def prompt_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+# ─────────────────────────────────────────────
+# LLM RESPONSE CACHE
+# ─────────────────────────────────────────────
+
+class LLMCache:
+    """
+    Persistent cache of model responses, keyed on model name + normalized prompt hash.
+
+    Entries expire after `ttl` seconds. Every hit refreshes last_used, and once
+    the table holds more than `max_entries` rows the least recently used are
+    evicted. Hit and miss counts are kept per process for the run summary.
+    """
+
+    def __init__(self, path: Path = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.path        = Path(path)
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        key = prompt_key(model, prompt)
+        now = time.time()
+        with self._lock, self._connection() as conn:
+            row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?",
+                               (key,)).fetchone()
+            if row and now - row[1] < self.ttl:
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return row[0]
+            if row:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+
+    def put(self, model: str, prompt: str, response: str):
+        now = time.time()
+        with self._lock, self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                         (prompt_key(model, prompt), model, response, now, now))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "  SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def discard(self, model: str, prompt: str):
+        """Drops one entry — for responses the caller found unusable."""
+        with self._lock, self._connection() as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (prompt_key(model, prompt),))
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {"entries": entries, "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0}
+
+
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    global _cache
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
@@ -1,29 +1,20 @@
 # src/utils/paths.py
 from pathlib import Path
-import os
 
-# Force correct project root: go up from this file
+# Project root: go up from this file (src/utils → src → project_root).
+# Everything here is resolved from __file__, so callers never depend on the cwd.
 FILE_DIR = Path(__file__).resolve().parent
-PROJECT_ROOT = FILE_DIR.parent.parent  # src/utils → src → project_root
+PROJECT_ROOT = FILE_DIR.parent.parent
 
-# Debug print (remove later)
-print(f"[PATHS] Project root resolved to: {PROJECT_ROOT}")
-print(f"[PATHS] Exists: {PROJECT_ROOT.exists()}")
-
-# Data paths
+# Data paths — plain constants; importing this module touches nothing on disk
 DATA_DIR = PROJECT_ROOT / "data"
 INPUTS_DIR = DATA_DIR / "inputs"
 OUTPUTS_DIR = DATA_DIR / "outputs"
 LOGS_DIR = DATA_DIR / "logs"
-
-# Create if missing
-INPUTS_DIR.mkdir(parents=True, exist_ok=True)
-OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
-LOGS_DIR.mkdir(parents=True, exist_ok=True)
-
 DB_DIR = DATA_DIR / "chroma_db"
-DB_DIR.mkdir(parents=True, exist_ok=True)
 
-# Optional: Force working directory (extra safety)
-os.chdir(PROJECT_ROOT)
-print(f"[PATHS] Changed working dir to: {Path.cwd()}")
\ No newline at end of file
+
+def ensure_data_dirs():
+    """Creates the data directories if missing. Entry points that write call this, not import."""
+    for directory in (INPUTS_DIR, OUTPUTS_DIR, LOGS_DIR, DB_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,88 @@
+import time
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+
+
+# ─────────────────────────────────────────────
+# TOKEN BUCKET
+# ─────────────────────────────────────────────
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, at most `capacity` stored.
+
+    Callers reserve a token up front (the balance may go negative), then wait
+    out their share of the debt. That keeps waiters in arrival order and works
+    the same from threads (acquire) and coroutines (acquire_async).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate     = rate
+        self.capacity = capacity
+        self._tokens  = capacity
+        self._updated = time.monotonic()
+        self._lock    = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes one token and returns how long the caller must wait before using it."""
+        with self._lock:
+            now           = time.monotonic()
+            self._tokens  = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def _refund(self):
+        """Returns a reserved token that will not be used."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Like acquire(); a waiter cancelled before its turn gives its token back."""
+        wait = self._reserve()
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._refund()
+                raise
+
+
+# ─────────────────────────────────────────────
+# KEYED RATE LIMITER
+# ─────────────────────────────────────────────
+
+class KeyedRateLimiter:
+    """
+    One TokenBucket per key (e.g. per domain), created on first use.
+    Different keys never wait on each other.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0,
+                 overrides: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.rate      = rate
+        self.capacity  = capacity
+        self.overrides = overrides or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock     = threading.Lock()
+
+    def bucket(self, key: str) -> TokenBucket:
+        with self._lock:
+            if key not in self._buckets:
+                rate, capacity = self.overrides.get(key, (self.rate, self.capacity))
+                self._buckets[key] = TokenBucket(rate, capacity)
+            return self._buckets[key]
+
+    def acquire(self, key: str):
+        self.bucket(key).acquire()
+
+    async def acquire_async(self, key: str):
+        await self.bucket(key).acquire_async()